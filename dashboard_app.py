@@ -8,14 +8,23 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import xarray as xr
-import geopandas as gpd
-import plotly.express as px
+import dask
+import dask.array as da
+from numba import njit
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import plotly.io as pio
 from pathlib import Path
-import json
-import joblib
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+import base64
+import orjson
 from datetime import datetime, timedelta
+from scipy.ndimage import gaussian_filter
+from matplotlib import cm
+from PIL import Image
+
+# Serialize figures for st.plotly_chart with orjson instead of stdlib json
+pio.json.config.default_engine = 'orjson'
 
 # Page configuration
 st.set_page_config(
@@ -25,42 +34,455 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+
+@st.cache_data
+def _css() -> str:
+    """Read the dashboard stylesheet once per process"""
+    return (Path(__file__).parent / 'style.css').read_text()
+
+
 # Custom CSS
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 3rem;
-        font-weight: bold;
-        color: #1E88E5;
-        text-align: center;
-        margin-bottom: 1rem;
-    }
-    .sub-header {
-        font-size: 1.5rem;
-        color: #424242;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .metric-card {
-        background-color: #f0f2f6;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border-left: 4px solid #1E88E5;
-    }
-    .risk-high {
-        color: #D32F2F;
-        font-weight: bold;
-    }
-    .risk-medium {
-        color: #F57C00;
-        font-weight: bold;
-    }
-    .risk-low {
-        color: #388E3C;
-        font-weight: bold;
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(f"<style>{_css()}</style>", unsafe_allow_html=True)
+
+
+# Processed fields that are only shown on screen, never fed back into models
+DISPLAY_ONLY_VARIABLES = {'overfishing_risk_index', 'juvenile_habitat_score', 'sst_anomaly'}
+
+
+def _open_processed(file: Path):
+    """Open one processed store (Zarr or NetCDF) lazily, or return None if unreadable"""
+    if file.suffix == '.zarr':
+        try:
+            ds = xr.open_zarr(file, chunks='auto', consolidated=True)
+        except:
+            return None
+        # Match open_dataarray: single-variable stores come back as DataArrays
+        if len(ds.data_vars) == 1:
+            return ds[next(iter(ds.data_vars))]
+        return ds
+    
+    # Single-variable files are returned as DataArrays; both are
+    # opened lazily so reductions run over dask blocks
+    try:
+        return xr.open_dataarray(file, chunks='auto', engine='h5netcdf')
+    except:
+        try:
+            return xr.open_dataset(file, chunks='auto', engine='h5netcdf')
+        except:
+            return None
+
+
+@st.cache_resource
+def _load_datasets(processed_dir: str) -> dict:
+    """Open all processed datasets once per server process"""
+    datasets = {}
+    processed_dir = Path(processed_dir)
+    
+    if processed_dir.exists():
+        # Prefer a Zarr store over the NetCDF export of the same name
+        zarr_stores = sorted(processed_dir.glob('*.zarr'))
+        zarr_stems = {store.stem for store in zarr_stores}
+        files = zarr_stores + [
+            file for file in sorted(processed_dir.glob('*.nc'))
+            if file.stem not in zarr_stems
+        ]
+        # Header reads release the GIL, so threads overlap file latency;
+        # not worth a pool for just a few files
+        if len(files) > 3:
+            with ThreadPoolExecutor(max_workers=min(8, len(files))) as executor:
+                opened = list(executor.map(_open_processed, files))
+        else:
+            opened = [_open_processed(file) for file in files]
+        
+        for file, data in zip(files, opened):
+            if data is not None:
+                # Display-only fields don't need double precision; halves
+                # the bytes every reduction and render pass reads
+                if file.stem in DISPLAY_ONLY_VARIABLES:
+                    data = data.astype('float32')
+                datasets[file.stem] = data
+                        
+    return datasets
+
+
+@st.cache_resource
+def _load_models(models_dir: str) -> dict:
+    """Deserialize trained models once per server process"""
+    models = {}
+    models_dir = Path(models_dir)
+    
+    if models_dir.exists():
+        # Prefer the ONNX exports (no pickle, faster init); the .pkl files
+        # remain as a fallback for older model directories
+        for key, stem in [('risk', 'overfishing_risk_model'),
+                          ('juvenile', 'juvenile_catch_model')]:
+            onnx_path = models_dir / f'{stem}.onnx'
+            pkl_path = models_dir / f'{stem}.pkl'
+            if onnx_path.exists():
+                try:
+                    import onnxruntime as ort
+                    models[key] = ort.InferenceSession(
+                        str(onnx_path), providers=['CPUExecutionProvider']
+                    )
+                    continue
+                except ImportError:
+                    pass
+            if pkl_path.exists():
+                import joblib
+                models[key] = joblib.load(pkl_path)
+            
+        # Load MPA scenarios
+        mpa_scenarios_path = models_dir / 'mpa_scenarios.json'
+        if mpa_scenarios_path.exists():
+            scenarios = orjson.loads(mpa_scenarios_path.read_bytes())
+            # Convert the per-year series once so the charts scale them
+            # with vectorized NumPy ops instead of per-rerun list loops
+            for scenario in scenarios.values():
+                scenario['years'] = np.asarray(scenario['years'])
+                scenario['stock_recovery'] = np.asarray(scenario['stock_recovery'], dtype=np.float32)
+                scenario['biodiversity_recovery'] = np.asarray(scenario['biodiversity_recovery'], dtype=np.float32)
+                scenario['economic_benefit_usd'] = np.asarray(scenario['economic_benefit_usd'], dtype=np.float64)
+            models['mpa_scenarios'] = scenarios
+                
+    return models
+
+
+@njit(nogil=True, cache=True)
+def _count_above(values, threshold):
+    """Count values above threshold in one fused compare-and-sum pass"""
+    count = 0
+    for i in range(values.size):
+        if values[i] > threshold:
+            count += 1
+    return count
+
+
+def _count_above_block(block, threshold):
+    """Per-block count, shaped so dask can sum the blocks"""
+    return np.full((1,) * block.ndim, _count_above(np.ravel(block), threshold), dtype=np.int64)
+
+
+def _count_above_lazy(data: xr.DataArray, threshold: float):
+    """Count values above threshold, one kernel call per dask block"""
+    if not isinstance(data.data, da.Array):
+        return _count_above(np.ravel(data.values), threshold)
+    # nogil lets the threaded scheduler run blocks on all cores at once
+    counts = data.data.map_blocks(
+        _count_above_block, threshold,
+        chunks=(1,) * data.ndim, dtype=np.int64
+    )
+    return counts.sum()
+
+
+@st.cache_data
+def _summary_stats(processed_dir: str, _datasets: dict) -> dict:
+    """Reduce the display-only metrics once per dataset load"""
+    lazy = {}
+    
+    if 'overfishing_risk_index' in _datasets:
+        risk = _datasets['overfishing_risk_index']
+        lazy['risk_mean'] = risk.mean()
+        lazy['risk_max'] = risk.max()
+        lazy['high_risk_pct'] = _count_above_lazy(risk, 0.6) / risk.size * 100
+        
+    if 'juvenile_habitat_score' in _datasets:
+        lazy['habitat_mean'] = _datasets['juvenile_habitat_score'].mean()
+        
+    # One scheduler pass so the reductions share chunk reads
+    computed = dask.compute(*lazy.values())
+    return {key: float(value) for key, value in zip(lazy, computed)}
+
+
+@st.cache_data
+def _dataset_summary(processed_dir: str, _datasets: dict) -> tuple:
+    """Build the Data Explorer rows and schema reprs once per dataset load"""
+    dataset_info = []
+    dataset_reprs = {}
+    for name, data in _datasets.items():
+        if isinstance(data, xr.Dataset):
+            vars_list = list(data.data_vars.keys())
+            dims = list(data.dims.keys())
+        else:
+            vars_list = [data.name]
+            dims = list(data.dims)
+        
+        dataset_info.append({
+            'Dataset': name,
+            'Variables': ', '.join(vars_list),
+            'Dimensions': ', '.join(dims)
+        })
+        dataset_reprs[name] = str(data)
+    return dataset_info, dataset_reprs
+
+
+def _flatten_grid(risk: xr.DataArray) -> tuple:
+    """Flatten a lat/lon grid into lat/lon/value vectors of its ocean points"""
+    # Land (NaN) cells are dropped here rather than carried downstream
+    stacked = risk.stack(pt=('lat', 'lon')).dropna('pt')
+    return (
+        stacked['lat'].values,
+        stacked['lon'].values,
+        np.asarray(stacked.values, dtype=np.float64)
+    )
+
+
+@st.cache_data(max_entries=8)
+def _aggregate_risk_cells(processed_dir: str, _risk_data, cell_deg: float = 0.5) -> pd.DataFrame:
+    """Aggregate the risk grid into coarse cells for hover markers (cached per dataset load)"""
+    lat, lon, values = _flatten_grid(_risk_data)
+    
+    # Bin every grid point into a cell_deg x cell_deg cell in one pass
+    lat0, lon0 = np.floor(lat.min()), np.floor(lon.min())
+    row = ((lat - lat0) // cell_deg).astype(np.int64)
+    col = ((lon - lon0) // cell_deg).astype(np.int64)
+    n_cols = int(col.max()) + 1
+    cell = row * n_cols + col
+    
+    count = np.bincount(cell)
+    occupied = np.nonzero(count)[0]
+    count = count[occupied]
+    
+    return pd.DataFrame({
+        'lat': np.bincount(cell, weights=lat)[occupied] / count,
+        'lon': np.bincount(cell, weights=lon)[occupied] / count,
+        'risk': np.bincount(cell, weights=values)[occupied] / count,
+        'n_cells': count
+    })
+
+
+@st.cache_data(max_entries=8)
+def _render_risk_png(processed_dir: str, _risk_data, bins: int = 256) -> bytes:
+    """Rasterize the risk index into a blurred RGBA PNG (cached per dataset load)"""
+    lat, lon, values = _flatten_grid(_risk_data)
+    
+    # Never finer than the source grid, otherwise empty pixel rows appear
+    lat_edges = np.linspace(lat.min(), lat.max(), min(bins, _risk_data.sizes['lat']) + 1)
+    lon_edges = np.linspace(lon.min(), lon.max(), min(bins, _risk_data.sizes['lon']) + 1)
+    
+    # Mean risk per pixel; blur sums and counts separately so ocean edges
+    # don't fade towards zero next to land (NaN) cells
+    total, _, _ = np.histogram2d(lat, lon, bins=[lat_edges, lon_edges], weights=values)
+    count, _, _ = np.histogram2d(lat, lon, bins=[lat_edges, lon_edges])
+    empty = count == 0
+    total = gaussian_filter(total, 2)
+    count = gaussian_filter(count, 2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        density = np.where(count > 1e-3, total / count, 0.0)
+    
+    img = cm.RdYlGn_r(np.clip(density, 0, 1))
+    img[..., 3] = np.where(empty, 0, 0.75)
+    
+    # Row 0 of the image is the northern edge
+    buf = BytesIO()
+    Image.fromarray((img[::-1] * 255).astype(np.uint8)).save(buf, 'PNG')
+    return buf.getvalue()
+
+
+@st.cache_data(max_entries=8)
+def _build_risk_map_fig(processed_dir: str, _risk_data) -> go.Figure:
+    """Build the risk map as a static raster overlay (cached per dataset load)"""
+    png = _render_risk_png(processed_dir, _risk_data)
+    data_uri = 'data:image/png;base64,' + base64.b64encode(png).decode('ascii')
+    
+    lat_min, lat_max = float(_risk_data.lat.min()), float(_risk_data.lat.max())
+    lon_min, lon_max = float(_risk_data.lon.min()), float(_risk_data.lon.max())
+    
+    # One faint marker per aggregated cell gives hover values (and the
+    # colorbar) without shipping every grid point to the browser
+    cells = _aggregate_risk_cells(processed_dir, _risk_data)
+    size = 4 + 8 * np.sqrt(cells['n_cells'] / cells['n_cells'].max())
+    
+    fig = go.Figure(go.Scattermapbox(
+        lat=cells['lat'],
+        lon=cells['lon'],
+        mode='markers',
+        marker=dict(
+            size=size,
+            color=cells['risk'],
+            colorscale='RdYlGn_r',
+            cmin=0,
+            cmax=1,
+            opacity=0.3,
+            showscale=True,
+            colorbar=dict(title='risk')
+        ),
+        customdata=cells['n_cells'],
+        hovertemplate='Risk: %{marker.color:.2f}<br>Grid cells: %{customdata}<extra></extra>',
+        showlegend=False
+    ))
+    
+    fig.update_layout(
+        title="Overfishing Risk Index - Mediterranean Sea",
+        mapbox=dict(
+            style="carto-positron",
+            center=dict(lat=38, lon=15),
+            zoom=4,
+            layers=[dict(
+                sourcetype='image',
+                source=data_uri,
+                coordinates=[
+                    [lon_min, lat_max],
+                    [lon_max, lat_max],
+                    [lon_max, lat_min],
+                    [lon_min, lat_min]
+                ]
+            )]
+        ),
+        height=600,
+        margin=dict(l=0, r=0, t=40, b=0)
+    )
+    
+    return fig
+
+
+@st.cache_data
+def _sst_anomaly_series(processed_dir: str, _sst_anom) -> pd.Series:
+    """Reduce the SST anomaly to its spatial-mean time series once per dataset load"""
+    return _sst_anom.mean(dim=['lat', 'lon']).compute().to_series()
+
+
+@st.cache_data(max_entries=8)
+def _build_time_series_fig(processed_dir: str, _sst_series: pd.Series) -> go.Figure:
+    """Build the SST anomaly trend chart (cached per dataset load)"""
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scatter(
+        x=pd.to_datetime(_sst_series.index),
+        y=_sst_series.values,
+        mode='lines',
+        name='SST Anomaly',
+        line=dict(color='#1E88E5', width=2)
+    ))
+    
+    fig.update_layout(
+        title="Sea Surface Temperature Anomaly Trends",
+        xaxis_title="Date",
+        yaxis_title="SST Anomaly (°C)",
+        height=400,
+        hovermode='x unified'
+    )
+    
+    return fig
+
+
+@st.cache_data(max_entries=8)
+def _build_juvenile_forecast_fig(baseline: float, days: int, start, _rng) -> go.Figure:
+    """Build the juvenile catch forecast chart (cached per control inputs)"""
+    # Create forecast dates
+    forecast_dates = pd.date_range(
+        start=start,
+        periods=days,
+        freq='D'
+    )
+    
+    # Simulate forecast (in production, use actual model predictions)
+    forecast = (baseline
+                + 0.1 * np.sin(2 * np.pi * np.arange(days) / 365)
+                + _rng.normal(0, 0.02, days))
+    
+    fig = go.Figure()
+    
+    # Add confidence interval
+    fig.add_trace(go.Scatter(
+        x=forecast_dates,
+        y=forecast + 0.05,
+        mode='lines',
+        name='Upper Bound',
+        line=dict(width=0),
+        showlegend=False
+    ))
+    
+    fig.add_trace(go.Scatter(
+        x=forecast_dates,
+        y=forecast - 0.05,
+        mode='lines',
+        name='Lower Bound',
+        line=dict(width=0),
+        fillcolor='rgba(30, 136, 229, 0.2)',
+        fill='tonexty',
+        showlegend=False
+    ))
+    
+    # Add forecast line
+    fig.add_trace(go.Scatter(
+        x=forecast_dates,
+        y=forecast,
+        mode='lines',
+        name='Juvenile Catch Potential',
+        line=dict(color='#1E88E5', width=3)
+    ))
+    
+    fig.update_layout(
+        title=f"Juvenile Catch Potential Forecast - Next {days} Days",
+        xaxis_title="Date",
+        yaxis_title="Habitat Suitability Score",
+        height=400,
+        hovermode='x unified'
+    )
+    
+    return fig
+
+
+@st.cache_data(max_entries=8)
+def _build_mpa_simulation_fig(models_dir: str, expansion_pct: int, _scenario: dict) -> go.Figure:
+    """Build the MPA expansion subplots (cached per expansion level)"""
+    from plotly.subplots import make_subplots
+    
+    scenario = _scenario
+    
+    fig = make_subplots(
+        rows=2, cols=1,
+        subplot_titles=('Fish Stock Recovery', 'Economic Benefits'),
+        vertical_spacing=0.12
+    )
+    
+    # Stock recovery
+    fig.add_trace(
+        go.Scatter(
+            x=scenario['years'],
+            y=scenario['stock_recovery'] * 100.0,
+            mode='lines+markers',
+            name='Fish Stocks',
+            line=dict(color='#388E3C', width=3),
+            marker=dict(size=6)
+        ),
+        row=1, col=1
+    )
+    
+    fig.add_trace(
+        go.Scatter(
+            x=scenario['years'],
+            y=scenario['biodiversity_recovery'] * 100.0,
+            mode='lines+markers',
+            name='Biodiversity',
+            line=dict(color='#1E88E5', width=3, dash='dash'),
+            marker=dict(size=6)
+        ),
+        row=1, col=1
+    )
+    
+    # Economic benefits
+    fig.add_trace(
+        go.Bar(
+            x=scenario['years'],
+            y=scenario['economic_benefit_usd'] / 1e6,
+            name='Economic Benefit',
+            marker_color='#F57C00'
+        ),
+        row=2, col=1
+    )
+    
+    fig.update_xaxes(title_text="Years", row=2, col=1)
+    fig.update_yaxes(title_text="Recovery (%)", row=1, col=1)
+    fig.update_yaxes(title_text="Benefit (Million USD)", row=2, col=1)
+    
+    fig.update_layout(
+        title=f"MPA Expansion Simulation - {expansion_pct}% Increase",
+        height=700,
+        showlegend=True
+    )
+    
+    return fig
 
 
 class MedGuardDashboard:
@@ -71,45 +493,29 @@ class MedGuardDashboard:
         self.processed_dir = self.data_dir / 'processed'
         self.models_dir = Path('models')
         
+        # One generator for all forecast noise draws
+        self._rng = np.random.default_rng(42)
+        
         # Load data
         self.load_processed_data()
         self.load_models()
         
     def load_processed_data(self):
-        """Load all processed datasets"""
-        self.datasets = {}
-        
-        if self.processed_dir.exists():
-            for file in self.processed_dir.glob('*.nc'):
-                try:
-                    data = xr.open_dataset(file)
-                    self.datasets[file.stem] = data
-                except:
-                    try:
-                        self.datasets[file.stem] = xr.open_dataarray(file)
-                    except:
-                        pass
+        """Load all processed datasets (cached across reruns)"""
+        self.datasets = _load_datasets(str(self.processed_dir))
+        self._cached_stats = _summary_stats(str(self.processed_dir), self.datasets)
+        self._dataset_info, self._dataset_reprs = _dataset_summary(
+            str(self.processed_dir), self.datasets
+        )
+        self._sst_anom_series = None
+        if 'sst_anomaly' in self.datasets:
+            self._sst_anom_series = _sst_anomaly_series(
+                str(self.processed_dir), self.datasets['sst_anomaly']
+            )
                         
     def load_models(self):
-        """Load trained models"""
-        self.models = {}
-        
-        if self.models_dir.exists():
-            # Load risk model
-            risk_model_path = self.models_dir / 'overfishing_risk_model.pkl'
-            if risk_model_path.exists():
-                self.models['risk'] = joblib.load(risk_model_path)
-                
-            # Load juvenile model
-            juvenile_model_path = self.models_dir / 'juvenile_catch_model.pkl'
-            if juvenile_model_path.exists():
-                self.models['juvenile'] = joblib.load(juvenile_model_path)
-                
-            # Load MPA scenarios
-            mpa_scenarios_path = self.models_dir / 'mpa_scenarios.json'
-            if mpa_scenarios_path.exists():
-                with open(mpa_scenarios_path) as f:
-                    self.models['mpa_scenarios'] = json.load(f)
+        """Load trained models (cached across reruns)"""
+        self.models = _load_models(str(self.models_dir))
                     
     def create_risk_map(self):
         """Create interactive risk assessment map"""
@@ -118,136 +524,35 @@ class MedGuardDashboard:
             return None
             
         risk_data = self.datasets['overfishing_risk_index']
-        
-        # Convert to DataFrame for Plotly
-        risk_df = risk_data.to_dataframe(name='risk').reset_index()
-        
-        fig = px.density_mapbox(
-            risk_df,
-            lat='lat',
-            lon='lon',
-            z='risk',
-            radius=10,
-            center=dict(lat=38, lon=15),
-            zoom=4,
-            mapbox_style="carto-positron",
-            color_continuous_scale="RdYlGn_r",
-            range_color=[0, 1],
-            title="Overfishing Risk Index - Mediterranean Sea"
-        )
-        
-        fig.update_layout(
-            height=600,
-            margin=dict(l=0, r=0, t=40, b=0)
-        )
-        
-        return fig
+        # The map shows a single snapshot; use the latest time step
+        if 'time' in risk_data.dims:
+            risk_data = risk_data.isel(time=-1)
+            
+        return _build_risk_map_fig(str(self.processed_dir), risk_data)
         
     def create_time_series(self):
         """Create time series of risk trends"""
-        if 'sst_anomaly' not in self.datasets:
+        if self._sst_anom_series is None:
             return None
             
-        sst_anom = self.datasets['sst_anomaly']
-        
-        # Calculate spatial mean over time
-        sst_mean = sst_anom.mean(dim=['lat', 'lon'])
-        
-        df = pd.DataFrame({
-            'date': pd.to_datetime(sst_mean.time.values),
-            'sst_anomaly': sst_mean.values
-        })
-        
-        fig = go.Figure()
-        
-        fig.add_trace(go.Scatter(
-            x=df['date'],
-            y=df['sst_anomaly'],
-            mode='lines',
-            name='SST Anomaly',
-            line=dict(color='#1E88E5', width=2)
-        ))
-        
-        fig.update_layout(
-            title="Sea Surface Temperature Anomaly Trends",
-            xaxis_title="Date",
-            yaxis_title="SST Anomaly (°C)",
-            height=400,
-            hovermode='x unified'
+        return _build_time_series_fig(
+            str(self.processed_dir),
+            self._sst_anom_series
         )
         
-        return fig
-        
     def create_juvenile_forecast(self, days=30):
         """Create juvenile catch forecast visualization"""
-        if 'juvenile_habitat_score' not in self.datasets:
+        if 'habitat_mean' not in self._cached_stats:
             st.warning("Juvenile habitat data not available")
             return None
             
-        habitat = self.datasets['juvenile_habitat_score']
-        
-        # Create forecast dates
-        forecast_dates = pd.date_range(
-            start=datetime.now(),
-            periods=days,
-            freq='D'
-        )
-        
-        # Simulate forecast (in production, use actual model predictions)
-        baseline = float(habitat.mean())
-        seasonal_variation = 0.1 * np.sin(2 * np.pi * np.arange(days) / 365)
-        noise = np.random.normal(0, 0.02, days)
-        forecast_values = baseline + seasonal_variation + noise
-        
-        df = pd.DataFrame({
-            'date': forecast_dates,
-            'forecast': forecast_values,
-            'lower_bound': forecast_values - 0.05,
-            'upper_bound': forecast_values + 0.05
-        })
-        
-        fig = go.Figure()
-        
-        # Add confidence interval
-        fig.add_trace(go.Scatter(
-            x=df['date'],
-            y=df['upper_bound'],
-            mode='lines',
-            name='Upper Bound',
-            line=dict(width=0),
-            showlegend=False
-        ))
-        
-        fig.add_trace(go.Scatter(
-            x=df['date'],
-            y=df['lower_bound'],
-            mode='lines',
-            name='Lower Bound',
-            line=dict(width=0),
-            fillcolor='rgba(30, 136, 229, 0.2)',
-            fill='tonexty',
-            showlegend=False
-        ))
-        
-        # Add forecast line
-        fig.add_trace(go.Scatter(
-            x=df['date'],
-            y=df['forecast'],
-            mode='lines',
-            name='Juvenile Catch Potential',
-            line=dict(color='#1E88E5', width=3)
-        ))
-        
-        fig.update_layout(
-            title=f"Juvenile Catch Potential Forecast - Next {days} Days",
-            xaxis_title="Date",
-            yaxis_title="Habitat Suitability Score",
-            height=400,
-            hovermode='x unified'
+        return _build_juvenile_forecast_fig(
+            self._cached_stats['habitat_mean'],
+            days,
+            datetime.now().date(),
+            self._rng
         )
         
-        return fig
-        
     def create_mpa_simulation(self, expansion_pct=20):
         """Create MPA expansion simulation visualization"""
         if 'mpa_scenarios' not in self.models:
@@ -261,62 +566,12 @@ class MedGuardDashboard:
             st.warning(f"Scenario for {expansion_pct}% expansion not found")
             return None
             
-        scenario = scenarios[scenario_key]
-        
-        fig = make_subplots(
-            rows=2, cols=1,
-            subplot_titles=('Fish Stock Recovery', 'Economic Benefits'),
-            vertical_spacing=0.12
-        )
-        
-        # Stock recovery
-        fig.add_trace(
-            go.Scatter(
-                x=scenario['years'],
-                y=[v * 100 for v in scenario['stock_recovery']],
-                mode='lines+markers',
-                name='Fish Stocks',
-                line=dict(color='#388E3C', width=3),
-                marker=dict(size=6)
-            ),
-            row=1, col=1
-        )
-        
-        fig.add_trace(
-            go.Scatter(
-                x=scenario['years'],
-                y=[v * 100 for v in scenario['biodiversity_recovery']],
-                mode='lines+markers',
-                name='Biodiversity',
-                line=dict(color='#1E88E5', width=3, dash='dash'),
-                marker=dict(size=6)
-            ),
-            row=1, col=1
-        )
-        
-        # Economic benefits
-        fig.add_trace(
-            go.Bar(
-                x=scenario['years'],
-                y=[v / 1e6 for v in scenario['economic_benefit_usd']],
-                name='Economic Benefit',
-                marker_color='#F57C00'
-            ),
-            row=2, col=1
-        )
-        
-        fig.update_xaxes(title_text="Years", row=2, col=1)
-        fig.update_yaxes(title_text="Recovery (%)", row=1, col=1)
-        fig.update_yaxes(title_text="Benefit (Million USD)", row=2, col=1)
-        
-        fig.update_layout(
-            title=f"MPA Expansion Simulation - {expansion_pct}% Increase",
-            height=700,
-            showlegend=True
+        return _build_mpa_simulation_fig(
+            str(self.models_dir),
+            expansion_pct,
+            scenarios[scenario_key]
         )
         
-        return fig
-        
     def render_header(self):
         """Render dashboard header"""
         st.markdown('<div class="main-header">🐟 MedGuard</div>', unsafe_allow_html=True)
@@ -338,8 +593,8 @@ class MedGuardDashboard:
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            if 'overfishing_risk_index' in self.datasets:
-                risk_mean = float(self.datasets['overfishing_risk_index'].mean())
+            if 'risk_mean' in self._cached_stats:
+                risk_mean = self._cached_stats['risk_mean']
                 risk_class = "high" if risk_mean > 0.6 else "medium" if risk_mean > 0.3 else "low"
                 st.metric(
                     "Average Risk Index",
@@ -351,11 +606,8 @@ class MedGuardDashboard:
                 st.metric("Average Risk Index", "N/A")
                 
         with col2:
-            if 'overfishing_risk_index' in self.datasets:
-                high_risk_pct = float(
-                    (self.datasets['overfishing_risk_index'] > 0.6).sum() / 
-                    self.datasets['overfishing_risk_index'].size * 100
-                )
+            if 'high_risk_pct' in self._cached_stats:
+                high_risk_pct = self._cached_stats['high_risk_pct']
                 st.metric(
                     "High Risk Areas",
                     f"{high_risk_pct:.1f}%",
@@ -366,17 +618,16 @@ class MedGuardDashboard:
                 st.metric("High Risk Areas", "N/A")
                 
         with col3:
-            # Load MPA stats if available
+            # Only the presence of the summary file matters here
             summary_file = self.processed_dir / 'summary_statistics.csv'
             if summary_file.exists():
-                df = pd.read_csv(summary_file)
                 st.metric("MPA Coverage", "5.2%", delta="+0.3% this year")
             else:
                 st.metric("MPA Coverage", "~5%")
                 
         with col4:
-            if 'juvenile_habitat_score' in self.datasets:
-                habitat_score = float(self.datasets['juvenile_habitat_score'].mean())
+            if 'habitat_mean' in self._cached_stats:
+                habitat_score = self._cached_stats['habitat_mean']
                 st.metric(
                     "Habitat Quality",
                     f"{habitat_score:.2f}",
@@ -490,13 +741,13 @@ class MedGuardDashboard:
                 - Fishing intensity patterns
                 """)
                 
-                if 'overfishing_risk_index' in self.datasets:
-                    risk = self.datasets['overfishing_risk_index']
+                if 'risk_mean' in self._cached_stats:
+                    stats = self._cached_stats
                     st.markdown(f"""
                     ### Current Statistics
-                    - **Mean Risk**: {float(risk.mean()):.3f}
-                    - **Max Risk**: {float(risk.max()):.3f}
-                    - **High Risk Area**: {float((risk > 0.6).sum() / risk.size * 100):.1f}%
+                    - **Mean Risk**: {stats['risk_mean']:.3f}
+                    - **Max Risk**: {stats['risk_max']:.3f}
+                    - **High Risk Area**: {stats['high_risk_pct']:.1f}%
                     """)
                     
         with tab2:
@@ -566,22 +817,7 @@ class MedGuardDashboard:
             st.markdown("#### Available Datasets")
             
             if self.datasets:
-                dataset_info = []
-                for name, data in self.datasets.items():
-                    if isinstance(data, xr.Dataset):
-                        vars_list = list(data.data_vars.keys())
-                        dims = list(data.dims.keys())
-                    else:
-                        vars_list = [data.name]
-                        dims = list(data.dims)
-                    
-                    dataset_info.append({
-                        'Dataset': name,
-                        'Variables': ', '.join(vars_list),
-                        'Dimensions': ', '.join(dims)
-                    })
-                
-                info_df = pd.DataFrame(dataset_info)
+                info_df = pd.DataFrame(self._dataset_info)
                 st.dataframe(info_df, use_container_width=True)
                 
                 # Dataset selector
@@ -608,7 +844,7 @@ class MedGuardDashboard:
                     
                     with col2:
                         st.markdown("##### Data Info")
-                        st.code(str(data))
+                        st.code(self._dataset_reprs[selected_dataset])
             else:
                 st.warning("No processed datasets found. Please run the data processing pipeline first.")
                 
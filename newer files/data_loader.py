@@ -11,14 +11,279 @@ import numpy as np
 from pathlib import Path
 from datetime import datetime
 import json
+import os
+import hashlib
+import re
+import shutil
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import logging.handlers
+import sys
+import threading
 import warnings
 warnings.filterwarnings('ignore')
 
+# Progress output goes through a buffered handler: records are written in
+# batches (and whole lines at a time from the loader threads) instead of a
+# flushed print per line. Warnings and errors flush immediately.
+logger = logging.getLogger('medguard')
+if not logger.handlers:
+    _stream = logging.StreamHandler(sys.stdout)
+    _stream.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(logging.handlers.MemoryHandler(
+        capacity=200, flushLevel=logging.WARNING, target=_stream
+    ))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+class _StepLog(logging.Filter):
+    """
+    Holds back the records logged on a thread while it runs a step, so
+    concurrent steps can be written out one after another in a fixed order
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self._records = {}
+        
+    def filter(self, record):
+        records = self._records.get(record.thread)
+        if records is None:
+            return True
+        records.append(record)
+        return False
+        
+    def run(self, step, records):
+        """Call step, collecting what it logs into records"""
+        self._records[threading.get_ident()] = records
+        try:
+            return step()
+        finally:
+            del self._records[threading.get_ident()]
+        
+    @staticmethod
+    def replay(records):
+        """Write out collected records through the logger's handlers"""
+        for record in records:
+            logger.handle(record)
+
+
+step_log = _StepLog()
+logger.addFilter(step_log)
+
+
+def flush_log():
+    """Write out anything still buffered before callers print their own output"""
+    for handler in logger.handlers:
+        handler.flush()
+
+# Chunk layout for the Zarr cache of the yearly NetCDF inputs
+ZARR_STORE_CHUNKS = {'time': 10, 'depth': 5, 'lat': 256, 'lon': 256}
+
+
+def _standardize_coords(ds):
+    """Rename latitude/longitude dims to lat/lon"""
+    if 'latitude' in ds.dims:
+        ds = ds.rename({'latitude': 'lat', 'longitude': 'lon'})
+    return ds
+
+
+def _native_chunks(nc_path):
+    """Read the on-disk chunk layout of a NetCDF file as a dask chunks dict"""
+    with xr.open_dataset(nc_path) as probe:
+        probe = _standardize_coords(probe)
+        for var in probe.data_vars.values():
+            sizes = var.encoding.get('chunksizes')
+            if sizes:
+                chunks = dict(zip(var.dims, sizes))
+                # Batch several stored time chunks per task; whole multiples
+                # keep every dask chunk aligned to the file's chunks
+                if 'time' in chunks and chunks['time'] < 10:
+                    chunks['time'] *= -(-10 // chunks['time'])
+                return chunks
+    # Contiguous (unchunked) file: let dask pick sizes
+    return 'auto'
+
+
+def _fingerprint(path):
+    """Short digest of a file's path/size/mtime, used to key on-disk caches"""
+    path = Path(path)
+    stat = path.stat()
+    stamp = f"{path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.sha1(stamp.encode()).hexdigest()[:12]
+
+
+def _remove_stale_caches(cache_path, stem):
+    """
+    Delete the cache entries of older versions of the same source file
+    (<stem>-<fingerprint> siblings of cache_path), so re-downloads don't
+    leave orphaned copies behind
+    """
+    entry = re.compile(re.escape(stem) + r'-[0-9a-f]{12}' + re.escape(cache_path.suffix))
+    for old in cache_path.parent.iterdir():
+        if old == cache_path or not entry.fullmatch(old.name):
+            continue
+        try:
+            if old.is_dir():
+                shutil.rmtree(old)
+            else:
+                old.unlink()
+            logger.info(f"  ✓ Removed stale cache {old.name}")
+        except OSError as e:
+            logger.warning(f"  ⚠ Could not remove stale cache {old.name}: {e}")
+
+
+@contextmanager
+def _fadvise_sequential(path):
+    """Prefetch a file for one sequential pass and drop it from the page cache afterwards"""
+    if not hasattr(os, 'posix_fadvise'):  # Linux/Unix only
+        yield
+        return
+    
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        # WILLNEED starts readahead into the shared page cache, so the reader's
+        # own file handle benefits even though the advice is set on ours
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        yield
+    finally:
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+
+
+def _ensure_zarr(nc_path, zarr_dir):
+    """Convert a NetCDF file to a Zarr store once, keyed on its path/size/mtime"""
+    nc_path = Path(nc_path)
+    zarr_path = Path(zarr_dir) / f"{nc_path.stem}-{_fingerprint(nc_path)}.zarr"
+    
+    if not zarr_path.exists():
+        # The conversion reads the whole NetCDF once, front to back
+        with _fadvise_sequential(nc_path):
+            ds = _standardize_coords(xr.open_dataset(nc_path))
+            # Store chunks match the downstream access pattern (time slices,
+            # single depth levels, regional lat/lon tiles)
+            store_chunks = {dim: size for dim, size in ZARR_STORE_CHUNKS.items() if dim in ds.dims}
+            for var in ds.variables:
+                ds[var].encoding = {}
+            
+            # Write to a temporary store first so an interrupted run never
+            # leaves a half-written cache behind
+            tmp_path = zarr_path.with_suffix('.tmp')
+            zarr_path.parent.mkdir(parents=True, exist_ok=True)
+            ds.chunk(store_chunks).to_zarr(tmp_path, mode='w', consolidated=True)
+            ds.close()
+        tmp_path.rename(zarr_path)
+        logger.info(f"  ✓ Cached {nc_path.name} as {zarr_path.name}")
+        _remove_stale_caches(zarr_path, nc_path.stem)
+    
+    return zarr_path
+
+
+def _open_yearly(paths, zarr_dir=None):
+    """Open per-year NetCDFs as one lazily concatenated dataset"""
+    if zarr_dir is not None:
+        try:
+            stores = [_ensure_zarr(p, zarr_dir) for p in paths]
+            # chunks={} opens with exactly the store's chunks
+            return xr.combine_by_coords(
+                [xr.open_zarr(store, chunks={}, consolidated=True) for store in stores]
+            )
+        except Exception as e:
+            logger.warning(f"  ⚠ Zarr cache unavailable ({e}), reading NetCDF directly")
+    
+    chunks = _native_chunks(paths[0])
+    try:
+        # Headers are read concurrently and the concat stays lazy
+        return xr.open_mfdataset(
+            paths,
+            combine='by_coords',
+            parallel=True,
+            chunks=chunks,
+            preprocess=_standardize_coords
+        )
+    except Exception as e:
+        logger.warning(f"  ⚠ Parallel open failed ({e}), loading files one by one")
+        datasets = [_standardize_coords(xr.open_dataset(p, chunks=chunks)) for p in paths]
+        return xr.concat(datasets, dim='time')
+
+
+def _read_vector(path):
+    """Read a vector file with pyogrio's Arrow reader, falling back to Fiona"""
+    try:
+        import pyogrio
+    except ImportError:
+        return gpd.read_file(path)
+    # Bulk columnar decode in GDAL instead of per-feature Python parsing
+    return gpd.read_file(path, engine='pyogrio', use_arrow=True)
+
+
+def _cached_load(path, reader, cache_reader, cache_dir, variant=None):
+    """Load a file through a Parquet copy keyed on its fingerprint, rebuilding it when stale"""
+    path = Path(path)
+    stem = f"{path.stem}-{variant}" if variant else path.stem
+    cache_path = Path(cache_dir) / f"{stem}-{_fingerprint(path)}.parquet"
+    
+    if cache_path.exists():
+        try:
+            return cache_reader(cache_path)
+        except Exception as e:
+            logger.warning(f"  ⚠ Ignoring unreadable cache {cache_path.name}: {e}")
+    
+    table = reader(path)
+    try:
+        # Parquet keeps typed columns (and WKB geometry + CRS for GeoDataFrames)
+        tmp_path = cache_path.with_suffix('.tmp')
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        table.to_parquet(tmp_path)
+        tmp_path.replace(cache_path)
+        logger.info(f"  ✓ Cached {path.name} as {cache_path.name}")
+        _remove_stale_caches(cache_path, stem)
+    except Exception as e:
+        logger.warning(f"  ⚠ Could not write cache {cache_path.name}: {e}")
+    return table
+
+
+def _read_vector_cached(path, cache_dir):
+    """Read a GeoJSON via the GeoParquet cache"""
+    return _cached_load(path, _read_vector, gpd.read_parquet, cache_dir)
+
+
+def _read_vector_metric_cached(path, cache_dir, epsg=3857):
+    """Read a GeoJSON reprojected to a metric CRS, via the GeoParquet cache"""
+    reader = lambda p: _read_vector_cached(p, cache_dir).to_crs(epsg=epsg)
+    return _cached_load(path, reader, gpd.read_parquet, cache_dir, variant=f"epsg{epsg}")
+
+
+def _read_csv_cached(path, cache_dir):
+    """Read a CSV via the Parquet cache"""
+    return _cached_load(path, pd.read_csv, pd.read_parquet, cache_dir)
+
+
+def _downcast_numeric(df):
+    """Downcast float64 columns to float32 and int64 columns to int32 where values fit"""
+    int32 = np.iinfo(np.int32)
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_float_dtype(series) and series.dtype != np.float32:
+            df[col] = series.astype(np.float32)
+        elif pd.api.types.is_integer_dtype(series) and series.dtype.itemsize > 4:
+            if len(series) == 0 or (series.min() >= int32.min and series.max() <= int32.max):
+                df[col] = series.astype(np.int32)
+    return df
+
+
 class MedGuardDataLoader:
     """Load and validate all MedGuard datasets"""
     
     def __init__(self, base_dir='Data'):
         self.base_dir = Path(base_dir)
+        self.zarr_dir = Path('processed') / 'zarr'
+        self.cache_dir = Path('processed') / 'cache'
         self.data = {}
         self.metadata = {
             'load_time': datetime.now().isoformat(),
@@ -28,9 +293,9 @@ class MedGuardDataLoader:
         
     def load_sst_data(self):
         """Load Sea Surface Temperature data (2023-2024)"""
-        print("\n" + "="*60)
-        print("LOADING SEA SURFACE TEMPERATURE DATA")
-        print("="*60)
+        logger.info("\n" + "="*60)
+        logger.info("LOADING SEA SURFACE TEMPERATURE DATA")
+        logger.info("="*60)
         
         # Try multiple possible directory structures
         possible_locations = [
@@ -44,39 +309,31 @@ class MedGuardDataLoader:
             '2024': 'med_sst2024.nc'
         }
         
-        datasets = []
+        paths = []
         for year, filename in files_to_find.items():
             found = False
             for location in possible_locations:
                 filepath = location / filename
                 if filepath.exists():
-                    try:
-                        ds = xr.open_dataset(filepath, chunks={'time': 10})
-                        datasets.append(ds)
-                        print(f"✓ Loaded SST {year}: {filepath}")
-                        print(f"  Shape: {dict(ds.dims)}")
-                        print(f"  Variables: {list(ds.data_vars)}")
-                        
-                        # Check coordinate names
-                        coord_names = list(ds.coords.keys())
-                        print(f"  Coordinates: {coord_names}")
-                        found = True
-                        break
-                    except Exception as e:
-                        print(f"✗ Error loading {filepath.name}: {e}")
-                        continue
+                    paths.append(filepath)
+                    logger.info(f"✓ Found SST {year}: {filepath}")
+                    found = True
+                    break
             
             if not found:
-                print(f"⚠ Missing {filename} in any known location")
+                logger.warning(f"⚠ Missing {filename} in any known location")
         
-        if datasets:
+        if paths:
             # Combine both years
-            self.data['sst'] = xr.concat(datasets, dim='time')
+            try:
+                self.data['sst'] = _open_yearly(paths, zarr_dir=self.zarr_dir)
+            except Exception as e:
+                logger.error(f"✗ Error loading SST data: {e}")
+                return
             self.metadata['datasets_loaded'].append('sst')
-            
-            # Standardize coordinate names (latitude/lat, longitude/lon)
-            if 'latitude' in self.data['sst'].dims:
-                self.data['sst'] = self.data['sst'].rename({'latitude': 'lat', 'longitude': 'lon'})
+            logger.info(f"  Shape: {dict(self.data['sst'].dims)}")
+            logger.info(f"  Variables: {list(self.data['sst'].data_vars)}")
+            logger.info(f"  Coordinates: {list(self.data['sst'].coords.keys())}")
             
             # Quality checks
             sst_var = list(self.data['sst'].data_vars)[0]
@@ -97,16 +354,16 @@ class MedGuardDataLoader:
                 'missing_data_pct': float((self.data['sst'][sst_var].isnull().sum() / 
                                           self.data['sst'][sst_var].size * 100).values)
             }
-            print(f"\n  Quality Check:")
-            print(f"    Time span: {self.metadata['data_quality_checks']['sst']['time_range']}")
-            print(f"    Spatial extent: lat [{self.metadata['data_quality_checks']['sst']['spatial_coverage']['lat_range'][0]:.2f}, {self.metadata['data_quality_checks']['sst']['spatial_coverage']['lat_range'][1]:.2f}], lon [{self.metadata['data_quality_checks']['sst']['spatial_coverage']['lon_range'][0]:.2f}, {self.metadata['data_quality_checks']['sst']['spatial_coverage']['lon_range'][1]:.2f}]")
-            print(f"    Missing data: {self.metadata['data_quality_checks']['sst']['missing_data_pct']:.2f}%")
+            logger.info(f"\n  Quality Check:")
+            logger.info(f"    Time span: {self.metadata['data_quality_checks']['sst']['time_range']}")
+            logger.info(f"    Spatial extent: lat [{self.metadata['data_quality_checks']['sst']['spatial_coverage']['lat_range'][0]:.2f}, {self.metadata['data_quality_checks']['sst']['spatial_coverage']['lat_range'][1]:.2f}], lon [{self.metadata['data_quality_checks']['sst']['spatial_coverage']['lon_range'][0]:.2f}, {self.metadata['data_quality_checks']['sst']['spatial_coverage']['lon_range'][1]:.2f}]")
+            logger.info(f"    Missing data: {self.metadata['data_quality_checks']['sst']['missing_data_pct']:.2f}%")
     
     def load_current_data(self):
         """Load ocean current data (u, v components)"""
-        print("\n" + "="*60)
-        print("LOADING OCEAN CURRENT DATA")
-        print("="*60)
+        logger.info("\n" + "="*60)
+        logger.info("LOADING OCEAN CURRENT DATA")
+        logger.info("="*60)
         
         # Try multiple possible locations
         possible_locations = [
@@ -120,33 +377,30 @@ class MedGuardDataLoader:
             '2024': 'med_currents2024.nc'
         }
         
-        datasets = []
+        paths = []
         for year, filename in files_to_find.items():
             for location in possible_locations:
                 filepath = location / filename
                 if filepath.exists():
-                    try:
-                        ds = xr.open_dataset(filepath, chunks={'time': 10, 'depth': 5})
-                        # Standardize coordinate names
-                        if 'latitude' in ds.dims:
-                            ds = ds.rename({'latitude': 'lat', 'longitude': 'lon'})
-                        datasets.append(ds)
-                        print(f"✓ Loaded Currents {year}: {filepath}")
-                        print(f"  Shape: {dict(ds.dims)}")
-                        break
-                    except Exception as e:
-                        continue
-        
-        if datasets:
-            self.data['currents'] = xr.concat(datasets, dim='time')
+                    paths.append(filepath)
+                    logger.info(f"✓ Found Currents {year}: {filepath}")
+                    break
+        
+        if paths:
+            try:
+                self.data['currents'] = _open_yearly(paths, zarr_dir=self.zarr_dir)
+            except Exception as e:
+                logger.error(f"✗ Error loading current data: {e}")
+                return
             self.metadata['datasets_loaded'].append('currents')
-            print(f"  ✓ Combined {len(datasets)} years of current data")
+            logger.info(f"  Shape: {dict(self.data['currents'].dims)}")
+            logger.info(f"  ✓ Combined {len(paths)} years of current data")
     
     def load_salinity_data(self):
         """Load salinity data"""
-        print("\n" + "="*60)
-        print("LOADING SALINITY DATA")
-        print("="*60)
+        logger.info("\n" + "="*60)
+        logger.info("LOADING SALINITY DATA")
+        logger.info("="*60)
         
         possible_locations = [
             self.base_dir / 'Sea Current',
@@ -159,30 +413,28 @@ class MedGuardDataLoader:
             '2024': 'med_salinity2024.nc'
         }
         
-        datasets = []
+        paths = []
         for year, filename in files_to_find.items():
             for location in possible_locations:
                 filepath = location / filename
                 if filepath.exists():
-                    try:
-                        ds = xr.open_dataset(filepath, chunks={'time': 10})
-                        if 'latitude' in ds.dims:
-                            ds = ds.rename({'latitude': 'lat', 'longitude': 'lon'})
-                        datasets.append(ds)
-                        print(f"✓ Loaded Salinity {year}: {filepath}")
-                        break
-                    except Exception as e:
-                        continue
-        
-        if datasets:
-            self.data['salinity'] = xr.concat(datasets, dim='time')
+                    paths.append(filepath)
+                    logger.info(f"✓ Found Salinity {year}: {filepath}")
+                    break
+        
+        if paths:
+            try:
+                self.data['salinity'] = _open_yearly(paths, zarr_dir=self.zarr_dir)
+            except Exception as e:
+                logger.error(f"✗ Error loading salinity data: {e}")
+                return
             self.metadata['datasets_loaded'].append('salinity')
     
     def load_chlorophyll_data(self):
         """Load chlorophyll-a concentration data"""
-        print("\n" + "="*60)
-        print("LOADING CHLOROPHYLL-A DATA")
-        print("="*60)
+        logger.info("\n" + "="*60)
+        logger.info("LOADING CHLOROPHYLL-A DATA")
+        logger.info("="*60)
         
         possible_locations = [
             self.base_dir / 'Sea Current',
@@ -195,30 +447,28 @@ class MedGuardDataLoader:
             '2024': 'med_chlorophyll2024.nc'
         }
         
-        datasets = []
+        paths = []
         for year, filename in files_to_find.items():
             for location in possible_locations:
                 filepath = location / filename
                 if filepath.exists():
-                    try:
-                        ds = xr.open_dataset(filepath, chunks={'time': 10})
-                        if 'latitude' in ds.dims:
-                            ds = ds.rename({'latitude': 'lat', 'longitude': 'lon'})
-                        datasets.append(ds)
-                        print(f"✓ Loaded Chlorophyll {year}: {filepath}")
-                        break
-                    except Exception as e:
-                        continue
-        
-        if datasets:
-            self.data['chlorophyll'] = xr.concat(datasets, dim='time')
+                    paths.append(filepath)
+                    logger.info(f"✓ Found Chlorophyll {year}: {filepath}")
+                    break
+        
+        if paths:
+            try:
+                self.data['chlorophyll'] = _open_yearly(paths, zarr_dir=self.zarr_dir)
+            except Exception as e:
+                logger.error(f"✗ Error loading chlorophyll data: {e}")
+                return
             self.metadata['datasets_loaded'].append('chlorophyll')
     
     def load_fishing_intensity(self):
         """Load AIS fishing intensity data"""
-        print("\n" + "="*60)
-        print("LOADING FISHING INTENSITY DATA")
-        print("="*60)
+        logger.info("\n" + "="*60)
+        logger.info("LOADING FISHING INTENSITY DATA")
+        logger.info("="*60)
         
         possible_locations = [
             self.base_dir / 'Fishing Intensity',
@@ -237,13 +487,13 @@ class MedGuardDataLoader:
                 filepath = location / filename
                 if filepath.exists():
                     try:
-                        gdf = gpd.read_file(filepath)
+                        gdf = _downcast_numeric(_read_vector_cached(filepath, self.cache_dir))
                         gdf['year'] = year
                         gdfs.append(gdf)
-                        print(f"✓ Loaded Fishing {year}: {filepath}")
-                        print(f"  Records: {len(gdf)}")
+                        logger.info(f"✓ Loaded Fishing {year}: {filepath}")
+                        logger.info(f"  Records: {len(gdf)}")
                         if len(gdf) > 0:
-                            print(f"  Columns: {list(gdf.columns[:5])}...")  # Show first 5 columns
+                            logger.info(f"  Columns: {list(gdf.columns[:5])}...")  # Show first 5 columns
                         break
                     except Exception as e:
                         continue
@@ -251,13 +501,13 @@ class MedGuardDataLoader:
         if gdfs:
             self.data['fishing'] = pd.concat(gdfs, ignore_index=True)
             self.metadata['datasets_loaded'].append('fishing')
-            print(f"  ✓ Total fishing records: {len(self.data['fishing'])}")
+            logger.info(f"  ✓ Total fishing records: {len(self.data['fishing'])}")
     
     def load_mpa_data(self):
         """Load Marine Protected Areas boundaries"""
-        print("\n" + "="*60)
-        print("LOADING MARINE PROTECTED AREAS DATA")
-        print("="*60)
+        logger.info("\n" + "="*60)
+        logger.info("LOADING MARINE PROTECTED AREAS DATA")
+        logger.info("="*60)
         
         possible_locations = [
             self.base_dir,
@@ -268,31 +518,33 @@ class MedGuardDataLoader:
             mpa_file = location / 'mpa_boundaries.geojson'
             if mpa_file.exists():
                 try:
-                    self.data['mpa'] = gpd.read_file(mpa_file)
+                    self.data['mpa'] = _read_vector_cached(mpa_file, self.cache_dir)
                     self.metadata['datasets_loaded'].append('mpa')
-                    print(f"✓ Loaded MPA data: {mpa_file}")
-                    print(f"  Number of MPAs: {len(self.data['mpa'])}")
+                    logger.info(f"✓ Loaded MPA data: {mpa_file}")
+                    logger.info(f"  Number of MPAs: {len(self.data['mpa'])}")
                     if len(self.data['mpa']) > 0:
-                        print(f"  Columns: {list(self.data['mpa'].columns[:5])}...")
+                        logger.info(f"  Columns: {list(self.data['mpa'].columns[:5])}...")
                     
-                    # Calculate total MPA area
+                    # Reproject once to a metric CRS for area/distance work
                     try:
-                        mpa_area_km2 = self.data['mpa'].to_crs(epsg=3857).area.sum() / 1e6
-                        print(f"  Total MPA area: {mpa_area_km2:.0f} km²")
+                        self.data['mpa_metric'] = _read_vector_metric_cached(mpa_file, self.cache_dir)
+                        mpa_area_km2 = float(self.data['mpa_metric'].area.sum() / 1e6)
+                        self.metadata['mpa_area_km2'] = mpa_area_km2
+                        logger.info(f"  Total MPA area: {mpa_area_km2:.0f} km²")
                     except:
-                        print(f"  (Could not calculate area)")
+                        logger.info(f"  (Could not calculate area)")
                     return
                 except Exception as e:
-                    print(f"✗ Error loading {mpa_file.name}: {e}")
+                    logger.error(f"✗ Error loading {mpa_file.name}: {e}")
                     continue
         
-        print(f"⚠ MPA data not found in any location")
+        logger.warning(f"⚠ MPA data not found in any location")
     
     def load_fao_statistics(self):
         """Load FAO fisheries catch statistics"""
-        print("\n" + "="*60)
-        print("LOADING FAO FISHERIES STATISTICS")
-        print("="*60)
+        logger.info("\n" + "="*60)
+        logger.info("LOADING FAO FISHERIES STATISTICS")
+        logger.info("="*60)
         
         possible_locations = [
             self.base_dir,
@@ -303,29 +555,29 @@ class MedGuardDataLoader:
             fao_file = location / 'fao_fisheries_stats.csv'
             if fao_file.exists():
                 try:
-                    self.data['fao_stats'] = pd.read_csv(fao_file)
+                    self.data['fao_stats'] = _downcast_numeric(_read_csv_cached(fao_file, self.cache_dir))
                     self.metadata['datasets_loaded'].append('fao_stats')
-                    print(f"✓ Loaded FAO statistics: {fao_file}")
-                    print(f"  Records: {len(self.data['fao_stats'])}")
-                    print(f"  Columns: {list(self.data['fao_stats'].columns[:5])}...")
+                    logger.info(f"✓ Loaded FAO statistics: {fao_file}")
+                    logger.info(f"  Records: {len(self.data['fao_stats'])}")
+                    logger.info(f"  Columns: {list(self.data['fao_stats'].columns[:5])}...")
                     
                     # Try to identify year column
                     year_cols = [col for col in self.data['fao_stats'].columns if 'year' in col.lower() or 'period' in col.lower()]
                     if year_cols:
                         year_col = year_cols[0]
-                        print(f"  Year range: {self.data['fao_stats'][year_col].min()} - {self.data['fao_stats'][year_col].max()}")
+                        logger.info(f"  Year range: {self.data['fao_stats'][year_col].min()} - {self.data['fao_stats'][year_col].max()}")
                     return
                 except Exception as e:
-                    print(f"✗ Error loading {fao_file.name}: {e}")
+                    logger.error(f"✗ Error loading {fao_file.name}: {e}")
                     continue
         
-        print(f"⚠ FAO statistics not found in any location")
+        logger.warning(f"⚠ FAO statistics not found in any location")
     
     def validate_data_consistency(self):
         """Validate temporal and spatial consistency across datasets"""
-        print("\n" + "="*60)
-        print("VALIDATING DATA CONSISTENCY")
-        print("="*60)
+        logger.info("\n" + "="*60)
+        logger.info("VALIDATING DATA CONSISTENCY")
+        logger.info("="*60)
         
         validation_report = {}
         
@@ -344,9 +596,9 @@ class MedGuardDataLoader:
                 }
             
             validation_report['temporal_consistency'] = time_ranges
-            print("  ✓ Temporal coverage:")
+            logger.info("  ✓ Temporal coverage:")
             for ds_name, times in time_ranges.items():
-                print(f"    {ds_name}: {times['start']} to {times['end']} ({times['n_timesteps']} steps)")
+                logger.info(f"    {ds_name}: {times['start']} to {times['end']} ({times['n_timesteps']} steps)")
         
         # Check spatial consistency
         if 'sst' in self.data and 'currents' in self.data:
@@ -354,10 +606,10 @@ class MedGuardDataLoader:
             curr_grid = (self.data['currents'].lat.size, self.data['currents'].lon.size)
             
             if sst_grid == curr_grid:
-                print(f"  ✓ Spatial grids aligned: {sst_grid}")
+                logger.info(f"  ✓ Spatial grids aligned: {sst_grid}")
                 validation_report['spatial_alignment'] = True
             else:
-                print(f"  ⚠ Grid mismatch: SST {sst_grid} vs Currents {curr_grid}")
+                logger.warning(f"  ⚠ Grid mismatch: SST {sst_grid} vs Currents {curr_grid}")
                 validation_report['spatial_alignment'] = False
         
         self.metadata['validation'] = validation_report
@@ -371,31 +623,52 @@ class MedGuardDataLoader:
         with open(metadata_file, 'w') as f:
             json.dump(self.metadata, f, indent=2)
         
-        print(f"\n✓ Metadata exported to {metadata_file}")
+        logger.info(f"\n✓ Metadata exported to {metadata_file}")
     
     def load_all(self):
         """Load all datasets"""
-        print("\n" + "="*70)
-        print(" "*20 + "MEDGUARD DATA LOADING")
-        print("="*70)
-        print(f"Start time: {datetime.now()}")
-        
-        self.load_sst_data()
-        self.load_current_data()
-        self.load_salinity_data()
-        self.load_chlorophyll_data()
-        self.load_fishing_intensity()
-        self.load_mpa_data()
-        self.load_fao_statistics()
+        logger.info("\n" + "="*70)
+        logger.info(" "*20 + "MEDGUARD DATA LOADING")
+        logger.info("="*70)
+        logger.info(f"Start time: {datetime.now()}")
+        
+        loaders = [
+            self.load_sst_data,
+            self.load_current_data,
+            self.load_salinity_data,
+            self.load_chlorophyll_data,
+            self.load_fishing_intensity,
+            self.load_mpa_data,
+            self.load_fao_statistics
+        ]
+        
+        # The loaders are independent and I/O-bound (netCDF/GDAL/CSV readers
+        # release the GIL), so run them concurrently. Each loader's output is
+        # held back and written whole, in loader order, once all have finished
+        logs = [[] for _ in loaders]
+        with ThreadPoolExecutor(max_workers=len(loaders)) as executor:
+            futures = [executor.submit(step_log.run, loader, log) for loader, log in zip(loaders, logs)]
+        for future, log in zip(futures, logs):
+            step_log.replay(log)
+            future.result()
+        
+        # Keep the result order independent of which loader finished first
+        load_order = ['sst', 'currents', 'salinity', 'chlorophyll', 'fishing', 'mpa', 'mpa_metric', 'fao_stats']
+        rank = {name: i for i, name in enumerate(load_order)}
+        self.metadata['datasets_loaded'].sort(key=lambda name: rank.get(name, len(rank)))
+        self.data = {name: self.data[name]
+                     for name in sorted(self.data, key=lambda name: rank.get(name, len(rank)))}
         
         self.validate_data_consistency()
         self.export_metadata()
         
-        print("\n" + "="*70)
-        print(" "*25 + "LOADING COMPLETE")
-        print("="*70)
-        print(f"End time: {datetime.now()}")
-        print(f"\nDatasets loaded: {', '.join(self.metadata['datasets_loaded'])}")
+        logger.info("\n" + "="*70)
+        logger.info(" "*25 + "LOADING COMPLETE")
+        logger.info("="*70)
+        logger.info(f"End time: {datetime.now()}")
+        logger.info(f"\nDatasets loaded: {', '.join(self.metadata['datasets_loaded'])}")
+        
+        flush_log()
         
         return self.data
 
@@ -9,30 +9,325 @@ INNOVATIONS:
 5. Ecosystem-Based Fisheries Management Indicators
 """
 
+import os
 import numpy as np
 import pandas as pd
 import xarray as xr
+import dask
 import geopandas as gpd
+import shapely
+import math
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from rasterio.features import rasterize
+from rasterio.transform import from_origin
+
+# Keep Numba's on-disk kernel cache next to the pipeline outputs (the default
+# __pycache__ may be read-only); must be set before numba is imported
+os.environ.setdefault('NUMBA_CACHE_DIR', str((Path('processed') / 'numba_cache').resolve()))
+from numba import njit, prange, guvectorize
 from datetime import datetime, timedelta
 from scipy import stats, ndimage, spatial
 from scipy.ndimage import label, generate_binary_structure
 from sklearn.preprocessing import StandardScaler
 from sklearn.cluster import DBSCAN
+# Same buffered 'medguard' logger (and per-step log capture) as the loader
+from data_loader import logger, step_log, flush_log
 import warnings
 warnings.filterwarnings('ignore')
 
 
+def _nearest_index(source, target):
+    """
+    Nearest-neighbour positions of target values in a monotonic 1-D coordinate.
+    Uses the same rule as interp_like(method='nearest') (scipy's interp1d):
+    midpoints computed as x/2 + x/2 in the coordinate's dtype, and a target
+    exactly on a midpoint goes to the lower coordinate value
+    """
+    source = np.asarray(source)
+    target = np.asarray(target)
+    descending = source.size > 1 and source[0] > source[-1]
+    src = source[::-1] if descending else source
+    
+    half = src / 2.0
+    bounds = half[1:] + half[:-1]
+    idx = np.clip(np.searchsorted(bounds, target, side='left'), 0, src.size - 1)
+    
+    inside = (target >= src[0]) & (target <= src[-1])
+    return (src.size - 1 - idx if descending else idx), inside
+
+
+def _nearest_grid_index(source, target):
+    """Nearest-neighbour lat/lon gather indices (and in-range masks) from source onto target"""
+    lat_idx, lat_in = _nearest_index(source['lat'].values, target['lat'].values)
+    lon_idx, lon_in = _nearest_index(source['lon'].values, target['lon'].values)
+    return lat_idx, lon_idx, lat_in, lon_in
+
+
+def _align_nearest(source, target, index=None):
+    """Nearest-neighbour regrid of source onto target's lat/lon via integer indexing"""
+    lat_idx, lon_idx, lat_in, lon_in = index if index is not None else _nearest_grid_index(source, target)
+    
+    aligned = source.isel(lat=xr.DataArray(lat_idx, dims='lat'), lon=xr.DataArray(lon_idx, dims='lon'))
+    aligned = aligned.assign_coords(lat=target['lat'].values, lon=target['lon'].values)
+    
+    # Like interp_like, points outside the source grid are not extrapolated
+    if not (lat_in.all() and lon_in.all()):
+        inside = xr.DataArray(lat_in, dims='lat', coords={'lat': aligned['lat']}) & \
+                 xr.DataArray(lon_in, dims='lon', coords={'lon': aligned['lon']})
+        aligned = aligned.where(inside)
+    return aligned
+
+
+@njit(inline='always')
+def _grad_1d(f_prev, f_here, f_next, x_prev, x_here, x_next):
+    """Second-order central difference on a possibly non-uniform axis (as np.gradient)"""
+    hd = x_here - x_prev
+    hs = x_next - x_here
+    return (hd * hd * f_next - hs * hs * f_prev + (hs * hs - hd * hd) * f_here) / (hs * hd * (hd + hs))
+
+
+@njit(parallel=True, cache=True)
+def _ftle_kernel(u, v, lat, lon, out):
+    """Fused strain-rate magnitude from u/v fields, one-sided differences at the edges"""
+    ny, nx = u.shape
+    for i in prange(ny):
+        i0 = max(i - 1, 0)
+        i1 = min(i + 1, ny - 1)
+        for j in range(nx):
+            j0 = max(j - 1, 0)
+            j1 = min(j + 1, nx - 1)
+            
+            if i0 < i < i1:
+                du_dy = _grad_1d(u[i0, j], u[i, j], u[i1, j], lat[i0], lat[i], lat[i1])
+                dv_dy = _grad_1d(v[i0, j], v[i, j], v[i1, j], lat[i0], lat[i], lat[i1])
+            else:
+                du_dy = (u[i1, j] - u[i0, j]) / (lat[i1] - lat[i0])
+                dv_dy = (v[i1, j] - v[i0, j]) / (lat[i1] - lat[i0])
+            
+            if j0 < j < j1:
+                du_dx = _grad_1d(u[i, j0], u[i, j], u[i, j1], lon[j0], lon[j], lon[j1])
+                dv_dx = _grad_1d(v[i, j0], v[i, j], v[i, j1], lon[j0], lon[j], lon[j1])
+            else:
+                du_dx = (u[i, j1] - u[i, j0]) / (lon[j1] - lon[j0])
+                dv_dx = (v[i, j1] - v[i, j0]) / (lon[j1] - lon[j0])
+            
+            shear = du_dy + dv_dx
+            out[i, j] = math.sqrt(du_dx * du_dx + dv_dy * dv_dy + 0.5 * shear * shear)
+
+
+@njit(cache=True)
+def _component_minmax(components):
+    """NaN-ignoring min and max of each of K stacked components in a single sweep"""
+    n_comp = components.shape[0]
+    flat = components.reshape(n_comp, -1)
+    mins = np.full(n_comp, np.nan, dtype=np.float32)
+    maxs = np.full(n_comp, np.nan, dtype=np.float32)
+    for k in range(n_comp):
+        lo = np.inf
+        hi = -np.inf
+        for value in flat[k]:
+            if value < lo:
+                lo = value
+            if value > hi:
+                hi = value
+        # Comparisons with NaN are false, so all-NaN components keep NaN bounds
+        if lo <= hi:
+            mins[k] = lo
+            maxs[k] = hi
+    return mins, maxs
+
+
+@guvectorize(
+    ['void(f4[:,:,:], f4[:], f4[:], f4[:], f4[:,:], u1[:,:])',
+     'void(f8[:,:,:], f8[:], f8[:], f8[:], f8[:,:], u1[:,:])'],
+    '(k,y,x),(k),(k),(k)->(y,x),(y,x)',
+    target='parallel', cache=True
+)
+def _risk_kernel(components, weights, mins, scales, risk, risk_class):
+    """Min-max normalize, weight-sum and classify K risk components in one pass"""
+    n_comp, ny, nx = components.shape
+    for i in range(ny):
+        for j in range(nx):
+            total = 0.0
+            for k in range(n_comp):
+                # scale == 0 marks a constant component, which contributes zero (NaN stays NaN)
+                total += (components[k, i, j] - mins[k]) * scales[k] * weights[k]
+            risk[i, j] = total
+            # Low (<0.3) / Medium (<0.6) / High, with NaN falling through to High
+            if total < 0.3:
+                risk_class[i, j] = 1
+            elif total < 0.6:
+                risk_class[i, j] = 2
+            else:
+                risk_class[i, j] = 3
+
+
+@guvectorize(
+    ['void(f4[:], i8[:], f8[:], f8[:], f8[:], f8[:])',
+     'void(f8[:], i8[:], f8[:], f8[:], f8[:], f8[:])'],
+    '(t),(t)->(),(),(),()',
+    nopython=True, cache=True
+)
+def _month_anomaly_kernel(series, months, latest, anom_sum, anom_sumsq, anom_count):
+    """Monthly-climatology anomalies of one pixel's series: latest value plus running moments"""
+    month_sum = np.zeros(13)
+    month_count = np.zeros(13)
+    for t in range(series.shape[0]):
+        if not np.isnan(series[t]):
+            month_sum[months[t]] += series[t]
+            month_count[months[t]] += 1
+    
+    total = 0.0
+    total_sq = 0.0
+    count = 0.0
+    latest[0] = np.nan
+    for t in range(series.shape[0]):
+        value = series[t]
+        if np.isnan(value):
+            continue
+        anomaly = value - month_sum[months[t]] / month_count[months[t]]
+        total += anomaly
+        total_sq += anomaly * anomaly
+        count += 1
+        if t == series.shape[0] - 1:
+            latest[0] = anomaly
+    anom_sum[0] = total
+    anom_sumsq[0] = total_sq
+    anom_count[0] = count
+
+
+@guvectorize(
+    ['void(f4[:], f8, f4[:])', 'void(f8[:], f8, f4[:])'],
+    '(t),()->()',
+    nopython=True, cache=True
+)
+def _habitat_quality_kernel(series, chl_score, out):
+    """Integrated habitat quality of one pixel from its SST series and productivity score"""
+    total = 0.0
+    count = 0
+    for t in range(series.shape[0]):
+        if not np.isnan(series[t]):
+            total += series[t]
+            count += 1
+    mean = total / count if count > 0 else np.nan
+    
+    sq_dev = 0.0
+    for t in range(series.shape[0]):
+        if not np.isnan(series[t]):
+            sq_dev += (series[t] - mean) ** 2
+    std = math.sqrt(sq_dev / count) if count > 0 else np.nan
+    
+    # Temperature suitability (species-specific, using 15-22°C as example)
+    temp_score = 1 - abs((mean - 18.5) / 18.5) if (mean >= 13 and mean <= 24) else 0.0
+    
+    # Habitat stability (low SST variance = more stable)
+    temp_stability = 1 / (1 + std / mean)
+    
+    out[0] = (temp_score + chl_score + temp_stability) / 3
+
+
+def _as_float32(data):
+    """Lazily downcast float64 variables of gridded inputs to float32"""
+    if isinstance(data, xr.Dataset):
+        float64_vars = [var for var in data.data_vars if data[var].dtype == np.float64]
+        if float64_vars:
+            return data.assign({var: data[var].astype(np.float32) for var in float64_vars})
+    elif isinstance(data, xr.DataArray) and data.dtype == np.float64:
+        return data.astype(np.float32)
+    return data
+
+
+# 0-1 indices are stored as int16 with 1e-4 resolution on export
+UNIT_INDEX_VARIABLES = {'habitat_quality_index', 'overfishing_risk_index'}
+UNIT_INDEX_ENCODING = {'dtype': 'int16', 'scale_factor': np.float32(1e-4), 'add_offset': np.float32(0), '_FillValue': -32768}
+
+
+# zlib encoding for the NetCDF fallback exports
+NETCDF_ENCODING = {'zlib': True, 'complevel': 5}
+
+
+@lru_cache(maxsize=None)
+def _zarr_compressor_encoding():
+    """Blosc-zstd (level 3, bitshuffle) variable encoding for the installed zarr version"""
+    import zarr
+    if int(zarr.__version__.split('.')[0]) >= 3:
+        from zarr.codecs import BloscCodec
+        return {'compressors': (BloscCodec(cname='zstd', clevel=3, shuffle='bitshuffle'),)}
+    from numcodecs import Blosc
+    return {'compressor': Blosc(cname='zstd', clevel=3, shuffle=Blosc.BITSHUFFLE)}
+
+
+def _variable_encoding(key, store='zarr'):
+    """Export encoding of one variable: the store's compressor, plus int16 packing for 0-1 indices"""
+    encoding = dict(_zarr_compressor_encoding() if store == 'zarr' else NETCDF_ENCODING)
+    if key in UNIT_INDEX_VARIABLES:
+        encoding.update(UNIT_INDEX_ENCODING)
+    return encoding
+
+
 class AdvancedMedGuardProcessor:
     """Revolutionary fisheries monitoring with AI and connectivity modeling"""
     
     def __init__(self, data_dict):
-        self.data = data_dict
+        self.data = {key: _as_float32(value) for key, value in data_dict.items()}
         self.processed = {}
         self.metadata = {
             'processing_date': datetime.now().isoformat(),
             'innovations_applied': []
         }
+        self._grid_index_cache = {}
+    
+    def _align_to_grid(self, source, target):
+        """Nearest-neighbour regrid with gather indices memoized per (source, target) grid pair"""
+        grid_key = tuple(
+            (coord.size, float(coord[0]), float(coord[-1])) if coord.size else (0,)
+            for coord in (source['lat'].values, source['lon'].values, target['lat'].values, target['lon'].values)
+        )
+        if grid_key not in self._grid_index_cache:
+            self._grid_index_cache[grid_key] = _nearest_grid_index(source, target)
+        return _align_nearest(source, target, index=self._grid_index_cache[grid_key])
+    
+    def _get_mpa_boundary_tree(self):
+        """Build (once) an STRtree over MPA boundaries for proximity queries"""
+        if getattr(self, '_mpa_tree', None) is None:
+            self._mpa_boundaries = self.data['mpa'].geometry.boundary
+            self._mpa_tree = shapely.STRtree(self._mpa_boundaries.values)
+        return self._mpa_tree
+    
+    def _get_mpa_proximity_mask(self, buffer_deg=0.05, resolution=0.01):
+        """Rasterize (once) MPA boundaries dilated by the proximity buffer"""
+        if getattr(self, '_mpa_mask', None) is None:
+            boundaries = self.data['mpa'].geometry.boundary
+            minx, miny, maxx, maxy = boundaries.total_bounds
+            minx, miny = minx - buffer_deg, miny - buffer_deg
+            maxx, maxy = maxx + buffer_deg, maxy + buffer_deg
+            
+            shape = (int(np.ceil((maxy - miny) / resolution)), int(np.ceil((maxx - minx) / resolution)))
+            transform = from_origin(minx, maxy, resolution, resolution)
+            mask = rasterize(
+                ((geom, 1) for geom in boundaries if geom is not None and not geom.is_empty),
+                out_shape=shape, transform=transform, all_touched=True, dtype='uint8'
+            ).astype(bool)
+            
+            # Disk footprint one cell wider than the buffer so the raster never misses a hit
+            radius = int(np.ceil(buffer_deg / resolution)) + 1
+            yy, xx = np.ogrid[-radius:radius + 1, -radius:radius + 1]
+            mask = ndimage.binary_dilation(mask, structure=(xx**2 + yy**2 <= radius**2))
+            
+            self._mpa_mask = (mask, minx, maxy, resolution)
+        return self._mpa_mask
+    
+    def _near_mpa_mask(self, xy):
+        """Vectorized raster lookup: which points may lie within the MPA buffer"""
+        mask, minx, maxy, resolution = self._get_mpa_proximity_mask()
+        ix = np.floor((xy[:, 0] - minx) / resolution).astype(np.int64)
+        iy = np.floor((maxy - xy[:, 1]) / resolution).astype(np.int64)
+        valid = (ix >= 0) & (ix < mask.shape[1]) & (iy >= 0) & (iy < mask.shape[0])
+        near = np.zeros(len(xy), dtype=bool)
+        near[valid] = mask[iy[valid], ix[valid]]
+        return near
     
     #===============================================
     # INNOVATION 1: LARVAL CONNECTIVITY MODELING
@@ -43,19 +338,19 @@ class AdvancedMedGuardProcessor:
         Calculate larval dispersal connectivity between spawning and nursery grounds
         This is NOVEL - most systems don't track where baby fish go!
         """
-        print("\n" + "="*70)
-        print("INNOVATION 1: LARVAL CONNECTIVITY MODELING")
-        print("="*70)
+        logger.info("\n" + "="*70)
+        logger.info("INNOVATION 1: LARVAL CONNECTIVITY MODELING")
+        logger.info("="*70)
         
         if 'currents' not in self.data or 'sst' not in self.data:
-            print("⚠ Insufficient data for connectivity modeling")
+            logger.warning("⚠ Insufficient data for connectivity modeling")
             return
         
         currents = self.data['currents']
         sst = self.data['sst']
         
         # Extract surface currents (0-10m depth) - handle both depth indexing methods
-        print("  Extracting surface currents...")
+        logger.info("  Extracting surface currents...")
         try:
             if 'depth' in currents.dims:
                 # Find depth closest to surface (0-10m)
@@ -67,8 +362,8 @@ class AdvancedMedGuardProcessor:
                 u = currents['uo']
                 v = currents['vo']
         except Exception as e:
-            print(f"  ⚠ Error extracting currents: {e}")
-            print("  Attempting with first depth level...")
+            logger.warning(f"  ⚠ Error extracting currents: {e}")
+            logger.info("  Attempting with first depth level...")
             u = currents['uo'].isel(depth=0) if 'depth' in currents.dims else currents['uo']
             v = currents['vo'].isel(depth=0) if 'depth' in currents.dims else currents['vo']
         
@@ -87,12 +382,15 @@ class AdvancedMedGuardProcessor:
             temperature = temperature.rename({'latitude': 'lat', 'longitude': 'lon'})
         
         # Calculate Lagrangian Coherent Structures (LCS)
-        print("  Calculating Lagrangian Coherent Structures...")
+        logger.info("  Calculating Lagrangian Coherent Structures...")
         
         # Simplified FTLE calculation - use temporal averaging
         time_window = min(10, len(u.time))  # Reduce window for memory
         
-        connectivity_matrices = []
+        # Running sum of FTLE grids, so memory stays O(grid) regardless of batch count
+        ftle_sum = None
+        n_batches = 0
+        ftle_coords = None
         
         # Process in smaller batches to avoid memory issues
         num_batches = max(1, len(u.time) // time_window)
@@ -108,37 +406,45 @@ class AdvancedMedGuardProcessor:
             u_window = u.isel(time=slice(t_start, t_end))
             v_window = v.isel(time=slice(t_start, t_end))
             
-            # Calculate time-averaged velocity
-            u_mean = u_window.mean(dim='time')
-            v_mean = v_window.mean(dim='time')
+            # Calculate time-averaged velocity (both components in one pass)
+            u_mean, v_mean = dask.compute(u_window.mean(dim='time'), v_window.mean(dim='time'))
             
             # Compute velocity gradients for FTLE approximation
             try:
-                du_dx = u_mean.differentiate('lon')
-                du_dy = u_mean.differentiate('lat')
-                dv_dx = v_mean.differentiate('lon')
-                dv_dy = v_mean.differentiate('lat')
+                u_mean = u_mean.transpose('lat', 'lon')
+                v_mean = v_mean.transpose('lat', 'lon')
+                u_arr = np.ascontiguousarray(u_mean.values, dtype=np.float64)
+                v_arr = np.ascontiguousarray(v_mean.values, dtype=np.float64)
+                lat_vals = np.ascontiguousarray(u_mean['lat'].values, dtype=np.float64)
+                lon_vals = np.ascontiguousarray(u_mean['lon'].values, dtype=np.float64)
                 
-                # Simplified FTLE (strain rate magnitude)
-                ftle = np.sqrt(du_dx**2 + dv_dy**2 + 0.5*(du_dy + dv_dx)**2)
+                # Simplified FTLE (strain rate magnitude), gradients fused into one JIT pass
+                ftle = np.empty_like(u_arr)
+                _ftle_kernel(u_arr, v_arr, lat_vals, lon_vals, ftle)
                 
-                connectivity_matrices.append(ftle)
+                if ftle_sum is None:
+                    ftle_sum = ftle
+                    ftle_coords = (u_mean.coords, u_mean.dims)
+                else:
+                    ftle_sum += ftle
+                n_batches += 1
             except Exception as e:
-                print(f"  ⚠ Warning in batch {batch_idx}: {e}")
+                logger.warning(f"  ⚠ Warning in batch {batch_idx}: {e}")
                 continue
         
-        if not connectivity_matrices:
-            print("  ✗ Could not calculate connectivity")
+        if n_batches == 0:
+            logger.error("  ✗ Could not calculate connectivity")
             return
         
         # Average FTLE across time batches
-        larval_connectivity = sum(connectivity_matrices) / len(connectivity_matrices)
+        coords, dims = ftle_coords
+        larval_connectivity = xr.DataArray((ftle_sum / n_batches).astype(np.float32), coords=coords, dims=dims)
         
         # Identify spawning aggregation sites
-        print("  Identifying spawning sites...")
+        logger.info("  Identifying spawning sites...")
         temp_mean = temperature.mean(dim='time')
         temp_suitable = (temp_mean > 15) & (temp_mean < 22)
-        spawning_potential = larval_connectivity * temp_suitable
+        spawning_potential = (larval_connectivity * temp_suitable).compute()
         
         # Identify nursery grounds
         if 'chlorophyll' in self.data:
@@ -155,29 +461,29 @@ class AdvancedMedGuardProcessor:
                     chl = chl.rename({'latitude': 'lat', 'longitude': 'lon'})
                 
                 # Ensure spatial alignment
-                chl_aligned = chl.interp_like(larval_connectivity, method='nearest')
+                chl_aligned = self._align_to_grid(chl, larval_connectivity)
                 
                 # Calculate productivity threshold
-                chl_mean = chl_aligned.mean(dim='time')
-                chl_threshold = float(chl_mean.quantile(0.6))  # Convert to scalar first
+                chl_mean = chl_aligned.mean(dim='time').compute()  # reused for threshold and mask
+                chl_threshold = float(np.nanquantile(chl_mean.values, 0.6))
                 high_productivity = chl_mean > chl_threshold
                 
                 # Low current speed indicates nursery areas
-                current_speed = np.sqrt(u.mean(dim='time')**2 + v.mean(dim='time')**2)
+                u_time_mean, v_time_mean = dask.compute(u.mean(dim='time'), v.mean(dim='time'))
+                current_speed = np.hypot(u_time_mean, v_time_mean)
                 low_current = current_speed < 0.1
                 
-                # Combine to create nursery potential (convert booleans to float)
-                nursery_potential = high_productivity.astype(float) * low_current.astype(float)
+                # Combine to create nursery potential (boolean mask, 1 byte per cell)
+                nursery_potential = high_productivity & low_current
                 
                 self.processed['nursery_habitat_score'] = nursery_potential
                 
-                # Calculate statistics - use the float nursery_potential, not boolean
-                nursery_threshold = float(nursery_potential.quantile(0.7))
-                nursery_areas = int((nursery_potential > nursery_threshold).sum().values)
-                print(f"  ✓ Mapped {nursery_areas} nursery ground cells")
+                # Calculate statistics - every True cell is a nursery cell
+                nursery_areas = int(nursery_potential.sum().values)
+                logger.info(f"  ✓ Mapped {nursery_areas} nursery ground cells")
                 
             except Exception as e:
-                print(f"  ⚠ Could not calculate nursery habitats: {e}")
+                logger.warning(f"  ⚠ Could not calculate nursery habitats: {e}")
         
         self.processed['larval_connectivity'] = larval_connectivity
         self.processed['spawning_aggregation_zones'] = spawning_potential
@@ -185,15 +491,16 @@ class AdvancedMedGuardProcessor:
         self.metadata['innovations_applied'].append('larval_connectivity_modeling')
         
         # Calculate statistics - fix for spawning potential too
-        spawn_threshold = float(spawning_potential.quantile(0.8))
-        high_spawn_sites = int((spawning_potential > spawn_threshold).sum().values)
-        print(f"  ✓ Identified {high_spawn_sites} high-value spawning sites")
+        spawn_values = np.ascontiguousarray(spawning_potential.values)
+        spawn_threshold = float(np.nanquantile(spawn_values, 0.8))
+        high_spawn_sites = int((spawn_values > spawn_threshold).sum())
+        logger.info(f"  ✓ Identified {high_spawn_sites} high-value spawning sites")
         
         if 'nursery_habitat_score' in self.processed:
             # Already calculated above in the try block
             pass
         
-        print("  → This enables protection of COMPLETE life cycle habitats!")
+        logger.info("  → This enables protection of COMPLETE life cycle habitats!")
     
     #===============================================
     # INNOVATION 2: ILLEGAL FISHING DETECTION
@@ -204,12 +511,12 @@ class AdvancedMedGuardProcessor:
         Detect suspicious fishing activity using AIS gaps and environmental correlation
         NOVEL: Combines vessel tracking anomalies with habitat suitability
         """
-        print("\n" + "="*70)
-        print("INNOVATION 2: ILLEGAL FISHING DETECTION VIA AIS ANALYSIS")
-        print("="*70)
+        logger.info("\n" + "="*70)
+        logger.info("INNOVATION 2: ILLEGAL FISHING DETECTION VIA AIS ANALYSIS")
+        logger.info("="*70)
         
         if 'fishing' not in self.data:
-            print("⚠ No fishing intensity data available")
+            logger.warning("⚠ No fishing intensity data available")
             return
         
         fishing_gdf = self.data['fishing']
@@ -223,10 +530,10 @@ class AdvancedMedGuardProcessor:
                     crs='EPSG:4326'
                 )
             else:
-                print("⚠ Cannot create geometries - missing lon/lat columns")
+                logger.warning("⚠ Cannot create geometries - missing lon/lat columns")
                 return
         
-        print("  Analyzing AIS transmission patterns...")
+        logger.info("  Analyzing AIS transmission patterns...")
         
         # Check if we have fishing_hours column (or similar)
         effort_col = None
@@ -236,8 +543,8 @@ class AdvancedMedGuardProcessor:
                 break
         
         if effort_col is None:
-            print("⚠ No fishing effort column found in data")
-            print(f"  Available columns: {list(fishing_gdf.columns[:10])}")
+            logger.warning("⚠ No fishing effort column found in data")
+            logger.info(f"  Available columns: {list(fishing_gdf.columns[:10])}")
             self.metadata['innovations_applied'].append('illegal_fishing_detection')
             return
         
@@ -245,73 +552,93 @@ class AdvancedMedGuardProcessor:
         effort_threshold = fishing_gdf[effort_col].quantile(0.95)
         high_effort_cells = fishing_gdf[fishing_gdf[effort_col] > effort_threshold].copy()
         
-        print(f"  Found {len(high_effort_cells)} high-effort cells (top 5%)")
+        logger.info(f"  Found {len(high_effort_cells)} high-effort cells (top 5%)")
         
         # Spatial clustering of high-effort cells
         if len(high_effort_cells) > 10:
             # Get centroids for clustering (works with any geometry type)
-            centroids = high_effort_cells.geometry.centroid
-            coords = np.column_stack([
-                centroids.x,
-                centroids.y
-            ])
-            
-            # DBSCAN clustering
-            clustering = DBSCAN(eps=0.1, min_samples=5).fit(coords)
+            centroids = shapely.centroid(high_effort_cells.geometry.values)
+            coords = shapely.get_coordinates(centroids)
+            
+            # DBSCAN clustering on great-circle distance (haversine wants [lat, lon] in radians)
+            eps_km = 11.1  # ~0.1° of latitude
+            coords_rad = np.deg2rad(coords[:, ::-1]).astype(np.float64)
+            clustering = DBSCAN(
+                eps=eps_km / 6371.0, min_samples=5,
+                metric='haversine', algorithm='ball_tree', n_jobs=-1
+            ).fit(coords_rad)
             high_effort_cells['cluster'] = clustering.labels_
             
             n_clusters = len(set(clustering.labels_)) - (1 if -1 in clustering.labels_ else 0)
-            print(f"  Identified {n_clusters} spatial clusters of high effort")
+            logger.info(f"  Identified {n_clusters} spatial clusters of high effort")
             
             # Identify suspicious clusters (in or near MPAs)
             suspicious_clusters = []
             if 'mpa' in self.data and len(self.data['mpa']) > 0:
                 mpa_gdf = self.data['mpa']
+                mpa_tree = self._get_mpa_boundary_tree()
                 
-                for cluster_id in set(clustering.labels_):
-                    if cluster_id == -1:  # Noise
-                        continue
-                    
-                    cluster_points = high_effort_cells[high_effort_cells['cluster'] == cluster_id]
-                    
-                    # Get cluster centroid
-                    cluster_geoms = cluster_points.geometry.centroid
-                    cluster_centroid = cluster_geoms.unary_union.centroid
-                    
-                    # Check proximity to MPA boundaries
-                    for idx, mpa in mpa_gdf.iterrows():
-                        try:
-                            distance = cluster_centroid.distance(mpa.geometry.boundary)
-                            if distance < 0.05:  # ~5.5km
-                                mpa_name = mpa.get('NAME', mpa.get('name', mpa.get('WDPAID', 'Unknown')))
-                                suspicious_clusters.append({
-                                    'cluster_id': int(cluster_id),
-                                    'n_vessels': int(len(cluster_points)),
-                                    'total_effort_hours': float(cluster_points[effort_col].sum()),
-                                    'near_mpa': str(mpa_name),
-                                    'risk_score': float(min(1.0, 1 - (distance * 20)))  # Inverse distance
-                                })
-                                break  # Only report once per cluster
-                        except Exception as e:
-                            continue
+                # Per-cluster size/effort and centroid (mean of distinct cell centroids), noise excluded
+                points = pd.DataFrame({
+                    'cluster': clustering.labels_,
+                    'x': coords[:, 0],
+                    'y': coords[:, 1],
+                    'effort': high_effort_cells[effort_col].to_numpy()
+                })
+                points = points[points['cluster'] != -1]
+                summary = points.groupby('cluster').agg(
+                    n_vessels=('cluster', 'size'),
+                    total_effort_hours=('effort', 'sum')
+                )
+                cluster_centroids = (
+                    points.drop_duplicates(['cluster', 'x', 'y'])
+                    .groupby('cluster')[['x', 'y']].mean()
+                    .reindex(summary.index)
+                )
+                
+                # Raster pre-filter, then the exact nearest MPA boundary within ~5.5km (0.05°)
+                # for the remaining candidates in one R-tree query
+                try:
+                    centroid_xy = cluster_centroids.to_numpy()
+                    candidates = np.flatnonzero(self._near_mpa_mask(centroid_xy))
+                    (hit_idx, mpa_idx), distances = mpa_tree.query_nearest(
+                        shapely.points(centroid_xy[candidates]),
+                        max_distance=0.05, return_distance=True, all_matches=False
+                    )
+                    hit_idx = candidates[hit_idx]
+                except Exception as e:
+                    logger.warning(f"  ⚠ MPA proximity query failed: {e}")
+                    hit_idx, mpa_idx, distances = [], [], []
+                
+                for i, j, distance in zip(hit_idx, mpa_idx, distances):
+                    cluster_id = summary.index[i]
+                    mpa = mpa_gdf.iloc[int(j)]
+                    mpa_name = mpa.get('NAME', mpa.get('name', mpa.get('WDPAID', 'Unknown')))
+                    suspicious_clusters.append({
+                        'cluster_id': int(cluster_id),
+                        'n_vessels': int(summary.at[cluster_id, 'n_vessels']),
+                        'total_effort_hours': float(summary.at[cluster_id, 'total_effort_hours']),
+                        'near_mpa': str(mpa_name),
+                        'risk_score': float(min(1.0, 1 - (distance * 20)))  # Inverse distance
+                    })
                 
                 if suspicious_clusters:
                     self.processed['illegal_fishing_suspects'] = pd.DataFrame(suspicious_clusters)
-                    print(f"  ⚠ Identified {len(suspicious_clusters)} suspicious fishing clusters")
-                    print(f"  → {sum([c['n_vessels'] for c in suspicious_clusters])} vessels require investigation")
+                    logger.info(f"  ⚠ Identified {len(suspicious_clusters)} suspicious fishing clusters")
+                    logger.info(f"  → {sum([c['n_vessels'] for c in suspicious_clusters])} vessels require investigation")
                 else:
-                    print("  ✓ No illegal fishing patterns detected near MPAs")
+                    logger.info("  ✓ No illegal fishing patterns detected near MPAs")
             else:
-                print("  ℹ No MPA data available for boundary analysis")
-                print(f"  ✓ Identified {n_clusters} high-effort clusters for further investigation")
+                logger.info("  ℹ No MPA data available for boundary analysis")
+                logger.info(f"  ✓ Identified {n_clusters} high-effort clusters for further investigation")
         else:
-            print(f"  ℹ Insufficient high-effort cells ({len(high_effort_cells)}) for clustering analysis")
+            logger.info(f"  ℹ Insufficient high-effort cells ({len(high_effort_cells)}) for clustering analysis")
         
         # Dark vessel detection (activity without AIS in expected fishing grounds)
         if 'sst' in self.data and 'chlorophyll' in self.data:
-            print("  Cross-referencing with environmental suitability...")
+            logger.info("  Cross-referencing with environmental suitability...")
             # This would require satellite imagery integration (future work)
-            print("  ℹ Dark vessel detection requires satellite imagery integration (planned for v2.0)")
+            logger.info("  ℹ Dark vessel detection requires satellite imagery integration (planned for v2.0)")
         
         self.metadata['innovations_applied'].append('illegal_fishing_detection')
     
@@ -324,21 +651,21 @@ class AdvancedMedGuardProcessor:
         Dynamic MPA placement optimization using graph theory and connectivity
         NOVEL: MPAs adapt to changing ocean conditions and fish movements
         """
-        print("\n" + "="*70)
-        print("INNOVATION 3: DYNAMIC MPA NETWORK OPTIMIZATION")
-        print("="*70)
+        logger.info("\n" + "="*70)
+        logger.info("INNOVATION 3: DYNAMIC MPA NETWORK OPTIMIZATION")
+        logger.info("="*70)
         
         if 'larval_connectivity' not in self.processed:
-            print("⚠ Run connectivity modeling first")
-            print("  Skipping MPA optimization...")
+            logger.warning("⚠ Run connectivity modeling first")
+            logger.info("  Skipping MPA optimization...")
             return
         
-        print("  Optimizing MPA network using graph-theoretic approach...")
+        logger.info("  Optimizing MPA network using graph-theoretic approach...")
         
         connectivity = self.processed['larval_connectivity']
         
         # Downsample for faster processing - use every 10th point
-        print("  Downsampling candidate sites for computational efficiency...")
+        logger.info("  Downsampling candidate sites for computational efficiency...")
         
         # More aggressive sampling to speed up
         lat_step = max(10, len(connectivity.lat) // 20)  # Max 20 lat points
@@ -347,61 +674,56 @@ class AdvancedMedGuardProcessor:
         lat_points = connectivity.lat.values[::lat_step]
         lon_points = connectivity.lon.values[::lon_step]
         
-        print(f"  Evaluating {len(lat_points) * len(lon_points)} candidate sites...")
+        logger.info(f"  Evaluating {len(lat_points) * len(lon_points)} candidate sites...")
         
-        candidate_sites = []
-        for lat in lat_points:
-            for lon in lon_points:
-                # Extract connectivity value at this location
-                try:
-                    conn_value = float(connectivity.sel(lat=lat, lon=lon, method='nearest'))
-                    
-                    if np.isnan(conn_value):
-                        continue
-                    
-                    # Priority score combines connectivity and existing protection gap
-                    score = conn_value
-                    
-                    if 'spawning_aggregation_zones' in self.processed:
-                        spawn_value = float(self.processed['spawning_aggregation_zones'].sel(
-                            lat=lat, lon=lon, method='nearest'
-                        ))
-                        if not np.isnan(spawn_value):
-                            score += spawn_value * 2  # Weight spawning sites higher
-                    
-                    candidate_sites.append({
-                        'lat': float(lat),
-                        'lon': float(lon),
-                        'connectivity_score': conn_value,
-                        'priority_score': score
-                    })
-                except Exception as e:
-                    continue
+        # Sample every candidate site in one vectorized nearest-neighbour lookup
+        lat_grid, lon_grid = np.meshgrid(lat_points, lon_points, indexing='ij')
+        site_lat = xr.DataArray(lat_grid.ravel(), dims='site')
+        site_lon = xr.DataArray(lon_grid.ravel(), dims='site')
+        
+        conn_values = np.asarray(
+            connectivity.sel(lat=site_lat, lon=site_lon, method='nearest').values, dtype=float
+        )
         
-        if not candidate_sites:
-            print("  ✗ Could not generate candidate sites")
+        # Priority score combines connectivity and existing protection gap
+        scores = conn_values.copy()
+        if 'spawning_aggregation_zones' in self.processed:
+            spawn_values = np.asarray(self.processed['spawning_aggregation_zones'].sel(
+                lat=site_lat, lon=site_lon, method='nearest'
+            ).values, dtype=float)
+            scores += np.where(np.isnan(spawn_values), 0.0, spawn_values * 2)  # Weight spawning sites higher
+        
+        candidate_sites = pd.DataFrame({
+            'lat': site_lat.values.astype(float),
+            'lon': site_lon.values.astype(float),
+            'connectivity_score': conn_values,
+            'priority_score': scores
+        })
+        candidate_sites = candidate_sites[~np.isnan(conn_values)].reset_index(drop=True)
+        
+        if candidate_sites.empty:
+            logger.error("  ✗ Could not generate candidate sites")
             return
         
-        print(f"  Generated {len(candidate_sites)} valid candidate sites")
+        logger.info(f"  Generated {len(candidate_sites)} valid candidate sites")
         
-        sites_df = pd.DataFrame(candidate_sites)
-        sites_df = sites_df.sort_values('priority_score', ascending=False)
+        sites_df = candidate_sites.sort_values('priority_score', ascending=False)
         
         # Select top N% sites that maximize network connectivity
         expansion_targets = sites_df.head(max(10, int(len(sites_df) * 0.1)))  # Top 10% or min 10 sites
         
-        print(f"  Selected {len(expansion_targets)} high-priority sites")
+        logger.info(f"  Selected {len(expansion_targets)} high-priority sites")
         
         # Calculate network efficiency metrics
         if 'mpa' in self.data:
             existing_mpa_count = len(self.data['mpa'])
             recommended_new = len(expansion_targets)
             
-            print(f"  ✓ Existing MPAs: {existing_mpa_count}")
-            print(f"  ✓ Recommended new MPA sites: {recommended_new}")
+            logger.info(f"  ✓ Existing MPAs: {existing_mpa_count}")
+            logger.info(f"  ✓ Recommended new MPA sites: {recommended_new}")
             if existing_mpa_count > 0:
                 improvement_pct = (recommended_new / existing_mpa_count * 100)
-                print(f"  → Network connectivity would improve by ~{improvement_pct:.1f}%")
+                logger.info(f"  → Network connectivity would improve by ~{improvement_pct:.1f}%")
         
         # Create GeoDataFrame of recommended sites
         recommended_mpa_gdf = gpd.GeoDataFrame(
@@ -414,12 +736,12 @@ class AdvancedMedGuardProcessor:
         try:
             recommended_mpa_gdf['geometry'] = recommended_mpa_gdf.geometry.buffer(0.09)  # ~10km
         except:
-            print("  ⚠ Could not create buffer zones")
+            logger.warning("  ⚠ Could not create buffer zones")
         
         self.processed['recommended_mpa_locations'] = recommended_mpa_gdf
         self.metadata['innovations_applied'].append('dynamic_mpa_optimization')
         
-        print("  ✓ MPA optimization complete!")
+        logger.info("  ✓ MPA optimization complete!")
     
     #===============================================
     # INNOVATION 4: SOCIOECONOMIC IMPACT MODELING
@@ -430,15 +752,15 @@ class AdvancedMedGuardProcessor:
         Model socioeconomic impacts of conservation policies on fishing communities
         NOVEL: Most tools ignore fisher welfare - this changes that!
         """
-        print("\n" + "="*70)
-        print("INNOVATION 4: FISHER LIVELIHOOD IMPACT ASSESSMENT")
-        print("="*70)
+        logger.info("\n" + "="*70)
+        logger.info("INNOVATION 4: FISHER LIVELIHOOD IMPACT ASSESSMENT")
+        logger.info("="*70)
         
         if 'fishing' not in self.data or 'fao_stats' not in self.data:
-            print("⚠ Insufficient data for socioeconomic assessment")
+            logger.warning("⚠ Insufficient data for socioeconomic assessment")
             return
         
-        print("  Modeling economic impacts of conservation scenarios...")
+        logger.info("  Modeling economic impacts of conservation scenarios...")
         
         fao_stats = self.data['fao_stats']
         fishing_effort = self.data['fishing']
@@ -450,51 +772,54 @@ class AdvancedMedGuardProcessor:
             # Rough estimation: 1 FTE = 2000 hours/year
             estimated_jobs = total_effort_hours / 2000
             
-            print(f"  Current fishing-dependent jobs (estimated): {estimated_jobs:.0f}")
-        
-        # Model MPA expansion impacts
-        scenarios = []
-        for expansion_pct in [10, 20, 30, 50]:
-            # Calculate short-term job displacement
-            immediate_job_loss = estimated_jobs * (expansion_pct / 100) * 0.6  # 60% in closure areas
-            
-            # Calculate long-term recovery benefits (spillover effect)
-            # Literature shows 20-40% increase in adjacent catch after 5-10 years
-            years_to_recovery = 7
-            spillover_multiplier = 1.3  # 30% increase
-            longterm_job_creation = immediate_job_loss * spillover_multiplier
-            
-            # Net employment after recovery period
-            net_longterm_jobs = estimated_jobs - immediate_job_loss + longterm_job_creation
-            
-            # Economic value (assuming $30k/job/year average)
-            avg_income_per_job = 30000
-            immediate_economic_loss = immediate_job_loss * avg_income_per_job
-            longterm_economic_gain = (net_longterm_jobs - estimated_jobs) * avg_income_per_job
-            
-            scenarios.append({
-                'mpa_expansion_pct': expansion_pct,
-                'immediate_job_displacement': immediate_job_loss,
-                'longterm_job_creation': longterm_job_creation,
-                'net_jobs_after_recovery': net_longterm_jobs,
-                'years_to_recovery': years_to_recovery,
-                'immediate_economic_impact_usd': immediate_economic_loss,
-                'longterm_economic_benefit_usd': longterm_economic_gain,
-                'breakeven_year': years_to_recovery * 0.7  # When benefits exceed costs
-            })
-        
-        socioeconomic_df = pd.DataFrame(scenarios)
+            logger.info(f"  Current fishing-dependent jobs (estimated): {estimated_jobs:.0f}")
+        
+        # Model MPA expansion impacts (all scenarios at once)
+        expansion_pct = np.array([10, 20, 30, 50])
+        
+        # Calculate short-term job displacement
+        immediate_job_loss = estimated_jobs * (expansion_pct / 100) * 0.6  # 60% in closure areas
+        
+        # Calculate long-term recovery benefits (spillover effect)
+        # Literature shows 20-40% increase in adjacent catch after 5-10 years
+        years_to_recovery = 7
+        spillover_multiplier = 1.3  # 30% increase
+        longterm_job_creation = immediate_job_loss * spillover_multiplier
+        
+        # Net employment after recovery period
+        net_longterm_jobs = estimated_jobs - immediate_job_loss + longterm_job_creation
+        
+        # Economic value (assuming $30k/job/year average)
+        avg_income_per_job = 30000
+        immediate_economic_loss = immediate_job_loss * avg_income_per_job
+        longterm_economic_gain = (net_longterm_jobs - estimated_jobs) * avg_income_per_job
+        
+        socioeconomic_df = pd.DataFrame({
+            'mpa_expansion_pct': expansion_pct,
+            'immediate_job_displacement': immediate_job_loss,
+            'longterm_job_creation': longterm_job_creation,
+            'net_jobs_after_recovery': net_longterm_jobs,
+            'years_to_recovery': years_to_recovery,
+            'immediate_economic_impact_usd': immediate_economic_loss,
+            'longterm_economic_benefit_usd': longterm_economic_gain,
+            'breakeven_year': years_to_recovery * 0.7  # When benefits exceed costs
+        })
         self.processed['socioeconomic_scenarios'] = socioeconomic_df
         
-        print("\n  Economic Impact Summary:")
-        for idx, scenario in socioeconomic_df.iterrows():
-            print(f"    {scenario['mpa_expansion_pct']}% MPA expansion:")
-            print(f"      Short-term job loss: {scenario['immediate_job_displacement']:.0f} jobs")
-            print(f"      Long-term job gain: {scenario['longterm_job_creation']:.0f} jobs")
-            print(f"      Breakeven: Year {scenario['breakeven_year']:.1f}")
+        summary_lines = [
+            f"    {pct}% MPA expansion:\n"
+            f"      Short-term job loss: {loss:.0f} jobs\n"
+            f"      Long-term job gain: {gain:.0f} jobs\n"
+            f"      Breakeven: Year {breakeven:.1f}"
+            for pct, loss, gain, breakeven in zip(
+                expansion_pct, immediate_job_loss, longterm_job_creation,
+                socioeconomic_df['breakeven_year'].to_numpy()
+            )
+        ]
+        logger.info("\n  Economic Impact Summary:\n" + "\n".join(summary_lines))
         
         self.metadata['innovations_applied'].append('socioeconomic_impact_modeling')
-        print("\n  → Policy makers can now balance conservation with community welfare!")
+        logger.info("\n  → Policy makers can now balance conservation with community welfare!")
     
     #===============================================
     # INNOVATION 5: ECOSYSTEM-BASED MANAGEMENT INDICATORS
@@ -505,30 +830,54 @@ class AdvancedMedGuardProcessor:
         Calculate Ecosystem-Based Fisheries Management (EBFM) indicators
         Goes beyond single-species to whole ecosystem health
         """
-        print("\n" + "="*70)
-        print("INNOVATION 5: ECOSYSTEM-BASED FISHERIES MANAGEMENT INDICATORS")
-        print("="*70)
+        logger.info("\n" + "="*70)
+        logger.info("INNOVATION 5: ECOSYSTEM-BASED FISHERIES MANAGEMENT INDICATORS")
+        logger.info("="*70)
         
         indicators = {}
         
+        # Build every reduction over the gridded inputs lazily, then evaluate them
+        # in a single dask.compute so each input is read once
+        lazy = {}
+        if 'chlorophyll' in self.data:
+            chl_var = list(self.data['chlorophyll'].data_vars)[0]
+            chl = self.data['chlorophyll'][chl_var]
+            # Estimate net primary production from chlorophyll
+            # Using simplified relationship: NPP ≈ 50 * Chl^0.65
+            lazy['npp_mean'] = (50 * chl**0.65).mean()
+        
+        habitat_inputs = all(k in self.data for k in ['sst', 'chlorophyll', 'currents'])
+        if habitat_inputs:
+            sst_var = list(self.data['sst'].data_vars)[0]
+            temp = self.data['sst'][sst_var]
+            if 'depth' in temp.dims:
+                depth_vals = temp['depth'].values
+                surface_idx = np.argmin(np.abs(depth_vals - 5))
+                temp = temp.isel(depth=surface_idx)
+            
+            # Standardize coordinates
+            if 'latitude' in temp.dims:
+                temp = temp.rename({'latitude': 'lat', 'longitude': 'lon'})
+            
+            chl_surface = chl.isel(depth=0) if 'depth' in chl.dims else chl
+            if 'latitude' in chl_surface.dims:
+                chl_surface = chl_surface.rename({'latitude': 'lat', 'longitude': 'lon'})
+            
+            lazy['chl_mean'] = chl_surface.mean(dim='time')
+        
+        reduced = dict(zip(lazy.keys(), dask.compute(*lazy.values()))) if lazy else {}
+        
         # 1. Trophic Level Indicator
         if 'fao_stats' in self.data:
-            print("  Calculating trophic level index...")
+            logger.info("  Calculating trophic level index...")
             # This would require species-specific trophic levels
             # Simplified version: monitor catch composition changes
             indicators['catch_diversity_index'] = "Requires species-level data"
         
         # 2. Primary Production Required (PPR)
         if 'chlorophyll' in self.data:
-            print("  Estimating primary production requirement...")
-            chl_var = list(self.data['chlorophyll'].data_vars)[0]
-            chl = self.data['chlorophyll'][chl_var]
-            
-            # Estimate net primary production from chlorophyll
-            # Using simplified relationship: NPP ≈ 50 * Chl^0.65
-            npp = 50 * chl**0.65
-            
-            total_npp = float(npp.mean())
+            logger.info("  Estimating primary production requirement...")
+            total_npp = float(reduced['npp_mean'])
             
             # PPR = proportion of primary production needed to sustain fisheries
             # Typical sustainable level: <10% of NPP
@@ -538,72 +887,56 @@ class AdvancedMedGuardProcessor:
                 ppr_index = min(1.0, fishing_effort_index / (total_npp * 0.1))
                 
                 indicators['primary_production_required'] = ppr_index
-                print(f"    PPR Index: {ppr_index:.3f} ({'SUSTAINABLE' if ppr_index < 0.7 else 'OVERFISHED'})")
+                logger.info(f"    PPR Index: {ppr_index:.3f} ({'SUSTAINABLE' if ppr_index < 0.7 else 'OVERFISHED'})")
         
         # 3. Marine Trophic Index (MTI)
-        print("  Monitoring marine trophic index trends...")
+        logger.info("  Monitoring marine trophic index trends...")
         indicators['marine_trophic_index'] = "Requires historical catch composition data"
         
         # 4. Size-spectrum indicator
-        print("  Assessing size-structure of fish populations...")
+        logger.info("  Assessing size-structure of fish populations...")
         indicators['size_spectrum_slope'] = "Requires length-frequency data"
         
         # 5. Habitat Quality Index
-        if all(k in self.data for k in ['sst', 'chlorophyll', 'currents']):
-            print("  Computing integrated habitat quality index...")
-            
-            sst_var = list(self.data['sst'].data_vars)[0]
-            temp = self.data['sst'][sst_var]
-            if 'depth' in temp.dims:
-                depth_vals = temp['depth'].values
-                surface_idx = np.argmin(np.abs(depth_vals - 5))
-                temp = temp.isel(depth=surface_idx)
-            
-            # Standardize coordinates
-            if 'latitude' in temp.dims:
-                temp = temp.rename({'latitude': 'lat', 'longitude': 'lon'})
-            
-            chl_var = list(self.data['chlorophyll'].data_vars)[0]
-            chl = self.data['chlorophyll'][chl_var]
-            if 'depth' in chl.dims:
-                chl = chl.isel(depth=0)
-            if 'latitude' in chl.dims:
-                chl = chl.rename({'latitude': 'lat', 'longitude': 'lon'})
-            
-            # Temperature suitability (species-specific, using 15-22°C as example)
-            temp_mean = temp.mean(dim='time')
-            temp_score = 1 - np.abs((temp_mean - 18.5) / 18.5)
-            temp_score = xr.where((temp_mean >= 13) & (temp_mean <= 24), temp_score, 0)
+        if habitat_inputs:
+            logger.info("  Computing integrated habitat quality index...")
+            chl_mean = reduced['chl_mean']
             
             # Productivity score
-            chl_mean = chl.mean(dim='time')
-            chl_95 = float(chl_mean.quantile(0.95))  # Convert to scalar
+            chl_95 = float(np.nanquantile(chl_mean.values, 0.95))
             chl_score = chl_mean / chl_95
             chl_score = xr.where(chl_score > 1, 1, chl_score)
             
             # Align spatially
-            chl_score_aligned = chl_score.interp_like(temp_score, method='nearest')
-            
-            # Habitat stability (low SST variance = more stable)
-            temp_std = temp.std(dim='time')
-            temp_stability = 1 / (1 + temp_std / temp_mean)
+            chl_score_aligned = self._align_to_grid(chl_score, temp)
             
-            # Integrated Habitat Quality Index
-            habitat_quality = (temp_score + chl_score_aligned + temp_stability) / 3
+            # Temperature suitability, habitat stability and the integrated index
+            # in one streaming pass over each pixel's SST series
+            habitat_quality = xr.apply_ufunc(
+                _habitat_quality_kernel, temp.chunk({'time': -1}), chl_score_aligned,
+                input_core_dims=[['time'], []],
+                dask='parallelized',
+                output_dtypes=[np.float32]
+            ).persist()
             
+            # Kept chunked so the risk index and export stream it block by block
             self.processed['habitat_quality_index'] = habitat_quality
             
-            mean_quality = float(habitat_quality.mean())
             high_quality_threshold = 0.7
-            high_quality_pct = float((habitat_quality > high_quality_threshold).sum() / habitat_quality.size * 100)
+            summary = xr.Dataset({
+                'mean_quality': habitat_quality.mean(),
+                'high_quality_count': (habitat_quality > high_quality_threshold).sum()
+            }).compute()
+            mean_quality = float(summary['mean_quality'])
+            high_quality_pct = float(summary['high_quality_count']) / habitat_quality.size * 100
             
-            print(f"    Mean Habitat Quality: {mean_quality:.3f}")
-            print(f"    High-quality habitats: {high_quality_pct:.1f}%")
+            logger.info(f"    Mean Habitat Quality: {mean_quality:.3f}")
+            logger.info(f"    High-quality habitats: {high_quality_pct:.1f}%")
         
         self.processed['ebfm_indicators'] = indicators
         self.metadata['innovations_applied'].append('ecosystem_based_indicators')
         
-        print("\n  → Moving beyond single-species to ECOSYSTEM management!")
+        logger.info("\n  → Moving beyond single-species to ECOSYSTEM management!")
     
     #===============================================
     # ADVANCED RISK ASSESSMENT
@@ -613,9 +946,9 @@ class AdvancedMedGuardProcessor:
         """
         Comprehensive overfishing risk combining traditional and novel indicators
         """
-        print("\n" + "="*70)
-        print("ADVANCED MULTIFACTOR OVERFISHING RISK INDEX")
-        print("="*70)
+        logger.info("\n" + "="*70)
+        logger.info("ADVANCED MULTIFACTOR OVERFISHING RISK INDEX")
+        logger.info("="*70)
         
         risk_components = {}
         weights = {}
@@ -627,28 +960,39 @@ class AdvancedMedGuardProcessor:
             if 'depth' in temp.dims:
                 temp = temp.isel(depth=0)
             
-            # Calculate SST anomaly
-            temp_clim = temp.groupby('time.month').mean('time')
-            temp_anom = temp.groupby('time.month') - temp_clim
+            # Whole time series per chunk, so the monthly climatology is a per-chunk reduction
+            temp = temp.chunk({'time': -1, 'lat': 512, 'lon': 512})
+            
+            # SST anomaly against the monthly climatology, scanned once per pixel:
+            # yields the latest anomaly and the moments needed to standardize it
+            months = xr.DataArray(temp['time'].dt.month.values.astype(np.int64), dims='time')
+            latest_anom, anom_sum, anom_sumsq, anom_count = dask.compute(*xr.apply_ufunc(
+                _month_anomaly_kernel, temp, months,
+                input_core_dims=[['time'], ['time']],
+                output_core_dims=[[], [], [], []],
+                dask='parallelized',
+                output_dtypes=[np.float64] * 4
+            ))
             
-            # Standardize
-            temp_anom_std = (temp_anom - temp_anom.mean()) / temp_anom.std()
+            n_valid = float(anom_count.sum())
+            anom_mean = float(anom_sum.sum()) / n_valid
+            anom_std = np.sqrt(max(float(anom_sumsq.sum()) / n_valid - anom_mean**2, 0.0))
             
             # Environmental stress = extreme anomalies
-            env_stress = np.abs(temp_anom_std.isel(time=-1))
+            env_stress = np.abs((latest_anom - anom_mean) / anom_std)
             risk_components['environmental_stress'] = env_stress
             weights['environmental_stress'] = 0.2
             
-            print("  ✓ Environmental stress component calculated")
+            logger.info("  ✓ Environmental stress component calculated")
         
         # Component 2: Fishing pressure
         if 'fishing' in self.data:
             # Create spatial grid of fishing effort
-            print("  Computing fishing pressure maps...")
+            logger.info("  Computing fishing pressure maps...")
             
             # This is simplified - would need proper gridding
             weights['fishing_pressure'] = 0.3
-            print("  ✓ Fishing pressure component calculated")
+            logger.info("  ✓ Fishing pressure component calculated")
         
         # Component 3: Habitat degradation
         if 'habitat_quality_index' in self.processed:
@@ -656,7 +1000,7 @@ class AdvancedMedGuardProcessor:
             habitat_degradation = 1 - habitat_quality
             risk_components['habitat_degradation'] = habitat_degradation
             weights['habitat_degradation'] = 0.2
-            print("  ✓ Habitat degradation component calculated")
+            logger.info("  ✓ Habitat degradation component calculated")
         
         # Component 4: Connectivity disruption
         if 'larval_connectivity' in self.processed:
@@ -665,48 +1009,52 @@ class AdvancedMedGuardProcessor:
             connectivity_risk = 1 - (connectivity / connectivity.max())
             risk_components['connectivity_disruption'] = connectivity_risk
             weights['connectivity_disruption'] = 0.15
-            print("  ✓ Connectivity disruption component calculated")
+            logger.info("  ✓ Connectivity disruption component calculated")
         
         # Component 5: MPA coverage gap
         if 'mpa' in self.data:
             # Areas far from MPAs are higher risk
             # Simplified implementation
             weights['protection_gap'] = 0.15
-            print("  ✓ Protection gap component calculated")
+            logger.info("  ✓ Protection gap component calculated")
         
         # Combine all components
         if risk_components:
-            # Normalize each component to 0-1
-            normalized_components = {}
-            for key, component in risk_components.items():
-                comp_min = float(component.min())
-                comp_max = float(component.max())
-                if comp_max > comp_min:
-                    normalized_components[key] = (component - comp_min) / (comp_max - comp_min)
-                else:
-                    normalized_components[key] = component * 0
+            # Stack components on their common grid for the fused kernel
+            keys = list(risk_components.keys())
+            aligned = xr.align(*[risk_components[key].transpose('lat', 'lon') for key in keys], join='inner')
+            stacked = np.stack([np.asarray(component.values, dtype=np.float32) for component in aligned])
+            
+            # Per-component 0-1 normalization parameters
+            comp_min, comp_max = _component_minmax(stacked)
+            spread = comp_max - comp_min
+            scales = np.where(spread > 0, 1 / np.where(spread > 0, spread, 1), 0)
             
-            # Weighted sum
+            # Weighted sum over the full weight budget (components without a
+            # grid yet still count toward the total)
             total_weight = sum(weights.values())
-            risk_index = sum(
-                normalized_components[key] * weights[key] / total_weight
-                for key in normalized_components.keys()
+            comp_weights = np.array([weights[key] / total_weight for key in keys])
+            
+            risk_values, class_values = _risk_kernel(
+                stacked, comp_weights.astype(np.float32),
+                comp_min.astype(np.float32), scales.astype(np.float32)
             )
             
-            # Classify risk levels
-            risk_class = xr.where(risk_index < 0.3, 1,  # Low
-                         xr.where(risk_index < 0.6, 2,  # Medium
-                                  3))  # High
+            grid = {dim: aligned[0][dim] for dim in ('lat', 'lon')}
+            risk_index = xr.DataArray(risk_values, coords=grid, dims=('lat', 'lon'))
+            risk_class = xr.DataArray(class_values, coords=grid, dims=('lat', 'lon'))
             
             self.processed['overfishing_risk_index'] = risk_index
             self.processed['risk_classification'] = risk_class
             
-            print(f"\n  Risk Assessment Summary:")
-            print(f"    Low risk areas: {float((risk_index < 0.3).sum() / risk_index.size * 100):.1f}%")
-            print(f"    Medium risk areas: {float(((risk_index >= 0.3) & (risk_index < 0.6)).sum() / risk_index.size * 100):.1f}%")
-            print(f"    High risk areas: {float((risk_index >= 0.6).sum() / risk_index.size * 100):.1f}%")
+            logger.info(f"\n  Risk Assessment Summary:")
+            # Class shares in one pass (NaN cells are classed High but not counted)
+            class_pct = np.bincount(class_values[~np.isnan(risk_values)], minlength=4) / risk_values.size * 100
+            logger.info(f"    Low risk areas: {class_pct[1]:.1f}%")
+            logger.info(f"    Medium risk areas: {class_pct[2]:.1f}%")
+            logger.info(f"    High risk areas: {class_pct[3]:.1f}%")
             
-            print("\n  → Comprehensive risk model integrating 5 critical factors!")
+            logger.info("\n  → Comprehensive risk model integrating 5 critical factors!")
     
     #===============================================
     # EXPORT FUNCTIONS
@@ -716,18 +1064,18 @@ class AdvancedMedGuardProcessor:
         """
         Export all processed data in EDITO-compatible formats
         """
-        print("\n" + "="*70)
-        print("EXPORTING PROCESSED DATA")
-        print("="*70)
+        logger.info("\n" + "="*70)
+        logger.info("EXPORTING PROCESSED DATA")
+        logger.info("="*70)
         
         output_dir = Path(output_dir)
         output_dir.mkdir(exist_ok=True, parents=True)
         
-        # Export NetCDF files with proper metadata
+        # Export gridded results as Blosc-zstd Zarr stores, written concurrently
+        zarr_writes = []
+        netcdf_fallbacks = []
         for key, data in self.processed.items():
             if isinstance(data, (xr.DataArray, xr.Dataset)):
-                output_file = output_dir / f'{key}.nc'
-                
                 # Add CF-compliant metadata
                 if isinstance(data, xr.DataArray):
                     # Ensure the DataArray has a name
@@ -740,25 +1088,48 @@ class AdvancedMedGuardProcessor:
                     data.attrs['processing_date'] = self.metadata['processing_date']
                     data.attrs['source'] = 'MedGuard 2.0 Processing Pipeline'
                 
-                # Save with compression
                 try:
-                    if isinstance(data, xr.Dataset):
-                        encoding = {var: {'zlib': True, 'complevel': 5} for var in data.data_vars}
-                    else:
-                        encoding = {data.name: {'zlib': True, 'complevel': 5}}
-                    
-                    data.to_netcdf(output_file, encoding=encoding)
-                    print(f"  ✓ Exported {key} → {output_file.name}")
+                    ds = data.to_dataset() if isinstance(data, xr.DataArray) else data.copy()
+                    for var in ds.variables:
+                        ds[var].encoding = {}
+                    chunks = {dim: 256 for dim in ('lat', 'lon') if dim in ds.dims}
+                    encoding = {var: _variable_encoding(key) for var in ds.data_vars}
+                    output_file = output_dir / f'{key}.zarr'
+                    delayed = ds.chunk(chunks).to_zarr(
+                        output_file, mode='w', encoding=encoding, consolidated=True, compute=False
+                    )
+                    zarr_writes.append((key, data, output_file, delayed))
                 except Exception as e:
-                    # Fallback: save without compression if encoding fails
-                    print(f"  ⚠ Warning for {key}: {e}")
+                    logger.warning(f"  ⚠ Warning for {key}: {e}")
+                    netcdf_fallbacks.append((key, data))
+        
+        if zarr_writes:
+            try:
+                dask.compute(*[write for _, _, _, write in zarr_writes], num_workers=os.cpu_count())
+                for key, _, output_file, _ in zarr_writes:
+                    logger.info(f"  ✓ Exported {key} → {output_file.name}")
+            except Exception as e:
+                # Retry one by one so a single bad variable doesn't sink the rest
+                logger.warning(f"  ⚠ Concurrent Zarr export failed ({e}), writing stores one by one")
+                for key, data, output_file, write in zarr_writes:
                     try:
-                        data.to_netcdf(output_file)
-                        print(f"  ✓ Exported {key} → {output_file.name} (without compression)")
+                        dask.compute(write)
+                        logger.info(f"  ✓ Exported {key} → {output_file.name}")
                     except Exception as e2:
-                        print(f"  ✗ Failed to export {key}: {e2}")
-            
-            elif isinstance(data, (pd.DataFrame, gpd.GeoDataFrame)):
+                        logger.warning(f"  ⚠ Warning for {key}: {e2}")
+                        netcdf_fallbacks.append((key, data))
+        
+        # NetCDF fallbacks are written in parallel (h5netcdf releases the GIL while compressing)
+        if netcdf_fallbacks:
+            with ThreadPoolExecutor(max_workers=min(8, len(netcdf_fallbacks))) as executor:
+                futures = [executor.submit(self._export_netcdf, key, data, output_dir)
+                           for key, data in netcdf_fallbacks]
+                for future in futures:
+                    future.result()
+        
+        # Export tabular results
+        for key, data in self.processed.items():
+            if isinstance(data, (pd.DataFrame, gpd.GeoDataFrame)):
                 try:
                     if isinstance(data, gpd.GeoDataFrame):
                         output_file = output_dir / f'{key}.geojson'
@@ -766,9 +1137,9 @@ class AdvancedMedGuardProcessor:
                     else:
                         output_file = output_dir / f'{key}.csv'
                         data.to_csv(output_file, index=False)
-                    print(f"  ✓ Exported {key} → {output_file.name}")
+                    logger.info(f"  ✓ Exported {key} → {output_file.name}")
                 except Exception as e:
-                    print(f"  ✗ Failed to export {key}: {e}")
+                    logger.error(f"  ✗ Failed to export {key}: {e}")
         
         # Export metadata
         import json
@@ -776,11 +1147,30 @@ class AdvancedMedGuardProcessor:
             metadata_file = output_dir / 'processing_metadata.json'
             with open(metadata_file, 'w') as f:
                 json.dump(self.metadata, f, indent=2)
-            print(f"  ✓ Exported metadata → {metadata_file.name}")
+            logger.info(f"  ✓ Exported metadata → {metadata_file.name}")
         except Exception as e:
-            print(f"  ⚠ Could not export metadata: {e}")
+            logger.warning(f"  ⚠ Could not export metadata: {e}")
         
-        print(f"\n  All data exported to: {output_dir.absolute()}")
+        logger.info(f"\n  All data exported to: {output_dir.absolute()}")
+        flush_log()
+    
+    def _export_netcdf(self, key, data, output_dir):
+        """Fallback export of one gridded result as compressed NetCDF (h5netcdf)"""
+        output_file = output_dir / f'{key}.nc'
+        try:
+            variables = data.data_vars if isinstance(data, xr.Dataset) else [data.name]
+            encoding = {var: _variable_encoding(key, store='netcdf') for var in variables}
+            
+            data.to_netcdf(output_file, engine='h5netcdf', encoding=encoding)
+            logger.info(f"  ✓ Exported {key} → {output_file.name}")
+        except Exception as e:
+            # Fallback: save without compression if encoding fails
+            logger.warning(f"  ⚠ Warning for {key}: {e}")
+            try:
+                data.to_netcdf(output_file)
+                logger.info(f"  ✓ Exported {key} → {output_file.name} (without compression)")
+            except Exception as e2:
+                logger.error(f"  ✗ Failed to export {key}: {e2}")
     
     def _get_units(self, variable_name):
         """Return appropriate units for variable"""
@@ -795,10 +1185,10 @@ class AdvancedMedGuardProcessor:
     
     def run_full_pipeline(self):
         """Execute all processing steps"""
-        print("\n" + "="*70)
-        print(" "*15 + "MEDGUARD ADVANCED PROCESSING PIPELINE")
-        print("="*70)
-        print(f"Start: {datetime.now()}")
+        logger.info("\n" + "="*70)
+        logger.info(" "*15 + "MEDGUARD ADVANCED PROCESSING PIPELINE")
+        logger.info("="*70)
+        logger.info(f"Start: {datetime.now()}")
         
         total_steps = 6
         current_step = 0
@@ -806,41 +1196,59 @@ class AdvancedMedGuardProcessor:
         def print_progress(step_name):
             nonlocal current_step
             current_step += 1
-            print(f"\n[{current_step}/{total_steps}] {step_name}")
-            print(f"Progress: {'█' * (current_step * 10 // total_steps)}{'░' * (10 - current_step * 10 // total_steps)} {current_step * 100 // total_steps}%")
-        
-        # Quick innovations first
-        print_progress("Detecting Illegal Fishing Patterns (fast)")
-        self.detect_illegal_fishing_patterns()
-        
-        print_progress("Assessing Socioeconomic Impacts (fast)")
-        self.assess_fisher_livelihoods_impact()
-        
-        print_progress("Calculating Ecosystem Indicators (medium)")
-        self.calculate_ebfm_indicators()
-        
-        print_progress("Computing Risk Index (medium)")
+            logger.info(f"\n[{current_step}/{total_steps}] {step_name}")
+            logger.info(f"Progress: {'█' * (current_step * 10 // total_steps)}{'░' * (10 - current_step * 10 // total_steps)} {current_step * 100 // total_steps}%")
+        
+        # Independent innovations run concurrently: each only reads self.data
+        # and writes its own self.processed keys
+        independent_steps = [
+            ("Detecting Illegal Fishing Patterns", self.detect_illegal_fishing_patterns),
+            ("Assessing Socioeconomic Impacts", self.assess_fisher_livelihoods_impact),
+            ("Calculating Ecosystem Indicators", self.calculate_ebfm_indicators),
+            ("Modeling Larval Connectivity", self.calculate_larval_connectivity)
+        ]
+        # Each step's output is held back, then written whole under its
+        # progress line, in step order
+        logs = [[] for _ in independent_steps]
+        with ThreadPoolExecutor(max_workers=len(independent_steps)) as executor:
+            futures = [executor.submit(step_log.run, step, log)
+                       for (_, step), log in zip(independent_steps, logs)]
+        for (step_name, _), future, log in zip(independent_steps, futures, logs):
+            print_progress(step_name)
+            step_log.replay(log)
+            future.result()
+        
+        # Dependent steps: the risk index uses habitat quality and connectivity,
+        # MPA optimization uses connectivity
+        print_progress("Computing Risk Index")
         self.calculate_multifactor_risk_index()
         
-        print_progress("Modeling Larval Connectivity (slower)")
-        self.calculate_larval_connectivity()
-        
-        print_progress("Optimizing MPA Network (slower)")
+        print_progress("Optimizing MPA Network")
         self.optimize_mpa_network()
         
+        # Keep the reported order independent of which step finished first
+        step_order = [
+            'illegal_fishing_detection', 'socioeconomic_impact_modeling', 'ecosystem_based_indicators',
+            'larval_connectivity_modeling', 'dynamic_mpa_optimization'
+        ]
+        rank = {name: i for i, name in enumerate(step_order)}
+        self.metadata['innovations_applied'].sort(key=lambda name: rank.get(name, len(rank)))
+        
         # Export everything
-        print("\n" + "="*70)
-        print("EXPORTING RESULTS")
-        print("="*70)
+        logger.info("\n" + "="*70)
+        logger.info("EXPORTING RESULTS")
+        logger.info("="*70)
         self.export_to_s3_compatible()
         
-        print("\n" + "="*70)
-        print(" "*20 + "PROCESSING COMPLETE!")
-        print("="*70)
-        print(f"End: {datetime.now()}")
-        print(f"\nInnovations applied: {len(self.metadata['innovations_applied'])}")
+        logger.info("\n" + "="*70)
+        logger.info(" "*20 + "PROCESSING COMPLETE!")
+        logger.info("="*70)
+        logger.info(f"End: {datetime.now()}")
+        logger.info(f"\nInnovations applied: {len(self.metadata['innovations_applied'])}")
         for innovation in self.metadata['innovations_applied']:
-            print(f"  ✓ {innovation}")
+            logger.info(f"  ✓ {innovation}")
+        
+        flush_log()
 
 
 def main():
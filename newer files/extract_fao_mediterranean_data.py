@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.dataset as ds
 import os
 from pathlib import Path
 
@@ -16,14 +20,27 @@ MEDITERRANEAN_COUNTRIES_ISO3 = [
     'TUR', 'PSE'
 ]
 
+# Reference code lists: file, the columns the extraction uses, and key types.
+# Types are given to the Arrow parser itself, so the area codes are read as
+# text ('37', '37.1') rather than inferred as floats and stringified ('37.0')
+REFERENCE_TABLES = {
+    'countries': ('CL_FI_COUNTRY_GROUPS.csv', ['UN_Code', 'Name_En', 'ISO3_Code'], {'UN_Code': pa.int32()}),
+    'species': ('CL_FI_SPECIES_GROUPS.csv', ['3A_Code', 'Name_En', 'Scientific_Name', 'ISSCAAP_Group_En'], {}),
+    'areas': ('CL_FI_WATERAREA_GROUPS.csv', ['Code', 'Name_En'], {'Code': pa.string()}),
+    'symbols': ('CL_FI_SYMBOL_SDMX.csv', ['Symbol', 'Description_En'], {})
+}
+
 def load_reference_data(data_folder):
     print_section("LOADING REFERENCE DATA")
     ref_data = {}
     try:
-        ref_data['countries'] = pd.read_csv(os.path.join(data_folder, 'CL_FI_COUNTRY_GROUPS.csv'))
-        ref_data['species'] = pd.read_csv(os.path.join(data_folder, 'CL_FI_SPECIES_GROUPS.csv'))
-        ref_data['areas'] = pd.read_csv(os.path.join(data_folder, 'CL_FI_WATERAREA_GROUPS.csv'))
-        ref_data['symbols'] = pd.read_csv(os.path.join(data_folder, 'CL_FI_SYMBOL_SDMX.csv'))
+        for name, (file_name, usecols, column_types) in REFERENCE_TABLES.items():
+            table = pa_csv.read_csv(
+                os.path.join(data_folder, file_name),
+                convert_options=pa_csv.ConvertOptions(include_columns=usecols, column_types=column_types)
+            )
+            # Integer keys stay nullable (Int32) instead of falling back to float
+            ref_data[name] = table.to_pandas(types_mapper={pa.int32(): pd.Int32Dtype()}.get)
         return ref_data
     except Exception as e:
         print(f"Error loading reference data: {e}")
@@ -67,74 +84,92 @@ def explore_capture_data(file_path, nrows=10):
         print(f"Error reading file: {e}")
         return None, None
 
+def factorize_keys(series, normalize=None):
+    """Integer codes plus unique keys of a column, optionally normalizing the uniques only"""
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    uniques = pd.Index(uniques)
+    if normalize is not None:
+        uniques = normalize(uniques)
+    return codes, uniques
+
+def attach_reference(df, key_col, ref_df, ref_key, columns, key_codes=None):
+    """Add reference columns to df by key lookup (a gather over the unique keys, instead of a full-frame merge)"""
+    ref = ref_df.drop_duplicates(ref_key).set_index(ref_key)
+    codes, keys = key_codes if key_codes is not None else factorize_keys(df[key_col])
+    for ref_col, out_col in columns.items():
+        df[out_col] = np.asarray(keys.map(ref[ref_col]).take(codes))
+    return df
+
+# Arrow would otherwise infer types from the first block only, so e.g. a
+# decimal VALUE further down the file fails the whole scan
+CAPTURE_COLUMN_TYPES = {'PERIOD': pa.int64(), 'VALUE': pa.float64()}
+
+def capture_column_types(capture_file, column_map):
+    """Explicit Arrow type for every capture column: PERIOD/VALUE numeric, codes and the rest strings"""
+    header = pd.read_csv(capture_file, nrows=0).columns
+    numeric = {column_map[key]: dtype for key, dtype in CAPTURE_COLUMN_TYPES.items() if key in column_map}
+    return {col: numeric.get(col, pa.string()) for col in header}
+
 def extract_mediterranean_data(capture_file, output_file, ref_data, med_codes, column_map, start_year=2014, end_year=2023):
     print_section("EXTRACTING MEDITERRANEAN DATA")
     try:
         area_col = column_map['AREA']
         period_col = column_map.get('PERIOD', 'PERIOD')
-        chunk_size = 100000
-        chunks = []
-        for chunk in pd.read_csv(capture_file, chunksize=chunk_size):
-            chunk[area_col] = chunk[area_col].astype(str).str.strip()
-            med_chunk = chunk[chunk[area_col].isin(med_codes)]
-            if len(med_chunk) > 0:
-                chunks.append(med_chunk)
-        if len(chunks) == 0:
+        # Area and period filters are pushed into the Arrow CSV scan, so rows
+        # outside the Mediterranean/year window never reach pandas
+        csv_format = ds.CsvFileFormat(
+            convert_options=pa_csv.ConvertOptions(column_types=capture_column_types(capture_file, column_map))
+        )
+        capture = ds.dataset(capture_file, format=csv_format)
+        area = pc.utf8_trim_whitespace(pc.field(area_col))
+        row_filter = (
+            area.isin([str(code) for code in med_codes]) &
+            (pc.field(period_col) >= start_year) &
+            (pc.field(period_col) <= end_year)
+        )
+        table = capture.to_table(filter=row_filter)
+        if table.num_rows == 0:
             print("No Mediterranean data found")
             return None
-        df_med = pd.concat(chunks, ignore_index=True)
-        df_filtered = df_med[
-            (df_med[period_col] >= start_year) &
-            (df_med[period_col] <= end_year)
-        ]
+        table = table.set_column(
+            table.schema.get_field_index(area_col), area_col,
+            pc.utf8_trim_whitespace(table[area_col])
+        )
+        df_filtered = table.to_pandas()
         rename_dict = {v: k for k, v in column_map.items()}
         df_filtered = df_filtered.rename(columns=rename_dict)
 
-        # Merge country reference
+        # Attach country reference
         df_filtered['COUNTRY'] = pd.to_numeric(df_filtered['COUNTRY'], errors='coerce')
-        df_filtered = df_filtered.merge(
-            ref_data['countries'][['UN_Code', 'Name_En', 'ISO3_Code']],
-            left_on='COUNTRY',
-            right_on='UN_Code',
-            how='left'
-        )
-        df_filtered.rename(columns={'Name_En': 'Country_Name'}, inplace=True)
+        attach_reference(df_filtered, 'COUNTRY', ref_data['countries'], 'UN_Code',
+                         {'Name_En': 'Country_Name', 'ISO3_Code': 'ISO3_Code'})
 
         # Filter for Mediterranean countries only
-        df_filtered = df_filtered[df_filtered['ISO3_Code'].isin(MEDITERRANEAN_COUNTRIES_ISO3)]
+        df_filtered = df_filtered[df_filtered['ISO3_Code'].isin(MEDITERRANEAN_COUNTRIES_ISO3)].copy()
         print(f"✓ Filtered to {len(df_filtered):,} records for Mediterranean countries only")
 
-        # Merge species reference
-        df_filtered['SPECIES'] = df_filtered['SPECIES'].astype(str).str.strip().str.upper()
-        ref_data['species']['3A_Code'] = ref_data['species']['3A_Code'].astype(str).str.strip().str.upper()
-        df_filtered = df_filtered.merge(
-            ref_data['species'][['3A_Code', 'Name_En', 'Scientific_Name', 'ISSCAAP_Group_En']],
-            left_on='SPECIES',
-            right_on='3A_Code',
-            how='left'
+        # Attach species reference
+        # Codes are normalized once per distinct species, not once per record
+        species_codes = factorize_keys(df_filtered['SPECIES'],
+                                       normalize=lambda keys: keys.astype(str).str.strip().str.upper())
+        df_filtered['SPECIES'] = np.asarray(species_codes[1].take(species_codes[0]))
+        species_ref = ref_data['species'].assign(
+            **{'3A_Code': ref_data['species']['3A_Code'].astype(str).str.strip().str.upper()}
         )
-        df_filtered.rename(columns={'Name_En': 'Species_Name'}, inplace=True)
+        attach_reference(df_filtered, 'SPECIES', species_ref, '3A_Code',
+                         {'Name_En': 'Species_Name', 'Scientific_Name': 'Scientific_Name',
+                          'ISSCAAP_Group_En': 'ISSCAAP_Group_En'},
+                         key_codes=species_codes)
 
-        # Merge area reference
+        # Attach area reference
         df_filtered['AREA'] = pd.to_numeric(df_filtered['AREA'], errors='coerce')
-        ref_data['areas']['Code'] = pd.to_numeric(ref_data['areas']['Code'], errors='coerce')
-        df_filtered = df_filtered.merge(
-            ref_data['areas'][['Code', 'Name_En']],
-            left_on='AREA',
-            right_on='Code',
-            how='left'
-        )
-        df_filtered.rename(columns={'Name_En': 'Area_Name'}, inplace=True)
+        area_ref = ref_data['areas'].assign(Code=pd.to_numeric(ref_data['areas']['Code'], errors='coerce'))
+        attach_reference(df_filtered, 'AREA', area_ref, 'Code', {'Name_En': 'Area_Name'})
 
-        # Merge status symbols
+        # Attach status symbols
         if 'STATUS' in df_filtered.columns:
-            df_filtered = df_filtered.merge(
-                ref_data['symbols'][['Symbol', 'Description_En']],
-                left_on='STATUS',
-                right_on='Symbol',
-                how='left'
-            )
-            df_filtered.rename(columns={'Description_En': 'Status_Description'}, inplace=True)
+            attach_reference(df_filtered, 'STATUS', ref_data['symbols'], 'Symbol',
+                             {'Description_En': 'Status_Description'})
 
         # Final output columns
         output_columns = [
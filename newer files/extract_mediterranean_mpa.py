@@ -10,11 +10,17 @@ and exports the results to a GeoJSON file.
 """
 
 import geopandas as gpd
+import numpy as np
 import fiona
+import pyogrio
 import os
 from shapely.geometry import box
 from geopandas import GeoDataFrame
 
+# WDPA attributes kept in the extract (the layer has dozens more)
+MPA_COLUMNS = ['WDPAID', 'NAME', 'ORIG_NAME', 'DESIG', 'DESIG_ENG', 'IUCN_CAT', 'ISO3', 'MARINE',
+               'REP_AREA', 'REP_M_AREA', 'STATUS', 'STATUS_YR', 'NO_TAKE']
+
 def print_section(title):
     """Print a formatted section header"""
     print("\n" + "="*60)
@@ -66,11 +72,27 @@ def extract_mediterranean_mpa(
         if len(layers) == 0:
             raise ValueError("No layers found in geodatabase")
         
+        # Create bounding box
+        med_bbox = box(med_bounds['min_lon'], med_bounds['min_lat'], 
+                      med_bounds['max_lon'], med_bounds['max_lat'])
+        
         # Step 3: Load the protected areas data
         print(f"\n[3/8] Loading protected areas data from layer '{layers[0]}'...")
         print("⏳ This may take 2-5 minutes (loading 217 MB)...")
-        gdf = gpd.read_file(gdb_path, layer=layers[0])
-        print(f"✓ Loaded {len(gdf):,} protected areas")
+        # GDAL's spatial filter skips features outside the Mediterranean box while
+        # reading (a GeoSeries bbox is reprojected to the layer's CRS if needed);
+        # only the needed columns are read, and marine areas are selected by GDAL
+        info = pyogrio.read_info(gdb_path, layer=layers[0])
+        fields = dict(zip(info['fields'], info['dtypes']))
+        columns = [col for col in MPA_COLUMNS if col in fields]
+        marine_filter = None
+        if 'MARINE' in fields:
+            marine_values = "'1', '2'" if fields['MARINE'] == 'object' else "1, 2"
+            marine_filter = f"MARINE IN ({marine_values})"
+        gdf = gpd.read_file(gdb_path, layer=layers[0], engine='pyogrio',
+                            columns=columns, where=marine_filter,
+                            bbox=gpd.GeoSeries([med_bbox], crs="EPSG:4326"))
+        print(f"✓ Loaded {len(gdf):,} protected areas within the Mediterranean bounding box")
         print(f"✓ Coordinate system: {gdf.crs}")
         
         # Step 4: Examine data structure
@@ -109,12 +131,14 @@ def extract_mediterranean_mpa(
         print(f"  Boundaries: Lon [{med_bounds['min_lon']}, {med_bounds['max_lon']}], "
               f"Lat [{med_bounds['min_lat']}, {med_bounds['max_lat']}]")
         
-        # Create bounding box
-        med_bbox = box(med_bounds['min_lon'], med_bounds['min_lat'], 
-                      med_bounds['max_lon'], med_bounds['max_lat'])
-        
-        # Filter areas that intersect with Mediterranean
-        gdf_med = gdf_marine[gdf_marine.intersects(med_bbox)].copy()
+        # Filter areas that intersect with Mediterranean: cheap envelope test on
+        # the bounds arrays first, then the exact predicate via the R-tree
+        bounds = gdf_marine.bounds.values
+        in_box = ((bounds[:, 0] <= med_bounds['max_lon']) & (bounds[:, 2] >= med_bounds['min_lon']) &
+                  (bounds[:, 1] <= med_bounds['max_lat']) & (bounds[:, 3] >= med_bounds['min_lat']))
+        candidates = gdf_marine[in_box]
+        hits = candidates.sindex.query(med_bbox, predicate='intersects')
+        gdf_med = candidates.iloc[np.sort(hits)].copy()
         print(f"✓ Found {len(gdf_med):,} MPAs in the Mediterranean")
         
         # Display summary statistics
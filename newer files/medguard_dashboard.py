@@ -124,6 +124,13 @@ class MedGuardDashboard:
                     except:
                         pass
             
+            # Load Zarr stores written by the processing pipeline
+            for zarr_store in self.data_dir.glob('*.zarr'):
+                try:
+                    self.datasets[zarr_store.stem] = xr.open_zarr(zarr_store, consolidated=True)
+                except:
+                    pass
+            
             # Load GeoJSON/CSV files
             for geojson_file in self.data_dir.glob('*.geojson'):
                 try:
@@ -1,70 +1,216 @@
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import argparse
 import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from datetime import datetime
+from numba import njit
 
-# Mediterranean Sea bounding box
+# Mediterranean Sea bounding box (plain floats for the hot paths)
+LAT_MIN = 30.0
+LAT_MAX = 46.0
+LON_MIN = -6.0
+LON_MAX = 37.0
+
+# Same box for the GeoJSON metadata
 MED_BOUNDS = {
-    'lat_min': 30.0,
-    'lat_max': 46.0,
-    'lon_min': -6.0,
-    'lon_max': 37.0
+    'lat_min': LAT_MIN,
+    'lat_max': LAT_MAX,
+    'lon_min': LON_MIN,
+    'lon_max': LON_MAX
 }
 
-def is_in_mediterranean(lat, lon):
-    """Check if coordinates are within Mediterranean Sea bounds"""
-    return (MED_BOUNDS['lat_min'] <= lat <= MED_BOUNDS['lat_max'] and 
-            MED_BOUNDS['lon_min'] <= lon <= MED_BOUNDS['lon_max'])
-
-def create_cell_polygon(ll_lat, ll_lon, cell_size=0.1):
-    """Create a polygon for a grid cell given lower-left corner"""
-    return [
-        [ll_lon, ll_lat],  # Lower-left
-        [ll_lon + cell_size, ll_lat],  # Lower-right
-        [ll_lon + cell_size, ll_lat + cell_size],  # Upper-right
-        [ll_lon, ll_lat + cell_size],  # Upper-left
-        [ll_lon, ll_lat]  # Close polygon
-    ]
+# Columns the aggregator actually uses from the monthly CSVs
+FLEET_COLUMNS = ['date', 'month', 'cell_ll_lat', 'cell_ll_lon', 'flag', 'geartype',
+                 'hours', 'fishing_hours', 'mmsi_present']
+
+# One GeoJSON feature per grid cell, day, flag and gear type
+CELL_KEYS = ['date', 'month', 'cell_ll_lat', 'cell_ll_lon', 'flag', 'geartype']
+
+# Explicit Arrow types skip per-block inference; low-cardinality strings as dictionaries
+FLEET_ARROW_TYPES = {
+    'date': pa.string(), 'month': pa.int16(),
+    'flag': pa.dictionary(pa.int32(), pa.string()), 'geartype': pa.dictionary(pa.int32(), pa.string()),
+    'cell_ll_lat': pa.float32(), 'cell_ll_lon': pa.float32(),
+    'hours': pa.float64(), 'fishing_hours': pa.float64(), 'mmsi_present': pa.int32()
+}
+
+FLEET_SCHEMA = pa.schema([(col, FLEET_ARROW_TYPES[col]) for col in FLEET_COLUMNS])
+
+# Decimals written for grid coordinates; cells sit on a 0.1° grid
+COORD_DECIMALS = 4
+
+# Bounding-box predicate, evaluated in Arrow on each parsed block
+MED_FILTER = (
+    (pc.field('cell_ll_lat') >= LAT_MIN) & (pc.field('cell_ll_lat') <= LAT_MAX) &
+    (pc.field('cell_ll_lon') >= LON_MIN) & (pc.field('cell_ll_lon') <= LON_MAX)
+)
+
+@njit(cache=True)
+def med_mask(lat, lon, lat_min, lat_max, lon_min, lon_max):
+    """Bounding-box mask over coordinate arrays in one compiled loop (NaN is outside)"""
+    out = np.empty(lat.shape[0], np.bool_)
+    for i in range(lat.shape[0]):
+        out[i] = lat_min <= lat[i] <= lat_max and lon_min <= lon[i] <= lon_max
+    return out
+
+def create_cell_polygons(ll_lat, ll_lon, cell_size=0.1):
+    """Create closed polygon rings for many grid cells at once, as an (N, 5, 2) float32 array"""
+    ll_lat = np.asarray(ll_lat, dtype=np.float32)
+    ll_lon = np.asarray(ll_lon, dtype=np.float32)
+    coords = np.empty((len(ll_lat), 5, 2), dtype=np.float32)
+    coords[:, [0, 3, 4], 0] = ll_lon[:, None]
+    coords[:, [1, 2], 0] = (ll_lon + np.float32(cell_size))[:, None]
+    coords[:, [0, 1, 4], 1] = ll_lat[:, None]
+    coords[:, [2, 3], 1] = (ll_lat + np.float32(cell_size))[:, None]
+    return coords
+
+# Serialized GeoJSON feature; %r renders floats in the same shortest
+# round-trip form the JSON encoders use
+FEATURE_TEMPLATE = (
+    '{"type":"Feature","geometry":{"type":"Polygon","coordinates":'
+    '[[[%r,%r],[%r,%r],[%r,%r],[%r,%r],[%r,%r]]]},'
+    '"properties":{"date":%s,"month":%d,"cell_ll_lat":%r,"cell_ll_lon":%r,'
+    '"flag":%s,"geartype":%s,"hours":%r,"fishing_hours":%r,'
+    '"mmsi_present":%d,"fishing_intensity":%r}}'
+)
 
-def process_file_in_chunks(file_path, chunk_size=50000):
+def iter_features(df, batch_size=100000):
     """
-    Process a CSV file in chunks to avoid memory issues
-    Returns only Mediterranean Sea data
+    Yield one serialized GeoJSON feature per row, building cell polygons a
+    batch at a time and filling FEATURE_TEMPLATE instead of encoding dicts
+    Coordinates are rounded to COORD_DECIMALS so float32 noise never reaches the file
     """
-    print(f"  Reading {file_path.name}...")
+    feature_columns = ['date', 'month', 'flag', 'geartype', 'hours', 'fishing_hours',
+                       'mmsi_present', 'fishing_intensity']
+    
+    # Few distinct dates/flags/gears: JSON-quote each value once
+    quoted = {}
+    def quote(value):
+        if value is None or value != value:
+            return 'null'
+        text = quoted.get(value)
+        if text is None:
+            text = quoted[value] = json.dumps(value)
+        return text
+    
+    for start in range(0, len(df), batch_size):
+        batch = df.iloc[start:start + batch_size]
+        ll_lat = batch['cell_ll_lat'].to_numpy()
+        ll_lon = batch['cell_ll_lon'].to_numpy()
+        polygons = create_cell_polygons(ll_lat, ll_lon).astype(np.float64).round(COORD_DECIMALS).tolist()
+        lats = ll_lat.astype(np.float64).round(COORD_DECIMALS).tolist()
+        lons = ll_lon.astype(np.float64).round(COORD_DECIMALS).tolist()
+        rows = batch[feature_columns].itertuples(index=False, name=None)
+        for ring, lat, lon, (date, month, flag, geartype, hrs, fishing_hrs, mmsi_present, intensity) in zip(polygons, lats, lons, rows):
+            (x0, y0), (x1, y1), (x2, y2), (x3, y3), (x4, y4) = ring
+            yield FEATURE_TEMPLATE % (
+                x0, y0, x1, y1, x2, y2, x3, y3, x4, y4,
+                quote(date), month, lat, lon, quote(flag), quote(geartype),
+                hrs, fishing_hrs, mmsi_present, intensity
+            )
+
+def write_geojson(geojson, features, output_file):
+    """
+    Stream a FeatureCollection to disk one serialized feature at a time, so
+    the features never all sit in memory (header via orjson when available)
+    Returns the number of features written
+    """
+    try:
+        import orjson
+        dumps = lambda obj: orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    except ImportError:
+        dumps = lambda obj: json.dumps(obj).encode()
     
-    med_chunks = []
+    # Collection members up to the feature array, then the features, then the closing brackets
+    header = dumps({key: value for key, value in geojson.items() if key != 'features'})
+    count = 0
+    with open(output_file, 'wb', buffering=1 << 20) as f:
+        f.write(header[:-1] + b',"features":[')
+        for feature in features:
+            if count:
+                f.write(b',')
+            f.write(feature.encode())
+            count += 1
+        f.write(b']}')
+    return count
+
+def scan_arrow_batches(file_path, chunk_size):
+    """Yield (rows read, Mediterranean rows) per Arrow record batch of a typed CSV scan"""
+    # ~32 MB of CSV per batch; the bounding box is applied in Arrow, before pandas
+    csv_format = ds.CsvFileFormat(
+        read_options=pa_csv.ReadOptions(block_size=1 << 25),
+        convert_options=pa_csv.ConvertOptions(column_types=FLEET_ARROW_TYPES, strings_can_be_null=True)
+    )
+    scanner = ds.dataset(file_path, format=csv_format).scanner(columns=FLEET_COLUMNS, batch_size=chunk_size)
+    for batch in scanner.to_batches():
+        yield batch.num_rows, pa.Table.from_batches([batch]).filter(MED_FILTER)
+
+def scan_pandas_chunks(file_path, chunk_size):
+    """
+    Fallback for files the typed Arrow scan rejects: pandas chunks with
+    inferred dtypes, numeric columns coerced, and the Numba bounding-box mask
+    """
+    numeric_columns = ['month', 'cell_ll_lat', 'cell_ll_lon', 'hours', 'fishing_hours', 'mmsi_present']
+    for chunk in pd.read_csv(file_path, chunksize=chunk_size, usecols=FLEET_COLUMNS, low_memory=False):
+        for col in numeric_columns:
+            chunk[col] = pd.to_numeric(chunk[col], errors='coerce')
+        mask = med_mask(chunk['cell_ll_lat'].to_numpy(np.float64), chunk['cell_ll_lon'].to_numpy(np.float64),
+                        LAT_MIN, LAT_MAX, LON_MIN, LON_MAX)
+        yield len(chunk), pa.Table.from_pandas(chunk[mask], schema=FLEET_SCHEMA, preserve_index=False)
+
+def collect_med_rows(batches, output_path, verbose=False):
+    """
+    Stream the Mediterranean rows of a file's batches into a zstd Parquet
+    file as they are filtered, reporting progress; returns the row count
+    """
     total_rows = 0
     med_rows = 0
     
-    # Read file in chunks
-    for chunk in pd.read_csv(file_path, chunksize=chunk_size):
-        total_rows += len(chunk)
-        
-        # Filter for Mediterranean in this chunk
-        med_chunk = chunk[
-            chunk.apply(
-                lambda row: is_in_mediterranean(row['cell_ll_lat'], row['cell_ll_lon']), 
-                axis=1
-            )
-        ]
-        
-        med_rows += len(med_chunk)
-        
-        if len(med_chunk) > 0:
-            med_chunks.append(med_chunk)
-        
-        # Progress indicator
-        print(f"    Processed {total_rows:,} rows, found {med_rows:,} Mediterranean rows so far...")
+    with pq.ParquetWriter(output_path, FLEET_SCHEMA, compression='zstd') as writer:
+        for n_rows, med_batch in batches:
+            total_rows += n_rows
+            med_rows += med_batch.num_rows
+            
+            if med_batch.num_rows > 0:
+                writer.write_table(med_batch)
+            
+            # Per-batch progress only on request
+            if verbose:
+                print(f"    Processed {total_rows:,} rows, found {med_rows:,} Mediterranean rows so far...")
     
-    # Combine chunks from this file
-    if med_chunks:
-        return pd.concat(med_chunks, ignore_index=True)
-    else:
-        return pd.DataFrame()
+    print(f"    Processed {total_rows:,} rows, found {med_rows:,} Mediterranean rows")
+    return med_rows
+
+def process_file_in_chunks(file_path, output_path, chunk_size=500000, verbose=False):
+    """
+    Process a CSV file in chunks to avoid memory issues
+    Writes only Mediterranean Sea data to output_path (Parquet) and
+    returns the number of rows kept
+    """
+    print(f"  Reading {file_path.name}...")
+    
+    try:
+        return collect_med_rows(scan_arrow_batches(file_path, chunk_size), output_path, verbose)
+    except pa.ArrowInvalid as e:
+        print(f"  ⚠ Typed scan of {file_path.name} failed ({e}), re-reading with pandas")
+        return collect_med_rows(scan_pandas_chunks(file_path, chunk_size), output_path, verbose)
 
-def process_monthly_files():
-    """Process all 12 monthly CSV files one at a time"""
+def process_monthly_files(skip_geojson=False, verbose=False):
+    """
+    Process all 12 monthly CSV files, one worker process per file
+    With skip_geojson, only the Parquet copy of the rows is written;
+    verbose adds a progress line per parsed batch
+    """
     
     # Define file paths
     data_folder = Path("data/fleet-monthly-csvs-10-v3-2023")
@@ -80,49 +226,73 @@ def process_monthly_files():
         for month in range(1, 13)
     ]
     
-    # Process files one by one (memory efficient!)
+    # Files are independent, so each month is parsed and filtered in its own
+    # worker process
     print("=" * 60)
-    print("Step 1: Processing CSV files ONE AT A TIME")
+    print("Step 1: Processing CSV files in parallel")
     print("=" * 60)
     
-    all_med_data = []
+    # One directory listing answers both the existence and the size checks
+    entries = {entry.name: entry for entry in os.scandir(data_folder) if entry.is_file()}
     
+    file_paths = []
+    file_sizes = {}
     for file_name in monthly_files:
-        file_path = data_folder / file_name
-        
-        if file_path.exists():
-            # Check file size
-            file_size_mb = file_path.stat().st_size / (1024*1024)
-            print(f"\nMonth: {file_name}")
-            print(f"  File size: {file_size_mb:.1f} MB")
-            
-            # Process this file in chunks
-            med_data = process_file_in_chunks(file_path)
-            
-            if len(med_data) > 0:
-                all_med_data.append(med_data)
-                print(f"  ✓ Kept {len(med_data):,} Mediterranean rows")
-            else:
-                print(f"  ⚠ No Mediterranean data in this file")
-                
-        else:
+        entry = entries.get(file_name)
+        if entry is None:
             print(f"\n⚠ WARNING: {file_name} not found!")
+            continue
+        file_path = Path(entry.path)
+        file_paths.append(file_path)
+        file_sizes[file_path] = entry.stat().st_size / (1024*1024)
     
-    if not all_med_data:
-        print("\nERROR: No Mediterranean data found in any files!")
-        return None
+    all_med_data = []
     
-    # Combine all Mediterranean data
-    print("\n" + "=" * 60)
-    print("Step 2: Combining all Mediterranean data")
-    print("=" * 60)
-    combined_df = pd.concat(all_med_data, ignore_index=True)
+    # Workers stage their Mediterranean rows as per-month Parquet files, so a
+    # month is never held in memory whole and only row counts cross processes
+    with tempfile.TemporaryDirectory(prefix='med_fleet_') as staging_dir:
+        staged_paths = [Path(staging_dir) / f"{file_path.stem}.med.parquet" for file_path in file_paths]
+        
+        if file_paths:
+            with ProcessPoolExecutor(max_workers=min(len(file_paths), os.cpu_count() or 1)) as executor:
+                # Results are reported in month order, whichever worker finishes first
+                results = executor.map(partial(process_file_in_chunks, verbose=verbose), file_paths, staged_paths)
+                for file_path, staged_path, med_rows in zip(file_paths, staged_paths, results):
+                    print(f"\nMonth: {file_path.name}")
+                    print(f"  File size: {file_sizes[file_path]:.1f} MB")
+                    
+                    if med_rows > 0:
+                        all_med_data.append(staged_path)
+                        print(f"  ✓ Kept {med_rows:,} Mediterranean rows")
+                    else:
+                        print(f"  ⚠ No Mediterranean data in this file")
+        
+        if not all_med_data:
+            print("\nERROR: No Mediterranean data found in any files!")
+            return None
+        
+        # Combine all Mediterranean data
+        print("\n" + "=" * 60)
+        print("Step 2: Combining all Mediterranean data")
+        print("=" * 60)
+        # Arrow concatenation only links the per-month tables; the single copy
+        # happens in the one conversion to pandas
+        combined_df = pa.concat_tables([pq.read_table(path) for path in all_med_data]).to_pandas()
     print(f"✓ Total Mediterranean rows: {len(combined_df):,}")
     
-    # Create GeoJSON structure
-    print("\n" + "=" * 60)
-    print("Step 3: Creating GeoJSON file")
-    print("=" * 60)
+    combined_df = combined_df.astype({
+        'month': 'int32', 'mmsi_present': 'int32',
+        'cell_ll_lat': 'float32', 'cell_ll_lon': 'float32',
+        'hours': 'float64', 'fishing_hours': 'float64'
+    })
+    
+    # Typed columnar copy of the rows for analytics re-runs
+    parquet_file = "mediterranean_fishing_2023.parquet"
+    try:
+        combined_df.to_parquet(parquet_file, compression='zstd', compression_level=6, index=False)
+        print(f"✓ Saved rows to {parquet_file} ({Path(parquet_file).stat().st_size / (1024*1024):.2f} MB)")
+    except Exception as e:
+        print(f"⚠ Could not write {parquet_file}: {e}")
     
     geojson = {
         "type": "FeatureCollection",
@@ -132,81 +302,80 @@ def process_monthly_files():
             "source": "Global Fishing Watch AIS data",
             "time_period": "2023-01-01 to 2023-12-01",
             "spatial_extent": MED_BOUNDS,
-            "created": datetime.now().isoformat(),
-            "total_features": len(combined_df)
-        },
-        "features": []
+            "created": datetime.now().isoformat()
+        }
     }
     
-    # Convert to GeoJSON features
-    print("Converting to GeoJSON features...")
-    print("(This might take a few minutes...)")
-    
-    for idx, row in combined_df.iterrows():
-        feature = {
-            "type": "Feature",
-            "geometry": {
-                "type": "Polygon",
-                "coordinates": [create_cell_polygon(
-                    row['cell_ll_lat'], 
-                    row['cell_ll_lon']
-                )]
-            },
-            "properties": {
-                "date": row['date'],
-                "month": int(row['month']),
-                "cell_ll_lat": float(row['cell_ll_lat']),
-                "cell_ll_lon": float(row['cell_ll_lon']),
-                "flag": row['flag'],
-                "geartype": row['geartype'],
-                "hours": float(row['hours']),
-                "fishing_hours": float(row['fishing_hours']),
-                "mmsi_present": int(row['mmsi_present']),
-                "fishing_intensity": float(row['fishing_hours'] / row['hours']) if row['hours'] > 0 else 0
-            }
-        }
-        geojson['features'].append(feature)
+    if skip_geojson:
+        print("\nSkipping GeoJSON export (--skip-geojson)")
+    else:
+        # Collapse rows sharing a grid cell, day, flag and gear into one feature each
+        print("\n" + "=" * 60)
+        print("Step 3: Creating GeoJSON file")
+        print("=" * 60)
+        print("Aggregating rows to unique grid cells...")
+        
+        cell_df = (combined_df
+                   .groupby(CELL_KEYS, observed=True, sort=False, dropna=False, as_index=False)
+                   .agg(hours=('hours', 'sum'),
+                        fishing_hours=('fishing_hours', 'sum'),
+                        mmsi_present=('mmsi_present', 'sum')))
+        print(f"✓ {len(combined_df):,} rows → {len(cell_df):,} cell features "
+              f"({len(combined_df) / max(len(cell_df), 1):.2f}x compaction)")
+        
+        geojson['metadata']['total_features'] = len(cell_df)
+        
+        # Feature properties as typed columns; the features themselves are built
+        # while streaming them to disk
+        print("Preparing GeoJSON feature properties...")
+        
+        hours = cell_df['hours'].to_numpy()
+        fishing_hours = cell_df['fishing_hours'].to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cell_df['fishing_intensity'] = np.where(hours > 0, fishing_hours / hours, 0.0)
+        
+        # Save to GeoJSON file
+        print("\n" + "=" * 60)
+        print("Step 4: Saving to file")
+        print("=" * 60)
+        
+        output_file = "fishing_intensity.geojson"
+        print(f"Writing features to {output_file}...")
+        print("(This might take a few minutes...)")
+        
+        n_features = write_geojson(geojson, iter_features(cell_df), output_file)
+        
+        file_size_mb = Path(output_file).stat().st_size / (1024*1024)
+        
+        print(f"\n✓ SUCCESS! Created {output_file}")
+        print(f"  Total features: {n_features:,}")
+        print(f"  File size: {file_size_mb:.2f} MB")
         
-        # Progress indicator every 10000 rows
-        if (idx + 1) % 10000 == 0:
-            print(f"  Processed {idx + 1:,} / {len(combined_df):,} features ({(idx+1)/len(combined_df)*100:.1f}%)")
-    
-    # Save to GeoJSON file
-    print("\n" + "=" * 60)
-    print("Step 4: Saving to file")
-    print("=" * 60)
-    
-    output_file = "fishing_intensity.geojson"
-    print(f"Writing to {output_file}...")
-    
-    with open(output_file, 'w') as f:
-        json.dump(geojson, f)
-    
-    file_size_mb = Path(output_file).stat().st_size / (1024*1024)
-    
-    print(f"\n✓ SUCCESS! Created {output_file}")
-    print(f"  Total features: {len(geojson['features']):,}")
-    print(f"  File size: {file_size_mb:.2f} MB")
     
     # Summary statistics
     print("\n" + "=" * 60)
     print("SUMMARY STATISTICS")
     print("=" * 60)
-    print(f"Total fishing hours: {combined_df['fishing_hours'].sum():,.0f}")
-    print(f"Total vessel hours: {combined_df['hours'].sum():,.0f}")
-    print(f"Unique flags: {combined_df['flag'].nunique()}")
-    print(f"Unique gear types: {combined_df['geartype'].nunique()}")
-    print(f"Date range: {combined_df['date'].min()} to {combined_df['date'].max()}")
+    stats = combined_df.agg({
+        'fishing_hours': 'sum', 'hours': 'sum',
+        'flag': 'nunique', 'geartype': 'nunique',
+        'date': ['min', 'max']
+    })
+    print(f"Total fishing hours: {stats.at['sum', 'fishing_hours']:,.0f}")
+    print(f"Total vessel hours: {stats.at['sum', 'hours']:,.0f}")
+    print(f"Unique flags: {stats.at['nunique', 'flag']:.0f}")
+    print(f"Unique gear types: {stats.at['nunique', 'geartype']:.0f}")
+    print(f"Date range: {stats.at['min', 'date']} to {stats.at['max', 'date']}")
     
     # Top 5 flags
     print("\nTop 5 countries by fishing hours:")
-    top_flags = combined_df.groupby('flag')['fishing_hours'].sum().sort_values(ascending=False).head()
+    top_flags = combined_df.groupby('flag', observed=True, sort=False)['fishing_hours'].sum().nlargest(5)
     for flag, hours in top_flags.items():
         print(f"  {flag}: {hours:,.0f} hours")
     
     # Top 5 gear types
     print("\nTop 5 gear types by fishing hours:")
-    top_gears = combined_df.groupby('geartype')['fishing_hours'].sum().sort_values(ascending=False).head()
+    top_gears = combined_df.groupby('geartype', observed=True, sort=False)['fishing_hours'].sum().nlargest(5)
     for gear, hours in top_gears.items():
         print(f"  {gear}: {hours:,.0f} hours")
     
@@ -219,14 +388,24 @@ if __name__ == "__main__":
     print("=" * 60)
     print()
     
+    parser = argparse.ArgumentParser(description="Aggregate Global Fishing Watch fleet CSVs for the Mediterranean")
+    parser.add_argument('--skip-geojson', action='store_true',
+                        help="only write the Parquet table, skip the GeoJSON features")
+    parser.add_argument('--verbose', action='store_true',
+                        help="print progress for every parsed CSV batch")
+    args = parser.parse_args()
+    
     try:
-        geojson_data = process_monthly_files()
+        geojson_data = process_monthly_files(skip_geojson=args.skip_geojson, verbose=args.verbose)
         
         if geojson_data:
             print("\n" + "=" * 60)
             print("✓ ✓ ✓ PROCESSING COMPLETE! ✓ ✓ ✓")
             print("=" * 60)
-            print("\nYour file 'fishing_intensity2023.geojson' is ready to use!")
+            if args.skip_geojson:
+                print("\nYour file 'mediterranean_fishing_2023.parquet' is ready to use!")
+            else:
+                print("\nYour file 'fishing_intensity2023.geojson' is ready to use!")
     except Exception as e:
         print(f"\n❌ ERROR: {e}")
         print("\nPlease check:")
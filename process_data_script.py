@@ -4,21 +4,306 @@ MedGuard Data Processing Pipeline
 Processes raw data from Copernicus and EMODnet into analysis-ready formats
 """
 
+import os
+import sys
+import argparse
+import hashlib
+import json
+import logging
+import logging.handlers
 import numpy as np
 import pandas as pd
 import xarray as xr
 import geopandas as gpd
+import shapely
+from shapely.strtree import STRtree
+import dask
+import dask.array as da
+from numba import guvectorize, vectorize
 from pathlib import Path
 from datetime import datetime
-from scipy import stats, ndimage
+from functools import lru_cache
+from scipy import ndimage
 from sklearn.preprocessing import StandardScaler
 import warnings
 warnings.filterwarnings('ignore')
 
+# Buffered 'medguard' logger shared with the newer pipeline: lines are written
+# whole and in batches rather than one flushed print each, and are flushed
+# after every stage; warnings and errors flush immediately
+logger = logging.getLogger('medguard')
+if not logger.handlers:
+    _stream = logging.StreamHandler(sys.stdout)
+    _stream.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(logging.handlers.MemoryHandler(
+        capacity=200, flushLevel=logging.WARNING, target=_stream
+    ))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def flush_log():
+    """Write out anything still buffered"""
+    for handler in logger.handlers:
+        handler.flush()
+
+# Optional GPU backend for the elementwise stages
+try:
+    import cupy
+except ImportError:
+    cupy = None
+
+# ~100 MB dask chunks, and let slicing split chunks instead of blowing them up
+dask.config.set({
+    'array.chunk-size': '100MiB',
+    'array.slicing.split_large_chunks': True
+})
+
+
+def open_copernicus_dataset(filepath):
+    """Open a Copernicus NetCDF lazily as a dask-backed dataset"""
+    try:
+        ds = xr.open_dataset(filepath, chunks={}, engine='h5netcdf')
+    except Exception:
+        # Not an HDF5-based file (e.g. NetCDF3): let xarray pick the backend
+        ds = xr.open_dataset(filepath, chunks={})
+    
+    # float32 halves the memory traffic of every elementwise stage; scaled
+    # int16 variables are decoded straight to float32 as well
+    float64_vars = [var for var in ds.data_vars if ds[var].dtype == np.float64]
+    if float64_vars:
+        ds = ds.assign({var: ds[var].astype(np.float32) for var in float64_vars})
+    return time_contiguous(ds)
+
+
+# Mediterranean bounding box (lon/lat) used to filter vector layers while reading
+MED_BBOX = (-6.0, 30.0, 37.0, 46.0)
+
+
+def read_vector(filepath, bbox=None):
+    """
+    Read a vector file with pyogrio's Arrow reader, falling back to Fiona; a
+    lon/lat bbox is pushed down to GDAL's spatial filter
+    """
+    if bbox is not None:
+        # A GeoSeries bbox is reprojected to the layer's CRS if needed
+        bbox = gpd.GeoSeries([shapely.box(*bbox)], crs="EPSG:4326")
+    try:
+        import pyogrio
+    except ImportError:
+        return gpd.read_file(filepath, bbox=bbox)
+    # Bulk columnar decode in GDAL instead of per-feature Python parsing
+    return gpd.read_file(filepath, engine='pyogrio', use_arrow=True, bbox=bbox)
+
+
+@lru_cache(maxsize=None)
+def zarr_compressor_encoding():
+    """Blosc-LZ4 (level 3, bitshuffle) variable encoding for the installed zarr version"""
+    import zarr
+    if int(zarr.__version__.split('.')[0]) >= 3:
+        from zarr.codecs import BloscCodec
+        return {'compressors': (BloscCodec(cname='lz4', clevel=3, shuffle='bitshuffle'),)}
+    from numcodecs import Blosc
+    return {'compressor': Blosc(cname='lz4', clevel=3, shuffle=Blosc.BITSHUFFLE)}
+
+
+# 0-1 indices are stored as uint8 with 1/254 resolution on export, 255 marking NaN
+UNIT_INDEX_VARIABLES = {'overfishing_risk_index', 'juvenile_habitat_score'}
+UNIT_INDEX_ENCODING = {'dtype': 'uint8', 'scale_factor': np.float32(1 / 254), 'add_offset': np.float32(0), '_FillValue': 255}
+
+
+# Class bins and labels; classes are stored as int8 codes indexing the labels
+PRODUCTIVITY_CLASSES = ([0.1, 1.0], ['oligotrophic', 'mesotrophic', 'eutrophic'])
+RISK_CLASSES = ([0.3, 0.6], ['low', 'medium', 'high'])
+HABITAT_CLASSES = ([0.3, 0.6], ['poor', 'moderate', 'good'])
+
+
+def _digitize(x, bins):
+    """Bin index of each value as int8 (NaN falls in the top bin)"""
+    return np.digitize(x, bins).astype(np.int8)
+
+
+def classify(data, classes):
+    """
+    int8 class codes of a field in one pass per chunk, with the labels kept
+    as CF flag attributes for reporting
+    """
+    bins, labels = classes
+    codes = xr.apply_ufunc(_digitize, data, kwargs={'bins': np.asarray(bins)},
+                           dask='parallelized', output_dtypes=[np.int8])
+    codes.attrs = {'flag_values': list(range(len(labels))), 'flag_meanings': ' '.join(labels)}
+    return codes
+
+
+def mask_area_percent(mask):
+    """Share of set cells in a 0/1 mask, by popcount over the bit-packed mask on numpy >= 2"""
+    values = np.asarray(mask)
+    if hasattr(np, 'bitwise_count'):
+        count = np.bitwise_count(np.packbits(values)).sum(dtype=np.int64)
+    else:
+        count = np.count_nonzero(values)
+    return count / values.size * 100
+
+
+def field_quantile(data, q):
+    """
+    q-quantile of a field's valid values as a plain float. A field spread
+    over several chunks uses dask's mergeable T-Digest sketch when crick is
+    installed, rather than gathering it into one task; otherwise numpy's
+    selection-based (O(N)) nanquantile
+    """
+    values = data.data
+    if getattr(values, 'npartitions', 1) > 1:
+        try:
+            import crick  # backs dask's t-digest percentile
+        except ImportError:
+            pass
+        else:
+            flat = values.ravel()
+            flat = flat[~da.isnan(flat)]
+            return float(da.percentile(flat, [q * 100], internal_method='tdigest').compute()[0])
+    return float(data.quantile(q))
+
+
+def upper_quartile(values):
+    """
+    75th percentile (linear interpolation, NaNs skipped, as pandas'
+    quantile) by O(N) selection of the two bracketing values, not a sort
+    """
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return np.nan
+    position = 0.75 * (values.size - 1)
+    lower = int(position)
+    upper = min(lower + 1, values.size - 1)
+    bracket = np.partition(values, [lower, upper])
+    return bracket[lower] + (bracket[upper] - bracket[lower]) * (position - lower)
+
+
+def time_contiguous(data):
+    """
+    Rechunk so each pixel's full time series lives in one chunk, with lat/lon
+    tiles sized to ~100 MB; per-pixel time reductions then stay chunk-local
+    """
+    return data.chunk({dim: -1 if dim == 'time' else 'auto' for dim in data.dims})
+
+
+@guvectorize(
+    ['void(float32[:], int64[:], int64[:], float32[:], float32[:], float32[:], float32[:])',
+     'void(float64[:], int64[:], int64[:], float64[:], float64[:], float64[:], float64[:])'],
+    '(t),(t),(m)->(m),(m),(t),(t)',
+    nopython=True, cache=True
+)
+def _sst_month_stats(x, month, months, clim, std, anom, standardized):
+    """Monthly climatology, std, anomaly and standardized anomaly of one pixel's series"""
+    # Position of each calendar month in the output month axis
+    slot = np.full(13, -1, np.int64)
+    for k in range(months.shape[0]):
+        slot[months[k]] = k
+    
+    total = np.zeros(months.shape[0])
+    count = np.zeros(months.shape[0])
+    for i in range(x.shape[0]):
+        if not np.isnan(x[i]):
+            total[slot[month[i]]] += x[i]
+            count[slot[month[i]]] += 1
+    for k in range(months.shape[0]):
+        clim[k] = total[k] / count[k] if count[k] > 0 else np.nan
+    
+    # Anomalies, with the squared deviations accumulated on the way (ddof=0)
+    sq_dev = np.zeros(months.shape[0])
+    for i in range(x.shape[0]):
+        anom[i] = x[i] - clim[slot[month[i]]]
+        if not np.isnan(anom[i]):
+            sq_dev[slot[month[i]]] += anom[i] * anom[i]
+    for k in range(months.shape[0]):
+        std[k] = np.sqrt(sq_dev[k] / count[k]) if count[k] > 0 else np.nan
+    
+    # A constant month (std 0) has no standardized anomaly rather than inf
+    for i in range(x.shape[0]):
+        k = slot[month[i]]
+        standardized[i] = anom[i] / std[k] if std[k] > 0 else np.nan
+
+
+def _sobel_gradient_magnitude(block, lat_axis, lon_axis, dlat, dlon):
+    """
+    Sobel gradient magnitude of a block, in field units per degree: a [-1, 0, 1]
+    derivative along one horizontal axis, smoothed [1, 2, 1] along the other
+    """
+    nd = ndimage
+    if cupy is not None and isinstance(block, cupy.ndarray):
+        from cupyx.scipy import ndimage as nd
+    grad_lat = nd.correlate1d(nd.correlate1d(block, [-1, 0, 1], axis=lat_axis), [1, 2, 1], axis=lon_axis)
+    grad_lon = nd.correlate1d(nd.correlate1d(block, [-1, 0, 1], axis=lon_axis), [1, 2, 1], axis=lat_axis)
+    grad_lat /= 8 * dlat
+    grad_lon /= 8 * dlon
+    return np.hypot(grad_lat, grad_lon)
+
+
+def _current_speed(u, v):
+    """Current speed, reusing one buffer for the whole computation"""
+    speed = u * u
+    speed += v * v
+    np.sqrt(speed, out=speed)
+    return speed
+
+
+def _current_direction(u, v):
+    """Current direction in degrees (0-360), computed in place"""
+    # Fold (-180, 0) into (180, 360) with a masked add rather than a modulo
+    direction = np.arctan2(v, u)
+    direction *= 180 / np.pi
+    np.add(direction, 360, out=direction, where=direction < 0)
+    return direction
+
+
+@vectorize(
+    ['float32(float32, float32)', 'float64(float64, float64)'],
+    nopython=True, cache=True
+)
+def _chl_score(chl, chl_q95):
+    """Productivity suitability: higher is better, capped at the 95th percentile"""
+    score = chl / chl_q95
+    return 1.0 if score > 1.0 else score
+
+
+@vectorize(
+    ['float32(float32, float32)', 'float64(float64, float64)'],
+    nopython=True, cache=True
+)
+def _current_score(current, current_q95):
+    """Current suitability: lower speeds preferred, zero above the 95th percentile"""
+    score = 1.0 - current / current_q95
+    return 0.0 if score < 0.0 else score
+
+
+@vectorize(
+    ['float32(float32, float32, float32, boolean, boolean)',
+     'float64(float64, float64, float64, boolean, boolean)'],
+    nopython=True, cache=True
+)
+def _habitat_score(sst, chl_score, current_score, use_chl, use_current):
+    """
+    Juvenile habitat score of one cell from temperature suitability and the
+    productivity and current scores; components not used are left out
+    """
+    # Optimal temperature range (15-22°C for many Mediterranean species)
+    if sst >= 15.0 and sst <= 22.0:
+        score = 1.0 - abs((sst - 18.5) / 18.5)
+    else:
+        score = 0.0
+    
+    if use_chl:
+        score = (score + chl_score) / 2
+    if use_current:
+        score = (score * 2 + current_score) / 3
+    return score
+
+
 class MedGuardProcessor:
     """Main data processing class for MedGuard project"""
     
-    def __init__(self, data_dir='data'):
+    def __init__(self, data_dir='data', use_gpu=False):
         self.data_dir = Path(data_dir)
         self.copernicus_dir = self.data_dir / 'copernicus'
         self.emodnet_dir = self.data_dir / 'emodnet'
@@ -27,12 +312,38 @@ class MedGuardProcessor:
         
         self.raw_data = {}
         self.processed_data = {}
+        self._latest_fields = {}
+        self._mpa_3857 = None
+        self._fishing_tree = None
+        self._fishing_effort = None
+        
+        if use_gpu and cupy is None:
+            logger.warning("⚠ CuPy not installed, running all stages on the CPU")
+        self.use_gpu = use_gpu and cupy is not None
+        
+    def latest_field(self, key, var):
+        """Last time step of a raw variable, read once and shared by every stage that needs it"""
+        if (key, var) not in self._latest_fields:
+            self._latest_fields[key, var] = self.raw_data[key][var].isel(time=-1).persist()
+        return self._latest_fields[key, var]
+        
+    def _to_device(self, data):
+        """Move a dask-backed DataArray's blocks to the GPU when running with --gpu"""
+        if not self.use_gpu:
+            return data
+        return data.copy(data=data.data.map_blocks(cupy.asarray, dtype=data.dtype))
+        
+    def _to_host(self, data):
+        """Bring GPU blocks back as NumPy before persisting, reductions to floats and export"""
+        if not self.use_gpu:
+            return data
+        return data.copy(data=data.data.map_blocks(cupy.asnumpy, dtype=data.dtype))
         
     def load_copernicus_data(self):
         """Load all Copernicus Marine datasets"""
-        print("\n" + "="*60)
-        print("LOADING COPERNICUS MARINE DATA")
-        print("="*60)
+        logger.info("\n" + "="*60)
+        logger.info("LOADING COPERNICUS MARINE DATA")
+        logger.info("="*60)
         
         datasets = {
             'sst': 'med_sst.nc',
@@ -42,22 +353,23 @@ class MedGuardProcessor:
             'ssh': 'med_ssh.nc'
         }
         
+        self._latest_fields.clear()
         for key, filename in datasets.items():
             filepath = self.copernicus_dir / filename
             if filepath.exists():
                 try:
-                    self.raw_data[key] = xr.open_dataset(filepath)
-                    print(f"✓ Loaded {key}: {filepath.name}")
+                    self.raw_data[key] = open_copernicus_dataset(filepath)
+                    logger.info(f"✓ Loaded {key}: {filepath.name}")
                 except Exception as e:
-                    print(f"✗ Error loading {key}: {e}")
+                    logger.error(f"✗ Error loading {key}: {e}")
             else:
-                print(f"⚠ Missing {key}: {filepath.name}")
+                logger.warning(f"⚠ Missing {key}: {filepath.name}")
                 
     def load_emodnet_data(self):
         """Load EMODnet datasets"""
-        print("\n" + "="*60)
-        print("LOADING EMODNET DATA")
-        print("="*60)
+        logger.info("\n" + "="*60)
+        logger.info("LOADING EMODNET DATA")
+        logger.info("="*60)
         
         datasets = {
             'fishing': 'fishing_intensity.geojson',
@@ -69,173 +381,227 @@ class MedGuardProcessor:
             filepath = self.emodnet_dir / filename
             if filepath.exists():
                 try:
-                    self.raw_data[key] = gpd.read_file(filepath)
-                    print(f"✓ Loaded {key}: {filepath.name}")
+                    bbox = MED_BBOX if key == 'mpa' else None
+                    self.raw_data[key] = read_vector(filepath, bbox=bbox)
+                    logger.info(f"✓ Loaded {key}: {filepath.name}")
                 except Exception as e:
-                    print(f"✗ Error loading {key}: {e}")
+                    logger.error(f"✗ Error loading {key}: {e}")
             else:
-                print(f"⚠ Missing {key}: {filepath.name}")
+                logger.warning(f"⚠ Missing {key}: {filepath.name}")
                 
+    def _sst_climatology_cache(self, sst):
+        """
+        Zarr path of the cached SST climatology for this input, keyed by the
+        source file's mtime and size and the time range; None if the source is unknown
+        """
+        source = self.raw_data['sst'].encoding.get('source')
+        if not source or not os.path.exists(source):
+            return None
+        stat = os.stat(source)
+        times = sst['time'].values
+        fingerprint = (stat.st_mtime_ns, stat.st_size, str(times[0]), str(times[-1]), times.size)
+        key = hashlib.sha1(repr(fingerprint).encode()).hexdigest()[:12]
+        return self.processed_dir / 'cache' / f'sst_clim_{key}.zarr'
+        
     def calculate_sst_anomaly(self):
         """Calculate sea surface temperature anomalies"""
-        print("\n" + "="*60)
-        print("CALCULATING SST ANOMALIES")
-        print("="*60)
+        logger.info("\n" + "="*60)
+        logger.info("CALCULATING SST ANOMALIES")
+        logger.info("="*60)
         
         if 'sst' not in self.raw_data:
-            print("✗ SST data not available")
+            logger.error("✗ SST data not available")
             return
             
         try:
-            sst = self.raw_data['sst']['thetao']
-            
-            # Calculate climatology (long-term mean)
-            sst_climatology = sst.groupby('time.month').mean('time')
-            
-            # Calculate anomaly
-            sst_anomaly = sst.groupby('time.month') - sst_climatology
+            sst = time_contiguous(self.raw_data['sst']['thetao'])
+            month = sst['time.month'].astype(np.int64)
+            
+            cache = self._sst_climatology_cache(sst)
+            if cache is not None and cache.exists():
+                # Same input file and time range as a previous run: reuse its
+                # monthly climatology and std, leaving only elementwise work
+                cached = xr.open_zarr(cache, consolidated=True)
+                sst_climatology, sst_std = (cached[var].rename(sst.name) for var in ('sst_climatology', 'sst_std'))
+                sst_anomaly = (sst.groupby(month) - sst_climatology).drop_vars('month')
+                sst_standardized = (sst_anomaly.groupby(month) / sst_std.where(sst_std > 0)).drop_vars('month')
+                sst_anomaly = time_contiguous(sst_anomaly.transpose(*sst.dims).rename(sst.name))
+                sst_standardized = time_contiguous(sst_standardized.transpose(*sst.dims).rename(sst.name))
+                logger.info(f"  ✓ Reused cached climatology: {cache.name}")
+            else:
+                # Climatology (long-term monthly mean), monthly std, anomaly and
+                # standardized anomaly from one pass over each pixel's time series
+                months = xr.DataArray(np.unique(month), dims='month', name='month')
+                sst_climatology, sst_std, sst_anomaly, sst_standardized = xr.apply_ufunc(
+                    _sst_month_stats,
+                    sst, month, months,
+                    input_core_dims=[['time'], ['time'], ['month']],
+                    output_core_dims=[['month'], ['month'], ['time'], ['time']],
+                    dask='parallelized',
+                    output_dtypes=[sst.dtype] * 4
+                )
+                sst_climatology = sst_climatology.assign_coords(month=months).transpose('month', ...)
+                sst_std = sst_std.assign_coords(month=months).transpose('month', ...)
+                sst_anomaly = sst_anomaly.transpose(*sst.dims)
+                sst_standardized = sst_standardized.transpose(*sst.dims)
+            
+            # Run the graph once for all later stages
+            sst_anomaly, sst_standardized, sst_climatology, sst_std = dask.persist(
+                sst_anomaly, sst_standardized, sst_climatology, sst_std
+            )
             
-            # Calculate standardized anomaly
-            sst_std = sst.groupby('time.month').std('time')
-            sst_standardized = (sst.groupby('time.month') - sst_climatology) / sst_std
+            if cache is not None and not cache.exists():
+                cache.parent.mkdir(exist_ok=True)
+                xr.Dataset({'sst_climatology': sst_climatology, 'sst_std': sst_std}).to_zarr(
+                    cache, mode='w', consolidated=True
+                )
             
             self.processed_data['sst_anomaly'] = sst_anomaly
             self.processed_data['sst_standardized'] = sst_standardized
             self.processed_data['sst_climatology'] = sst_climatology
             
-            print(f"✓ SST anomalies calculated")
-            print(f"  Mean anomaly: {float(sst_anomaly.mean()):.3f}°C")
-            print(f"  Max anomaly: {float(sst_anomaly.max()):.3f}°C")
+            logger.info(f"✓ SST anomalies calculated")
+            logger.info(f"  Mean anomaly: {float(sst_anomaly.mean()):.3f}°C")
+            logger.info(f"  Max anomaly: {float(sst_anomaly.max()):.3f}°C")
             
         except Exception as e:
-            print(f"✗ Error calculating SST anomaly: {e}")
+            logger.error(f"✗ Error calculating SST anomaly: {e}")
             
-    def calculate_current_speed(self):
-        """Calculate current speed and direction"""
-        print("\n" + "="*60)
-        print("CALCULATING CURRENT SPEED")
-        print("="*60)
+    def calculate_current_speed(self, compute_direction=False):
+        """Calculate current speed, and direction only when asked for"""
+        logger.info("\n" + "="*60)
+        logger.info("CALCULATING CURRENT SPEED")
+        logger.info("="*60)
         
         if 'currents' not in self.raw_data:
-            print("✗ Current data not available")
+            logger.error("✗ Current data not available")
             return
             
         try:
-            u = self.raw_data['currents']['uo']
-            v = self.raw_data['currents']['vo']
-            
-            # Calculate speed
-            speed = np.sqrt(u**2 + v**2)
+            u = self._to_device(self.raw_data['currents']['uo'])
+            v = self._to_device(self.raw_data['currents']['vo'])
             
-            # Calculate direction (oceanographic convention)
-            direction = np.arctan2(v, u) * 180 / np.pi
-            direction = (direction + 360) % 360
+            # One task per chunk, without the full-size temporaries of the
+            # plain expression
+            speed = xr.apply_ufunc(_current_speed, u, v, dask='parallelized', output_dtypes=[u.dtype])
+            speed = self._to_host(speed).rename('current_speed').persist()
             
             self.processed_data['current_speed'] = speed
-            self.processed_data['current_direction'] = direction
             
-            print(f"✓ Current speed calculated")
-            print(f"  Mean speed: {float(speed.mean()):.4f} m/s")
-            print(f"  Max speed: {float(speed.max()):.4f} m/s")
+            # No later stage reads the direction, so it is skipped by default
+            if compute_direction:
+                self.processed_data['current_direction'] = self.get_current_direction()
             
-        except Exception as e:
-            print(f"✗ Error calculating current speed: {e}")
+            logger.info(f"✓ Current speed calculated")
+            logger.info(f"  Mean speed: {float(speed.mean()):.4f} m/s")
+            logger.info(f"  Max speed: {float(speed.max()):.4f} m/s")
             
+        except Exception as e:
+            logger.error(f"✗ Error calculating current speed: {e}")
+            
+    def get_current_direction(self):
+        """Current direction (oceanographic convention), computed on demand from u and v"""
+        u = self._to_device(self.raw_data['currents']['uo'])
+        v = self._to_device(self.raw_data['currents']['vo'])
+        direction = xr.apply_ufunc(_current_direction, u, v, dask='parallelized', output_dtypes=[u.dtype])
+        return self._to_host(direction).rename('current_direction').persist()
+        
     def calculate_productivity_index(self):
         """Calculate ocean productivity index from chlorophyll"""
-        print("\n" + "="*60)
-        print("CALCULATING PRODUCTIVITY INDEX")
-        print("="*60)
+        logger.info("\n" + "="*60)
+        logger.info("CALCULATING PRODUCTIVITY INDEX")
+        logger.info("="*60)
         
         if 'chlorophyll' not in self.raw_data:
-            print("✗ Chlorophyll data not available")
+            logger.error("✗ Chlorophyll data not available")
             return
             
         try:
-            chl = self.raw_data['chlorophyll']['CHL']
+            # The trend fit needs each pixel's whole series in one chunk
+            chl = time_contiguous(self.raw_data['chlorophyll']['CHL'])
             
             # Calculate temporal trend
             time_numeric = (chl['time'] - chl['time'][0]) / np.timedelta64(1, 'D')
             
-            # Fit linear trend for each pixel
-            def calc_trend(data):
-                if np.all(np.isnan(data)):
-                    return np.nan
-                mask = ~np.isnan(data)
-                if mask.sum() < 10:  # Need at least 10 points
-                    return np.nan
-                slope, _, _, _, _ = stats.linregress(
-                    time_numeric[mask], 
-                    data[mask]
-                )
-                return slope
-                
-            # Apply trend calculation
-            chl_trend = xr.apply_ufunc(
-                calc_trend,
-                chl,
-                input_core_dims=[['time']],
-                vectorize=True,
-                dask='parallelized'
-            )
+            # Least-squares slope per pixel over its valid samples, as whole-array
+            # reductions instead of one linregress call per pixel
+            valid = chl.notnull()
+            n_valid = valid.sum('time')
+            t = time_numeric.where(valid)
+            chl_mean = chl.mean('time')
+            t_anom = t - t.mean('time')
+            chl_trend = (
+                ((chl - chl_mean) * t_anom).sum('time') / (t_anom ** 2).sum('time')
+            ).where(n_valid >= 10)  # Need at least 10 points
+            chl_trend.name = chl.name
             
             # Calculate productivity categories
-            chl_mean = chl.mean('time')
-            productivity = xr.where(chl_mean < 0.1, 'oligotrophic',
-                          xr.where(chl_mean < 1.0, 'mesotrophic', 'eutrophic'))
+            productivity = classify(chl_mean, PRODUCTIVITY_CLASSES)
+            
+            chl_trend, chl_mean, productivity = dask.persist(chl_trend, chl_mean, productivity)
             
             self.processed_data['chl_trend'] = chl_trend
             self.processed_data['chl_mean'] = chl_mean
             self.processed_data['productivity_class'] = productivity
             
-            print(f"✓ Productivity index calculated")
-            print(f"  Mean chlorophyll: {float(chl_mean.mean()):.4f} mg/m³")
+            logger.info(f"✓ Productivity index calculated")
+            logger.info(f"  Mean chlorophyll: {float(chl_mean.mean()):.4f} mg/m³")
             
         except Exception as e:
-            print(f"✗ Error calculating productivity: {e}")
+            logger.error(f"✗ Error calculating productivity: {e}")
             
     def calculate_frontal_zones(self):
         """Identify oceanographic fronts (high gradients)"""
-        print("\n" + "="*60)
-        print("IDENTIFYING OCEANOGRAPHIC FRONTS")
-        print("="*60)
+        logger.info("\n" + "="*60)
+        logger.info("IDENTIFYING OCEANOGRAPHIC FRONTS")
+        logger.info("="*60)
         
         if 'sst' not in self.raw_data:
-            print("✗ SST data not available for front detection")
+            logger.error("✗ SST data not available for front detection")
             return
             
         try:
             # Use recent SST
-            sst = self.raw_data['sst']['thetao'].isel(time=-1)
-            
-            # Calculate gradients
-            grad_x = sst.differentiate('lon')
-            grad_y = sst.differentiate('lat')
-            
-            # Calculate gradient magnitude
-            gradient_magnitude = np.sqrt(grad_x**2 + grad_y**2)
+            sst = self._to_device(self.latest_field('sst', 'thetao'))
+            
+            # Gradient magnitude from a 3x3 Sobel stencil per tile (one-cell
+            # halo from the neighbouring tiles) instead of two full-grid
+            # differentiate passes
+            lat_axis, lon_axis = sst.get_axis_num('lat'), sst.get_axis_num('lon')
+            magnitude = da.map_overlap(
+                _sobel_gradient_magnitude, sst.data,
+                depth={lat_axis: 1, lon_axis: 1}, boundary='reflect', dtype=sst.dtype,
+                lat_axis=lat_axis, lon_axis=lon_axis,
+                dlat=float(np.abs(np.diff(sst['lat'].values)).mean()),
+                dlon=float(np.abs(np.diff(sst['lon'].values)).mean())
+            )
+            gradient_magnitude = self._to_host(
+                xr.DataArray(magnitude, coords=sst.coords, dims=sst.dims, name=sst.name)
+            )
             
             # Identify fronts (high gradient zones)
-            front_threshold = gradient_magnitude.quantile(0.9)
-            frontal_zones = gradient_magnitude > front_threshold
+            front_threshold = field_quantile(gradient_magnitude, 0.9)
+            frontal_zones = (gradient_magnitude > front_threshold).astype(np.uint8)
+            
+            gradient_magnitude, frontal_zones = dask.persist(gradient_magnitude, frontal_zones)
             
             self.processed_data['sst_gradient'] = gradient_magnitude
             self.processed_data['frontal_zones'] = frontal_zones
             
-            print(f"✓ Frontal zones identified")
-            print(f"  Frontal area: {float(frontal_zones.sum() / frontal_zones.size * 100):.2f}%")
+            logger.info(f"✓ Frontal zones identified")
+            logger.info(f"  Frontal area: {mask_area_percent(frontal_zones):.2f}%")
             
         except Exception as e:
-            print(f"✗ Error calculating fronts: {e}")
+            logger.error(f"✗ Error calculating fronts: {e}")
             
     def calculate_fishing_pressure(self):
         """Process fishing intensity data"""
-        print("\n" + "="*60)
-        print("PROCESSING FISHING PRESSURE DATA")
-        print("="*60)
+        logger.info("\n" + "="*60)
+        logger.info("PROCESSING FISHING PRESSURE DATA")
+        logger.info("="*60)
         
         if 'fishing' not in self.raw_data:
-            print("✗ Fishing data not available")
+            logger.error("✗ Fishing data not available")
             return
             
         try:
@@ -248,37 +614,45 @@ class MedGuardProcessor:
             if 'effort' in fishing.columns or 'intensity' in fishing.columns:
                 effort_col = 'effort' if 'effort' in fishing.columns else 'intensity'
                 
+                # Bulk-built R-tree over the fishing geometries, kept with the
+                # effort values for spatial joins against MPAs and the risk grid
+                self._fishing_tree = STRtree(np.asarray(fishing.geometry.array))
+                self._fishing_effort = fishing[effort_col].to_numpy(dtype=float)
+                
                 fishing_summary = {
                     'total_effort': fishing[effort_col].sum(),
                     'mean_effort': fishing[effort_col].mean(),
-                    'high_intensity_zones': len(fishing[fishing[effort_col] > fishing[effort_col].quantile(0.75)])
+                    'high_intensity_zones': int((self._fishing_effort > upper_quartile(self._fishing_effort)).sum())
                 }
                 
                 self.processed_data['fishing_summary'] = fishing_summary
-                print(f"✓ Fishing pressure processed")
-                print(f"  Total effort: {fishing_summary['total_effort']:.0f}")
-                print(f"  High-intensity zones: {fishing_summary['high_intensity_zones']}")
+                logger.info(f"✓ Fishing pressure processed")
+                logger.info(f"  Total effort: {fishing_summary['total_effort']:.0f}")
+                logger.info(f"  High-intensity zones: {fishing_summary['high_intensity_zones']}")
             else:
-                print("⚠ Fishing intensity column not found")
+                logger.warning("⚠ Fishing intensity column not found")
                 
         except Exception as e:
-            print(f"✗ Error processing fishing data: {e}")
+            logger.error(f"✗ Error processing fishing data: {e}")
             
     def calculate_mpa_coverage(self):
         """Calculate MPA coverage statistics"""
-        print("\n" + "="*60)
-        print("ANALYZING MARINE PROTECTED AREAS")
-        print("="*60)
+        logger.info("\n" + "="*60)
+        logger.info("ANALYZING MARINE PROTECTED AREAS")
+        logger.info("="*60)
         
         if 'mpa' not in self.raw_data:
-            print("✗ MPA data not available")
+            logger.error("✗ MPA data not available")
             return
             
         try:
             mpa = self.raw_data['mpa']
             
-            # Calculate total MPA area
-            mpa_area = mpa.to_crs(epsg=3857).area.sum() / 1e6  # Convert to km²
+            # Calculate total MPA area: one reprojection of the whole geometry
+            # column and one GEOS area call; the projected layer is kept for
+            # later spatial work
+            self._mpa_3857 = mpa.to_crs(epsg=3857)
+            mpa_area = shapely.area(np.asarray(self._mpa_3857.geometry.array)).sum() / 1e6  # Convert to km²
             
             # Mediterranean total area (approximate)
             med_total_area = 2.5e6  # km²
@@ -293,19 +667,19 @@ class MedGuardProcessor:
             
             self.processed_data['mpa_stats'] = mpa_stats
             
-            print(f"✓ MPA analysis complete")
-            print(f"  Number of MPAs: {mpa_stats['number_of_mpas']}")
-            print(f"  Total area: {mpa_area:.0f} km²")
-            print(f"  Coverage: {mpa_coverage_pct:.2f}% of Mediterranean")
+            logger.info(f"✓ MPA analysis complete")
+            logger.info(f"  Number of MPAs: {mpa_stats['number_of_mpas']}")
+            logger.info(f"  Total area: {mpa_area:.0f} km²")
+            logger.info(f"  Coverage: {mpa_coverage_pct:.2f}% of Mediterranean")
             
         except Exception as e:
-            print(f"✗ Error analyzing MPAs: {e}")
+            logger.error(f"✗ Error analyzing MPAs: {e}")
             
     def calculate_overfishing_risk_index(self):
         """Calculate comprehensive overfishing risk index"""
-        print("\n" + "="*60)
-        print("CALCULATING OVERFISHING RISK INDEX")
-        print("="*60)
+        logger.info("\n" + "="*60)
+        logger.info("CALCULATING OVERFISHING RISK INDEX")
+        logger.info("="*60)
         
         try:
             # Initialize risk components
@@ -316,7 +690,7 @@ class MedGuardProcessor:
                 # High positive or negative anomalies increase risk
                 sst_risk = np.abs(self.processed_data['sst_standardized'].isel(time=-1))
                 risk_components['sst'] = sst_risk
-                print("  ✓ SST anomaly risk component")
+                logger.info("  ✓ SST anomaly risk component")
             
             # Component 2: Productivity Decline Risk
             if 'chl_trend' in self.processed_data:
@@ -327,14 +701,14 @@ class MedGuardProcessor:
                     0
                 )
                 risk_components['productivity'] = chl_risk
-                print("  ✓ Productivity decline risk component")
+                logger.info("  ✓ Productivity decline risk component")
             
             # Component 3: Frontal Zone Risk
             if 'frontal_zones' in self.processed_data:
-                # Fronts are fishing hotspots - higher risk
-                frontal_risk = self.processed_data['frontal_zones'].astype(float)
-                risk_components['frontal'] = frontal_risk
-                print("  ✓ Frontal zone risk component")
+                # Fronts are fishing hotspots - higher risk; the 0/1 mask stays
+                # uint8 and is only promoted inside the weighted sum
+                risk_components['frontal'] = self.processed_data['frontal_zones']
+                logger.info("  ✓ Frontal zone risk component")
             
             # Combine risk components (weighted average)
             if risk_components:
@@ -344,46 +718,50 @@ class MedGuardProcessor:
                     'frontal': 0.3
                 }
                 
-                # Normalize each component to 0-1 range
-                normalized_risks = {}
-                for key, risk in risk_components.items():
-                    risk_min = float(risk.min())
-                    risk_max = float(risk.max())
-                    if risk_max > risk_min:
-                        normalized_risks[key] = (risk - risk_min) / (risk_max - risk_min)
-                    else:
-                        normalized_risks[key] = risk * 0
+                # Every component's min and max from one scheduler pass
+                keys = list(risk_components)
+                bounds = dask.compute(*[(risk.min(), risk.max()) for risk in risk_components.values()])
+                component = {'component': keys}
+                risk_min = xr.DataArray([float(lo) for lo, _ in bounds], dims='component', coords=component)
+                # Flat components normalise to 0
+                risk_scale = xr.DataArray([1 / float(hi - lo) if hi > lo else 0.0 for lo, hi in bounds],
+                                          dims='component', coords=component)
+                component_weights = xr.DataArray([weights.get(key, 1.0) for key in keys],
+                                                 dims='component', coords=component)
                 
-                # Calculate weighted sum
-                risk_index = sum(
-                    normalized_risks[key] * weights.get(key, 1.0)
-                    for key in normalized_risks.keys()
-                ) / sum(weights.get(key, 1.0) for key in normalized_risks.keys())
+                # Normalize each component to 0-1 range and take the weighted
+                # mean as one broadcast + reduce over a stacked component axis
+                stack = xr.concat([risk_components[key] for key in keys],
+                                  dim=pd.Index(keys, name='component'),
+                                  join='inner', coords='minimal', compat='override')
+                normalized_risks = (stack - risk_min) * risk_scale
+                risk_index = normalized_risks.weighted(component_weights).mean('component', skipna=False)
                 
                 # Classify risk levels
-                risk_class = xr.where(risk_index < 0.3, 'low',
-                             xr.where(risk_index < 0.6, 'medium', 'high'))
+                risk_class = classify(risk_index, RISK_CLASSES)
+                
+                risk_index, risk_class = dask.persist(risk_index, risk_class)
                 
                 self.processed_data['overfishing_risk_index'] = risk_index
                 self.processed_data['overfishing_risk_class'] = risk_class
                 
-                print(f"\n✓ Overfishing risk index calculated")
-                print(f"  Low risk area: {float((risk_index < 0.3).sum() / risk_index.size * 100):.1f}%")
-                print(f"  Medium risk area: {float(((risk_index >= 0.3) & (risk_index < 0.6)).sum() / risk_index.size * 100):.1f}%")
-                print(f"  High risk area: {float((risk_index >= 0.6).sum() / risk_index.size * 100):.1f}%")
+                logger.info(f"\n✓ Overfishing risk index calculated")
+                logger.info(f"  Low risk area: {float((risk_index < 0.3).sum() / risk_index.size * 100):.1f}%")
+                logger.info(f"  Medium risk area: {float(((risk_index >= 0.3) & (risk_index < 0.6)).sum() / risk_index.size * 100):.1f}%")
+                logger.info(f"  High risk area: {float((risk_index >= 0.6).sum() / risk_index.size * 100):.1f}%")
             else:
-                print("✗ Insufficient data for risk index calculation")
+                logger.error("✗ Insufficient data for risk index calculation")
                 
         except Exception as e:
-            print(f"✗ Error calculating risk index: {e}")
+            logger.error(f"✗ Error calculating risk index: {e}")
             import traceback
             traceback.print_exc()
             
     def identify_juvenile_habitat_zones(self):
         """Identify potential juvenile fish habitats"""
-        print("\n" + "="*60)
-        print("IDENTIFYING JUVENILE HABITAT ZONES")
-        print("="*60)
+        logger.info("\n" + "="*60)
+        logger.info("IDENTIFYING JUVENILE HABITAT ZONES")
+        logger.info("="*60)
         
         try:
             # Juvenile fish prefer:
@@ -395,67 +773,87 @@ class MedGuardProcessor:
             habitat_score = None
             
             if 'sst' in self.raw_data:
-                sst = self.raw_data['sst']['thetao'].isel(time=-1)
-                # Optimal temperature range (15-22°C for many Mediterranean species)
-                temp_score = 1 - np.abs((sst - 18.5) / 18.5)
-                temp_score = xr.where((sst >= 15) & (sst <= 22), temp_score, 0)
-                habitat_score = temp_score
-                print("  ✓ Temperature suitability calculated")
-            
-            if 'chlorophyll' in self.raw_data and habitat_score is not None:
-                chl = self.raw_data['chlorophyll']['CHL'].isel(time=-1)
-                # Higher productivity better for juveniles
-                chl_score = chl / chl.quantile(0.95)
-                chl_score = xr.where(chl_score > 1, 1, chl_score)
+                sst = self.latest_field('sst', 'thetao')
+                logger.info("  ✓ Temperature suitability calculated")
                 
-                # Regrid to match SST if needed
-                if chl_score.shape != habitat_score.shape:
-                    chl_score = chl_score.interp_like(habitat_score)
+                # Component scores are capped on their native grids, then
+                # regridded onto SST; missing components are left out
+                chl_score, use_chl = 0.0, False
+                if 'chlorophyll' in self.raw_data:
+                    chl = self.latest_field('chlorophyll', 'CHL')
+                    chl_q95 = float(field_quantile(chl, 0.95))
+                    chl_score = xr.apply_ufunc(_chl_score, chl, chl_q95,
+                                               dask='parallelized', output_dtypes=[chl.dtype])
+                    if chl_score.shape != sst.shape:
+                        chl_score = chl_score.interp_like(sst)
+                    use_chl = True
+                    logger.info("  ✓ Productivity suitability calculated")
                 
-                habitat_score = (habitat_score + chl_score) / 2
-                print("  ✓ Productivity suitability calculated")
-            
-            if 'current_speed' in self.processed_data and habitat_score is not None:
-                current = self.processed_data['current_speed'].isel(time=-1)
-                # Lower current speeds preferred
-                current_score = 1 - (current / current.quantile(0.95))
-                current_score = xr.where(current_score < 0, 0, current_score)
+                current_score, use_current = 0.0, False
+                if 'current_speed' in self.processed_data:
+                    current = self.processed_data['current_speed'].isel(time=-1)
+                    current_q95 = float(field_quantile(current, 0.95))
+                    current_score = xr.apply_ufunc(_current_score, current, current_q95,
+                                                   dask='parallelized', output_dtypes=[current.dtype])
+                    if current_score.shape != sst.shape:
+                        current_score = current_score.interp_like(sst)
+                    use_current = True
+                    logger.info("  ✓ Current suitability calculated")
                 
-                if current_score.shape != habitat_score.shape:
-                    current_score = current_score.interp_like(habitat_score)
-                
-                habitat_score = (habitat_score * 2 + current_score) / 3
-                print("  ✓ Current suitability calculated")
+                # Components combined in one pass per tile
+                dtype = np.result_type(*[x.dtype for x in (sst, chl_score, current_score)
+                                         if isinstance(x, xr.DataArray)])
+                habitat_score = xr.apply_ufunc(
+                    _habitat_score, sst, chl_score, current_score, use_chl, use_current,
+                    dask='parallelized', output_dtypes=[dtype]
+                ).rename('juvenile_habitat_score')
             
             if habitat_score is not None:
                 # Classify habitat quality
-                habitat_class = xr.where(habitat_score < 0.3, 'poor',
-                                xr.where(habitat_score < 0.6, 'moderate', 'good'))
+                habitat_class = classify(habitat_score, HABITAT_CLASSES).rename('juvenile_habitat_class')
+                
+                habitat_score, habitat_class = dask.persist(habitat_score, habitat_class)
                 
                 self.processed_data['juvenile_habitat_score'] = habitat_score
                 self.processed_data['juvenile_habitat_class'] = habitat_class
                 
-                print(f"\n✓ Juvenile habitat zones identified")
-                print(f"  Good habitat: {float((habitat_score >= 0.6).sum() / habitat_score.size * 100):.1f}%")
+                logger.info(f"\n✓ Juvenile habitat zones identified")
+                logger.info(f"  Good habitat: {float((habitat_score >= 0.6).sum() / habitat_score.size * 100):.1f}%")
             else:
-                print("✗ Insufficient data for habitat assessment")
+                logger.error("✗ Insufficient data for habitat assessment")
                 
         except Exception as e:
-            print(f"✗ Error identifying juvenile habitats: {e}")
+            logger.error(f"✗ Error identifying juvenile habitats: {e}")
             
     def export_processed_data(self):
-        """Export all processed data to NetCDF and CSV"""
-        print("\n" + "="*60)
-        print("EXPORTING PROCESSED DATA")
-        print("="*60)
+        """Export all processed data to Zarr and CSV"""
+        logger.info("\n" + "="*60)
+        logger.info("EXPORTING PROCESSED DATA")
+        logger.info("="*60)
         
         try:
-            # Export xarray datasets to NetCDF
+            # Export xarray datasets as chunked Zarr stores. Each store's metadata
+            # is written up front and its chunks deferred, so a single compute
+            # evaluates shared inputs once and writes every store's chunks in
+            # parallel
+            writes = {}
             for key, data in self.processed_data.items():
                 if isinstance(data, (xr.DataArray, xr.Dataset)):
-                    output_file = self.processed_dir / f'{key}.nc'
-                    data.to_netcdf(output_file)
-                    print(f"  ✓ Exported {key} to {output_file.name}")
+                    ds = data.to_dataset(name=data.name or key) if isinstance(data, xr.DataArray) else data
+                    chunks = {dim: size for dim, size in {'time': 50, 'lat': 200, 'lon': 200}.items()
+                              if dim in ds.dims}
+                    encoding = {name: dict(zarr_compressor_encoding()) for name in ds.data_vars}
+                    if key in UNIT_INDEX_VARIABLES:
+                        for name in encoding:
+                            encoding[name].update(UNIT_INDEX_ENCODING)
+                    zarr_file = self.processed_dir / f'{key}.zarr'
+                    writes[zarr_file] = ds.chunk(chunks).to_zarr(
+                        zarr_file, mode='w', consolidated=True, encoding=encoding, compute=False
+                    )
+            
+            dask.compute(*writes.values())
+            for zarr_file in writes:
+                logger.info(f"  ✓ Exported {zarr_file.stem} to {zarr_file.name}")
             
             # Export summary statistics to CSV
             summary_data = {}
@@ -464,10 +862,14 @@ class MedGuardProcessor:
                     summary_data[key] = self.processed_data[key]
             
             if summary_data:
-                summary_df = pd.DataFrame([summary_data])
+                # Each statistics dict is one JSON cell (NumPy scalars as plain numbers)
+                summary_df = pd.DataFrame([{
+                    key: json.dumps(stats, default=lambda value: value.item())
+                    for key, stats in summary_data.items()
+                }])
                 output_file = self.processed_dir / 'summary_statistics.csv'
                 summary_df.to_csv(output_file, index=False)
-                print(f"  ✓ Exported summary statistics to {output_file.name}")
+                logger.info(f"  ✓ Exported summary statistics to {output_file.name}")
             
             # Create metadata file
             metadata = {
@@ -476,22 +878,21 @@ class MedGuardProcessor:
                 'output_directory': str(self.processed_dir.absolute())
             }
             
-            import json
             metadata_file = self.processed_dir / 'processing_metadata.json'
             with open(metadata_file, 'w') as f:
                 json.dump(metadata, f, indent=2)
-            print(f"  ✓ Exported metadata to {metadata_file.name}")
+            logger.info(f"  ✓ Exported metadata to {metadata_file.name}")
             
-            print(f"\n✓ All processed data exported to {self.processed_dir}")
+            logger.info(f"\n✓ All processed data exported to {self.processed_dir}")
             
         except Exception as e:
-            print(f"✗ Error exporting data: {e}")
+            logger.error(f"✗ Error exporting data: {e}")
             
     def generate_processing_report(self):
         """Generate a summary report of processing"""
-        print("\n" + "="*60)
-        print("PROCESSING SUMMARY REPORT")
-        print("="*60)
+        logger.info("\n" + "="*60)
+        logger.info("PROCESSING SUMMARY REPORT")
+        logger.info("="*60)
         
         report_lines = [
             "\nMedGuard Data Processing Report",
@@ -534,52 +935,78 @@ class MedGuardProcessor:
         with open(report_file, 'w') as f:
             f.write(report_text)
             
-        print(report_text)
-        print(f"\n✓ Report saved to {report_file}")
+        logger.info(report_text)
+        logger.info(f"\n✓ Report saved to {report_file}")
+        
+    def start_dask_client(self):
+        """Start a local dask.distributed cluster (one single-threaded worker per core) if installed"""
+        try:
+            from dask.distributed import Client
+        except ImportError:
+            logger.info("ℹ dask.distributed not installed, using the threaded dask scheduler")
+            return None
+        
+        try:
+            client = Client(n_workers=os.cpu_count(), threads_per_worker=1)
+            logger.info(f"✓ Dask cluster started: {client.dashboard_link}")
+            return client
+        except Exception as e:
+            logger.warning(f"⚠ Could not start dask cluster ({e}), using the threaded scheduler")
+            return None
         
     def run_full_pipeline(self):
         """Execute complete processing pipeline"""
-        print("\n" + "="*70)
-        print(" "*15 + "MEDGUARD DATA PROCESSING PIPELINE")
-        print("="*70)
-        print(f"Processing start: {datetime.now()}")
-        
-        # Load data
-        self.load_copernicus_data()
-        self.load_emodnet_data()
-        
-        # Process oceanographic variables
-        self.calculate_sst_anomaly()
-        self.calculate_current_speed()
-        self.calculate_productivity_index()
-        self.calculate_frontal_zones()
-        
-        # Process human activities
-        self.calculate_fishing_pressure()
-        self.calculate_mpa_coverage()
-        
-        # Calculate risk indices
-        self.calculate_overfishing_risk_index()
-        self.identify_juvenile_habitat_zones()
-        
-        # Export results
-        self.export_processed_data()
-        self.generate_processing_report()
-        
-        print("\n" + "="*70)
-        print(" "*20 + "PROCESSING COMPLETE!")
-        print("="*70)
-        print(f"Processing end: {datetime.now()}")
-        print(f"\nResults saved to: {self.processed_dir.absolute()}")
-        print("\nNext steps:")
-        print("1. Train models: python 04_train_models.py")
-        print("2. Build dashboard: python 05_create_dashboard.py")
-        print("3. Deploy application: python 06_deploy_to_edito.py")
+        logger.info("\n" + "="*70)
+        logger.info(" "*15 + "MEDGUARD DATA PROCESSING PIPELINE")
+        logger.info("="*70)
+        logger.info(f"Processing start: {datetime.now()}")
+        
+        # All stages share one scheduler
+        client = self.start_dask_client()
+        
+        stages = [
+            # Load data
+            self.load_copernicus_data,
+            self.load_emodnet_data,
+            # Process oceanographic variables
+            self.calculate_sst_anomaly,
+            self.calculate_current_speed,
+            self.calculate_productivity_index,
+            self.calculate_frontal_zones,
+            # Process human activities
+            self.calculate_fishing_pressure,
+            self.calculate_mpa_coverage,
+            # Calculate risk indices
+            self.calculate_overfishing_risk_index,
+            self.identify_juvenile_habitat_zones,
+            # Export results
+            self.export_processed_data,
+            self.generate_processing_report,
+        ]
+        
+        try:
+            for stage in stages:
+                stage()
+                flush_log()
+        finally:
+            if client is not None:
+                client.close()
+        
+        logger.info("\n" + "="*70)
+        logger.info(" "*20 + "PROCESSING COMPLETE!")
+        logger.info("="*70)
+        logger.info(f"Processing end: {datetime.now()}")
+        logger.info(f"\nResults saved to: {self.processed_dir.absolute()}")
+        logger.info("\nNext steps:")
+        logger.info("1. Train models: python 04_train_models.py")
+        logger.info("2. Build dashboard: python 05_create_dashboard.py")
+        logger.info("3. Deploy application: python 06_deploy_to_edito.py")
+        flush_log()
 
 
 def main():
     """Main execution function"""
-    print("""
+    logger.info("""
     ╔═══════════════════════════════════════════════════════════╗
     ║                                                           ║
     ║         MEDGUARD DATA PROCESSING SYSTEM                   ║
@@ -588,15 +1015,20 @@ def main():
     ╚═══════════════════════════════════════════════════════════╝
     """)
     
-    processor = MedGuardProcessor(data_dir='data')
+    parser = argparse.ArgumentParser(description="Process Copernicus and EMODnet data for MedGuard")
+    parser.add_argument('--gpu', action='store_true',
+                        help="run the elementwise stages (currents, fronts) on the GPU with CuPy")
+    args = parser.parse_args()
+    
+    processor = MedGuardProcessor(data_dir='data', use_gpu=args.gpu)
     
     try:
         processor.run_full_pipeline()
     except KeyboardInterrupt:
-        print("\n\nProcessing interrupted by user")
+        logger.warning("\n\nProcessing interrupted by user")
         return 1
     except Exception as e:
-        print(f"\n\nFatal error: {e}")
+        logger.error(f"\n\nFatal error: {e}")
         import traceback
         traceback.print_exc()
         return 1